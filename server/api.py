@@ -40,14 +40,19 @@ from .models import (
     DesktopPreferences,
     CustomLayoutModel,
 )
+from .util.jsonenc import dumps
 from .util.schema import load_schemas
+from .util.statebin import encodable, encode_full, encode_state_update
 from .fixtures.mapper import resolve_attrs
 from .util.ulid import ulid_from_string
 from .drivers.enttec import EnttecDMXUSBPro, USBDeviceInfo, find_enttec_device
 from .dmx.autodetect import enumerate_serial_devices, enumerate_artnet_nodes
+from .dmx.engine import DMXEngine
+from .dmx.easing import EASINGS
 from .services.projects import switch_active_project, create_project_backup, list_backups, restore_backup, serialize_project
 from .backups.base import BackupVersion
 from .services.desktop_prefs import save_desktop_preferences
+from .services.playback import reload_playbacks
 
 _schemas = load_schemas()
 
@@ -474,14 +479,15 @@ async def post_command(request: Request, context: AppContext = Depends(get_conte
         schema_errors = sorted(_schemas.fade().iter_errors(payload), key=lambda e: e.path)
     else:
         schema_errors = sorted(_schemas.command().iter_errors(payload), key=lambda e: e.path)
-    if schema_errors:
+    errors_out = [{"path": "/" + "/".join(map(str, e.path)), "msg": e.message} for e in schema_errors]
+    if typ == "dmx.fade" and not errors_out:
+        errors_out = _easing_errors(payload)
+    if errors_out:
         ack = {
             "ack": payload.get("id"),
             "accepted": False,
             "reason": "VALIDATION_FAILED",
-            "errors": [
-                {"path": "/" + "/".join(map(str, e.path)), "msg": e.message} for e in schema_errors
-            ],
+            "errors": errors_out,
             "ts": int(time.time() * 1000),
         }
         context.core.inc_cmd("rest", str(payload.get("type")), False)
@@ -582,12 +588,9 @@ async def post_command(request: Request, context: AppContext = Depends(get_conte
         universe = int(payload.get("universe", 0))
         duration_ms = int(payload.get("durationMs", 0))
         easing = str(payload.get("easing", "linear"))
-        now_ms = int(time.time() * 1000)
         context.dmx  # ensure
         # Build a minimal getter for current values
-        def get_current(u: int, ch: int) -> int:
-            snap = context.dmx.snapshot().get(u, {})
-            return int(snap.get(ch, 0))
+        get_current = context.dmx.channel
         from .dmx.fade_engine import FadeEngine  # local import
         # reuse engine task created in app; attach if exists
         fe: FadeEngine | None = getattr(context, "_fade_engine", None)
@@ -599,7 +602,7 @@ async def post_command(request: Request, context: AppContext = Depends(get_conte
                 universe=universe,
                 patch=payload.get("patch", []),
                 duration_ms=duration_ms,
-                now_ms=now_ms,
+                now_ms=fe.now_ms(),
                 get_current=get_current,
                 easing=easing,
                 metrics=context.core,
@@ -607,6 +610,14 @@ async def post_command(request: Request, context: AppContext = Depends(get_conte
             context.core.inc_cmd("rest", typ, True)
             return {"ack": payload.get("id"), "accepted": True, "ts": int(time.time() * 1000)}
 
+    if typ in _PLAYBACK_COMMANDS:
+        ok = _apply_playback_command(context, payload)
+        context.core.inc_cmd("rest", typ, ok)
+        context.core.observe_ack(int((time.perf_counter() - start) * 1000))
+        if not ok:
+            return {"ack": payload.get("id"), "accepted": False, "reason": "not_found"}
+        return {"ack": payload.get("id"), "accepted": True, "ts": int(time.time() * 1000)}
+
     # Apply to DMX engine and broadcast delta
     universe = int(payload.get("universe", 0))
     # LTP: cancel fade channels if enabled
@@ -683,15 +694,8 @@ async def get_state(request: Request, sparse: int = 0, context: AppContext = Dep
     body: dict[str, Any] = {"ts": dmx.ts, "universes": dmx.snapshot()}
     if int(sparse or 0) == 1:
         universes_sparse: dict[str, dict[str, int]] = {}
-        for u, chmap in dmx.snapshot().items():
-            sparse_map: dict[str, int] = {}
-            for k, v in chmap.items():
-                try:
-                    if int(v) != 0:
-                        sparse_map[str(k)] = int(v)
-                except Exception:
-                    continue
-            universes_sparse[str(u)] = sparse_map
+        for u, frame in dmx.frames().items():
+            universes_sparse[str(u)] = {str(i + 1): v for i, v in enumerate(frame) if v}
         body["universesSparse"] = universes_sparse
         body["sparse"] = True
     _validate_state_payload(body)
@@ -719,9 +723,31 @@ async def put_scenes(payload: list[SceneModel], context: AppContext = Depends(ge
         context.show_snapshot["scenes"] = serialized
         if context.show_store is not None:
             await context.show_store.save(context.show_snapshot)
+    reload_playbacks(context)
     return payload
 
 
+@router.get("/cues")
+async def get_cues(context: AppContext = Depends(get_context)) -> list[dict[str, Any]]:
+    """Return cue lists with the current cue of each playback."""
+
+    return context.cues.state()
+
+
+@router.get("/submasters")
+async def get_submasters(context: AppContext = Depends(get_context)) -> list[dict[str, Any]]:
+    """Return the submasters with their current levels."""
+
+    return context.submasters.state()
+
+
+@router.get("/effects")
+async def get_effects(context: AppContext = Depends(get_context)) -> list[dict[str, Any]]:
+    """Return the server-run effects and whether each is active."""
+
+    return context.effects.state()
+
+
 def _current_show_payload(context: AppContext) -> dict[str, Any]:
     snapshot = dict(context.show_snapshot or {})
     scenes = context.scenes or snapshot.get("scenes") or []
@@ -736,6 +762,9 @@ def _current_show_payload(context: AppContext) -> dict[str, Any]:
         "servos": snapshot.get("servos") or [],
         "midiMappings": snapshot.get("midiMappings") or [],
         "customLayout": snapshot.get("customLayout") or None,
+        "easingCurves": snapshot.get("easingCurves") or [],
+        "cueLists": snapshot.get("cueLists") or [],
+        "submasters": snapshot.get("submasters") or [],
     }
     return payload
 
@@ -780,12 +809,118 @@ async def import_show(payload: dict[str, Any], context: AppContext = Depends(get
         raise HTTPException(status_code=400, detail="customLayout must be an object or null")
     payload["customLayout"] = validated_layout
 
+    curves = payload.get("easingCurves") or []
+    if not isinstance(curves, list):
+        raise HTTPException(status_code=400, detail="easingCurves must be a list")
+    try:
+        EASINGS.register_curves(curves)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid easingCurves payload: {exc}") from exc
+    payload["easingCurves"] = curves
+
     context.show_snapshot = payload
     if context.show_store is not None:
         await context.show_store.save(payload)
+    reload_playbacks(context)
     return payload
 
 
+_PLAYBACK_COMMANDS = {
+    "cue.go", "cue.back", "cue.goto", "cue.release", "submaster.level", "effect.start", "effect.stop",
+}
+
+
+def _apply_playback_command(context: AppContext, payload: dict[str, Any]) -> bool:
+    """Run a cue/submaster/effect command; False when the target does not exist or cannot move."""
+    typ = payload.get("type")
+    if typ == "submaster.level":
+        return context.submasters.set_level(str(payload.get("submaster")), payload.get("level"))
+    if typ == "effect.start":
+        return context.effects.start(str(payload.get("effectId")))
+    if typ == "effect.stop":
+        return context.effects.stop(str(payload.get("effectId")))
+    list_id = str(payload.get("cueList"))
+    if typ == "cue.go":
+        return context.cues.go(list_id)
+    if typ == "cue.back":
+        return context.cues.back(list_id)
+    if typ == "cue.goto":
+        return context.cues.goto(list_id, str(payload.get("cue")))
+    return context.cues.release(list_id)
+
+
+def _easing_errors(payload: dict[str, Any]) -> list[dict[str, str]]:
+    easing = payload.get("easing")
+    if isinstance(easing, str) and not EASINGS.known(easing):
+        return [{"path": "/easing", "msg": f"unknown easing: {easing}"}]
+    return []
+
+
+def _ws_resume_rev(websocket: WebSocket, dmx: DMXEngine) -> int | None:
+    """Return the rev a reconnecting client resumes from, if it belongs to this run."""
+    params = websocket.query_params
+    try:
+        since = int(params.get("since", ""))
+        epoch = int(params.get("epoch", ""))
+    except ValueError:
+        return None
+    if since < 0 or epoch != dmx.epoch:
+        return None
+    return since
+
+
+def _subscription_fields(
+    universes: Any, types: Any,
+) -> tuple[set[int] | None, set[str] | None, list[dict[str, str]]]:
+    """Validate the ``universes``/``types`` of a subscription (None = not given)."""
+    errors: list[dict[str, str]] = []
+    unis: set[int] | None = None
+    typs: set[str] | None = None
+    if universes is not None:
+        if isinstance(universes, list) and all(
+            isinstance(u, int) and not isinstance(u, bool) and 0 <= u <= 32767 for u in universes
+        ):
+            unis = set(universes)
+        else:
+            errors.append({"path": "/universes", "msg": "expected a list of universe numbers"})
+    if types is not None:
+        if isinstance(types, list) and all(isinstance(t, str) and t for t in types):
+            typs = set(types)
+        else:
+            errors.append({"path": "/types", "msg": "expected a list of message types"})
+    return unis, typs, errors
+
+
+def _ws_subscription(websocket: WebSocket) -> tuple[set[int] | None, set[str] | None, int | None]:
+    """Initial subscription from ``?universes=0,1&types=state.update&hz=20`` (missing = defaults)."""
+    params = websocket.query_params
+    unis: set[int] | None = None
+    typs: set[str] | None = None
+    hz: int | None = None
+    if params.get("universes"):
+        try:
+            unis = {int(u) for u in params["universes"].split(",") if u.strip()}
+        except ValueError:
+            unis = None
+    if params.get("types"):
+        typs = {t.strip() for t in params["types"].split(",") if t.strip()}
+    if params.get("hz"):
+        try:
+            hz = int(params["hz"])
+        except ValueError:
+            hz = None
+    return unis, typs, hz
+
+
+async def _send_full_snapshot(websocket: WebSocket, context: AppContext, universe: int, binary: bool) -> None:
+    dmx = context.dmx
+    if binary and encodable(universe):
+        await websocket.send_bytes(encode_full(universe, dmx.rev, dmx.ts, dmx.frame(universe)))
+    else:
+        # encoded once per universe revision, shared by every connecting client
+        await websocket.send_text(context.hub.snapshots.message(dmx, universe))
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     context = get_context_ws(websocket)
@@ -793,28 +928,49 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     if engine is None:
         await websocket.close(code=1013)
         return
-    await context.hub.register(websocket)
+    sub_universes, sub_types, sub_hz = _ws_subscription(websocket)
+    binary = await context.hub.register(websocket, universes=sub_universes, types=sub_types, hz=sub_hz)
     try:
-        await websocket.send_text(json.dumps({
-            "type": "state",
-            "r": engine.state["r"],
-            "g": engine.state["g"],
-            "b": engine.state["b"],
-            "seq": engine.state["seq"],
-            "ts": engine.state["ts"],
-        }))
-        # Unified state.update initial full snapshots for all universes
-        snapshot = context.dmx.snapshot()
-        for uni, chmap in snapshot.items():
-            delta = [{"ch": int(k), "val": int(v)} for k, v in chmap.items()]
-            await websocket.send_text(json.dumps({
+        if sub_types is None or "state" in sub_types:
+            await websocket.send_text(dumps({
+                "type": "state",
+                "r": engine.state["r"],
+                "g": engine.state["g"],
+                "b": engine.state["b"],
+                "seq": engine.state["seq"],
+                "ts": engine.state["ts"],
+                "epoch": context.dmx.epoch,
+            }))
+        # Unified state.update initial sync: replay what a resuming client missed,
+        # full snapshots for everything the revision log cannot cover
+        dmx = context.dmx
+        since = _ws_resume_rev(websocket, dmx)
+        for uni in dmx.universes():
+            if sub_types is not None and "state.update" not in sub_types:
+                break
+            if sub_universes is not None and uni not in sub_universes:
+                continue
+            delta = dmx.deltas_since(uni, since) if since is not None else None
+            full = delta is None
+            if since is not None:
+                context.core.inc_ws_resume("full" if full else "delta")
+            if full:
+                await _send_full_snapshot(websocket, context, uni, binary)
+                continue
+            if not delta:
+                continue
+            update = {
                 "type": "state.update",
-                "rev": context.dmx.rev,
-                "ts": context.dmx.ts,
+                "rev": dmx.rev,
+                "ts": dmx.ts,
                 "universe": int(uni),
                 "delta": delta,
-                "full": True,
-            }))
+                "full": False,
+            }
+            if binary and encodable(uni):
+                await websocket.send_bytes(encode_state_update(update))
+            else:
+                await websocket.send_text(dumps(update))
         while True:
             import time
             start = time.perf_counter()
@@ -837,24 +993,63 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 continue
             # Unified Command over WS
             typ = str(data.get("type"))
+            if typ in {"subscribe", "unsubscribe"}:
+                unis, typs, sub_errors = _subscription_fields(data.get("universes"), data.get("types"))
+                hz = data.get("hz")
+                if hz is not None and (isinstance(hz, bool) or not isinstance(hz, int) or hz < 0):
+                    sub_errors.append({"path": "/hz", "msg": "expected a non-negative integer"})
+                if sub_errors:
+                    ack = {
+                        "ack": data.get("id"),
+                        "accepted": False,
+                        "reason": "VALIDATION_FAILED",
+                        "errors": sub_errors,
+                        "ts": int(time.time() * 1000),
+                    }
+                    await websocket.send_text(dumps(ack))
+                    continue
+                added: set[int] = set()
+                if typ == "subscribe":
+                    added = context.hub.subscribe(websocket, universes=unis, types=typs)
+                else:
+                    context.hub.unsubscribe(websocket, universes=unis, types=typs, known_universes=dmx.universes())
+                if hz is not None:
+                    context.hub.set_rate(websocket, hz)
+                cur_unis, cur_types = context.hub.subscription(websocket)
+                await websocket.send_text(dumps({
+                    "ack": data.get("id"),
+                    "accepted": True,
+                    "universes": sorted(cur_unis) if cur_unis is not None else None,
+                    "types": sorted(cur_types) if cur_types is not None else None,
+                    "hz": context.hub.rate(websocket),
+                    "ts": int(time.time() * 1000),
+                }))
+                # newly subscribed universes start from a full snapshot
+                if cur_types is None or "state.update" in cur_types:
+                    for uni in sorted(added & set(dmx.universes())):
+                        await _send_full_snapshot(websocket, context, uni, binary)
+                continue
             if typ == "fixture.set" and context.settings.fixtures_enabled:
                 validator = _schemas.fixture()
             elif typ == "dmx.fade":
                 validator = _schemas.fade()
             else:
                 validator = _schemas.command()
-            errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
+            errors = [
+                {"path": "/" + "/".join(map(str, e.path)), "msg": e.message}
+                for e in sorted(validator.iter_errors(data), key=lambda e: e.path)
+            ]
+            if typ == "dmx.fade" and not errors:
+                errors = _easing_errors(data)
             if errors:
                 ack = {
                     "ack": data.get("id"),
                     "accepted": False,
                     "reason": "VALIDATION_FAILED",
-                    "errors": [
-                        {"path": "/" + "/".join(map(str, e.path)), "msg": e.message} for e in errors
-                    ],
+                    "errors": errors,
                     "ts": int(time.time() * 1000),
                 }
-                await websocket.send_text(json.dumps(ack))
+                await websocket.send_text(dumps(ack))
                 context.core.observe_ack(int((time.perf_counter() - start) * 1000))
                 context.core.inc_cmd("ws", str(data.get("type")), False)
                 continue
@@ -866,7 +1061,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                     context.core.fixture_apply_total = getattr(context.core, "fixture_apply_total", {})
                     key = ("error", "not_found")
                     context.core.fixture_apply_total[key] = context.core.fixture_apply_total.get(key, 0) + 1
-                    await websocket.send_text(json.dumps({"ack": data.get("id"), "accepted": False, "reason": "not_found"}))
+                    await websocket.send_text(dumps({"ack": data.get("id"), "accepted": False, "reason": "not_found"}))
                     continue
                 items = resolve_attrs(inst, data.get("attrs", {}))
                 # Metrics per attr
@@ -883,32 +1078,39 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 context.core.fixture_apply_total = getattr(context.core, "fixture_apply_total", {})
                 keyok = ("ok", "resolve")
                 context.core.fixture_apply_total[keyok] = context.core.fixture_apply_total.get(keyok, 0) + 1
-                await websocket.send_text(json.dumps({"ack": data.get("id"), "accepted": True, "ts": int(time.time() * 1000)}))
+                await websocket.send_text(dumps({"ack": data.get("id"), "accepted": True, "ts": int(time.time() * 1000)}))
                 continue
             if typ == "dmx.fade" and context.settings.fades_enabled:
                 # Enqueue fade
                 universe = int(data.get("universe", 0))
                 duration_ms = int(data.get("durationMs", 0))
                 easing = str(data.get("easing", "linear"))
-                now_ms = int(time.time() * 1000)
-                def get_current(u: int, ch: int) -> int:
-                    snap = context.dmx.snapshot().get(u, {})
-                    return int(snap.get(ch, 0))
+                get_current = context.dmx.channel
                 fe = getattr(context, "_fade_engine", None)
                 if fe is not None:
                     fe.add_fade(
                         universe=universe,
                         patch=data.get("patch", []),
                         duration_ms=duration_ms,
-                        now_ms=now_ms,
+                        now_ms=fe.now_ms(),
                         get_current=get_current,
                         easing=easing,
                         metrics=context.core,
                     )
                     ack = {"ack": data.get("id"), "accepted": True, "ts": int(time.time() * 1000)}
-                    await websocket.send_text(json.dumps(ack))
+                    await websocket.send_text(dumps(ack))
                     context.core.inc_cmd("ws", typ, True)
                     continue
+            if typ in _PLAYBACK_COMMANDS:
+                ok = _apply_playback_command(context, data)
+                if ok:
+                    ack = {"ack": data.get("id"), "accepted": True, "ts": int(time.time() * 1000)}
+                else:
+                    ack = {"ack": data.get("id"), "accepted": False, "reason": "not_found"}
+                await websocket.send_text(dumps(ack))
+                context.core.observe_ack(int((time.perf_counter() - start) * 1000))
+                context.core.inc_cmd("ws", typ, ok)
+                continue
             # canonicalize patch as above
             patch = data.get("patch")
             errors_list: list[dict[str, str]] = []
@@ -936,7 +1138,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                         "errors": errors_list,
                         "ts": int(time.time() * 1000),
                     }
-                    await websocket.send_text(json.dumps(ack))
+                    await websocket.send_text(dumps(ack))
                     context.core.observe_ack(int((time.perf_counter() - start) * 1000))
                     context.core.inc_cmd("ws", typ, False)
                     continue
@@ -948,7 +1150,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                         "errors": [{"path": "/patch", "msg": "empty"}],
                         "ts": int(time.time() * 1000),
                     }
-                    await websocket.send_text(json.dumps(ack))
+                    await websocket.send_text(dumps(ack))
                     context.core.observe_ack(int((time.perf_counter() - start) * 1000))
                     context.core.inc_cmd("ws", typ, False)
                     continue
@@ -959,7 +1161,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                         "reason": "PATCH_TOO_LARGE",
                         "ts": int(time.time() * 1000),
                     }
-                    await websocket.send_text(json.dumps(ack))
+                    await websocket.send_text(dumps(ack))
                     context.core.observe_ack(int((time.perf_counter() - start) * 1000))
                     context.core.inc_cmd("ws", typ, False)
                     continue
@@ -975,7 +1177,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                     "reason": "RATE_LIMITED",
                     "ts": int(time.time() * 1000),
                 }
-                await websocket.send_text(json.dumps(ack))
+                await websocket.send_text(dumps(ack))
                 context.core.observe_ack(int((time.perf_counter() - start) * 1000))
                 context.core.inc_cmd("ws", typ, False)
                 continue
@@ -994,7 +1196,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
             accepted = True
             context.core.inc_cmd("ws", typ, True)
             ack = {"ack": data.get("id"), "accepted": True, "ts": int(time.time() * 1000)}
-            await websocket.send_text(json.dumps(ack))
+            await websocket.send_text(dumps(ack))
             context.core.observe_ack(int((time.perf_counter() - start) * 1000))
             if delta:
                 # Mirror RGB legacy engine for universe 0 ch1..3 so legacy state stays meaningful
@@ -1071,10 +1273,22 @@ async def readyz(context: AppContext = Depends(get_context)) -> JSONResponse:
 async def metrics(context: AppContext = Depends(get_context)) -> PlainTextResponse:
     if not context.settings.metrics_enabled:
         raise HTTPException(status_code=404, detail="metrics disabled")
+    lane_depths = context.engine.lane_depths() if context.engine else {}
+    lane_dropped = context.engine.lane_dropped() if context.engine else {}
+    ws_clients = context.hub.client_stats()
     metrics_lines = [
         "# HELP dmx_engine_processed_total Commands processed successfully",
         "# TYPE dmx_engine_processed_total counter",
         f"dmx_engine_processed_total {context.metrics.processed}",
+        "# HELP dmx_engine_coalesced_total Commands superseded by a later-submitted command",
+        "# TYPE dmx_engine_coalesced_total counter",
+        f"dmx_engine_coalesced_total {context.metrics.coalesced}",
+        "# HELP dmx_engine_batches_total Command batches drained (coalescing mode)",
+        "# TYPE dmx_engine_batches_total counter",
+        f"dmx_engine_batches_total {context.metrics.batches}",
+        "# HELP dmx_engine_last_batch_size Commands drained in the last batch",
+        "# TYPE dmx_engine_last_batch_size gauge",
+        f"dmx_engine_last_batch_size {context.metrics.last_batch_size}",
         "# HELP dmx_engine_deduped_total Commands deduplicated",
         "# TYPE dmx_engine_deduped_total counter",
         f"dmx_engine_deduped_total {context.metrics.deduped}",
@@ -1084,9 +1298,24 @@ async def metrics(context: AppContext = Depends(get_context)) -> PlainTextRespon
         "# HELP dmx_engine_queue_depth Current engine queue depth",
         "# TYPE dmx_engine_queue_depth gauge",
         f"dmx_engine_queue_depth {context.engine.queue_depth() if context.engine else 0}",
+        "# HELP dmx_engine_lane_depth Queued commands per priority lane",
+        "# TYPE dmx_engine_lane_depth gauge",
+        *(f'dmx_engine_lane_depth{{lane="{lane}"}} {n}' for lane, n in lane_depths.items()),
+        "# HELP dmx_engine_lane_dropped_total Commands shed from a full priority lane",
+        "# TYPE dmx_engine_lane_dropped_total counter",
+        *(f'dmx_engine_lane_dropped_total{{lane="{lane}"}} {n}' for lane, n in lane_dropped.items()),
         "# HELP dmx_ws_clients WebSocket clients connected",
         "# TYPE dmx_ws_clients gauge",
         f"dmx_ws_clients {await context.hub.count()}",
+        "# HELP dmx_ws_client_queue_depth Outbound messages queued per WS client",
+        "# TYPE dmx_ws_client_queue_depth gauge",
+        *(f'dmx_ws_client_queue_depth{{client="{c["client"]}"}} {c["queueDepth"]}' for c in ws_clients),
+        "# HELP dmx_ws_client_lag_ms Lag of the last message written to each WS client (ms)",
+        "# TYPE dmx_ws_client_lag_ms gauge",
+        *(f'dmx_ws_client_lag_ms{{client="{c["client"]}"}} {c["lagMs"]}' for c in ws_clients),
+        "# HELP dmx_ws_client_dropped_total Messages shed from each WS client's full queue",
+        "# TYPE dmx_ws_client_dropped_total counter",
+        *(f'dmx_ws_client_dropped_total{{client="{c["client"]}"}} {c["dropped"]}' for c in ws_clients),
         "# HELP dmx_mqtt_connected MQTT connection state",
         "# TYPE dmx_mqtt_connected gauge",
         f"dmx_mqtt_connected {1 if context.mqtt_connected else 0}",
@@ -1172,12 +1401,14 @@ async def fixtures_reload(context: AppContext = Depends(get_context)) -> Any:
     if not context.settings.fixtures_enabled:
         raise HTTPException(status_code=404, detail="fixtures disabled")
     from .fixtures.profiles import load_profiles
-    from .fixtures.patch import load_patch
+    from .fixtures.patch import load_patch, ltp_masks
     try:
-        profiles = load_profiles(context.settings.fixture_profiles_dir)
+        profiles = load_profiles(context.settings.fixture_profiles_dir, context.settings.attr_default_merge)
         instances = load_patch(context.settings.fixture_patch_file, profiles)
         context.fixture_profiles = profiles
         context.fixture_instances = instances
+        for uni, (delta, rev, ts) in context.dmx.set_merge_masks(ltp_masks(instances)).items():
+            await context.hub.send_payload({"type": "state.update", "rev": rev, "ts": ts, "universe": uni, "delta": delta, "full": False})
         context.core.fixture_reload_total = getattr(context.core, "fixture_reload_total", {})
         context.core.fixture_reload_total["ok"] = context.core.fixture_reload_total.get("ok", 0) + 1
         return {"status": "ok", "profiles": len(profiles), "fixtures": len(instances)}
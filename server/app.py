@@ -19,10 +19,15 @@ from .drivers.ola_universe import OLAUniverseManager, OLAMetrics
 from .drivers.enttec import EnttecDMXUSBPro, USBDeviceInfo, USBDeviceMonitor, find_enttec_device, list_usb_devices
 from .drivers.dmx_input import SparkFunDMXInput
 from .dmx.fade_engine import FadeEngine
+from .dmx.output_clock import OutputClock
 from .inputs.sacn_receiver import SACNReceiver
 from .fixtures.profiles import load_profiles
-from .fixtures.patch import load_patch
+from .fixtures.patch import load_patch, ltp_masks
+from .dmx.engine import DMXEngine
+from .dmx.layers import LAYER_EFFECTS, LAYER_PLAYBACK, LAYER_SACN, LAYER_SUBMASTERS, default_layers
 from .engine import Engine
+from .fanout import StateFanout
+from .lanes import DEFAULT_SOURCES, LANE_CONSOLE
 from .models import SceneModel, RGBCommand, CMD_SCHEMA, DesktopPreferences
 from .mqtt_in import run_mqtt_in
 from .mqtt_out import build_publisher, publish_state
@@ -30,11 +35,13 @@ from .persistence.dedupe import CommandDeduplicator
 from .persistence.store import RGBState, StateStore
 from .persistence.scenes import ScenesStore
 from .persistence.show import ShowStore
+from .persistence.universes import UniverseStore
 from .persistence.projects import ProjectsStore, ProjectMetadata, ProjectsIndex, ProjectPaths
 from .util.log import configure_logging
 from .util.ulid import new_ulid
 from .ws_hub import WSHub
 from .services.data import load_scenes, load_show_snapshot
+from .services.playback import reload_playbacks
 from .services.projects import create_project_backup, switch_active_project
 from .services.desktop_prefs import load_desktop_preferences, save_desktop_preferences
 from .backups.factory import create_backup_client
@@ -51,8 +58,17 @@ def _build_ola(settings: Settings) -> OLAClient | None:
 
 
 def create_context(settings: Settings, *, store: StateStore, dedupe: CommandDeduplicator) -> AppContext:
-    hub = WSHub()
-    return AppContext(settings=settings, hub=hub, store=store, dedupe=dedupe)
+    hub = WSHub(
+        send_timeout=settings.ws_slow_client_ms / 1000,
+        max_queue=settings.ws_queue_max,
+        ui_hz=settings.ws_ui_hz,
+        max_hz=settings.ws_ui_hz_max,
+    )
+    dmx = DMXEngine(layers=default_layers(local_priority=settings.local_priority))
+    context = AppContext(settings=settings, hub=hub, store=store, dedupe=dedupe, dmx=dmx)
+    hub.metrics = context.core
+    hub.dmx = dmx
+    return context
 
 
 @asynccontextmanager
@@ -79,13 +95,27 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         scenes_path = project_paths.scenes_path
         show_path = project_paths.show_path
         desktop_prefs_path = project_paths.base / "desktop_prefs.json"
-    store = StateStore(state_path)
+    store = StateStore(state_path, debounce_ms=settings.persist_debounce_ms, fsync=settings.persist_fsync)
     dedupe = CommandDeduplicator(
         ttl_seconds=settings.cmd_dedupe_ttl_seconds,
         capacity=settings.cmd_dedupe_capacity,
         path=dedupe_path,
+        fsync_interval_ms=settings.cmd_dedupe_fsync_ms,
     )
     context = create_context(settings, store=store, dedupe=dedupe)
+    store.metrics = context.core
+    restored_universes: list[int] = []
+    if settings.universe_store_enabled:
+        # warm restore before anything produces an output frame
+        universe_store = UniverseStore(Path(state_path).parent / "universes.bin")
+        try:
+            universe_store.open()
+            restored_universes = universe_store.restore(context.dmx)
+            context.universe_store = universe_store
+        except OSError:
+            logger.exception("universe_store_open_failed")
+        if restored_universes:
+            logger.info("universes_restored", extra={"src": ",".join(map(str, restored_universes))})
     context.projects_enabled = settings.projects_enabled
     context.projects_store = projects_store
     context.projects_index = projects_index
@@ -203,6 +233,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
                 context.core.ola_queue_depth,
             ),
         )
+        # One clock paces all OLA universes; producers only mark universes dirty
+        context.output_clock = OutputClock(fps=int(settings.ola_fps), metrics=context.core)
+        context.ola_manager.attach_clock(context.output_clock)
+        context.output_clock_task = asyncio.create_task(context.output_clock.run(), name="output_clock")
+        for uni in restored_universes:
+            frame = context.dmx.frame(uni)
+            context.ola_manager.apply_patch(uni, [{"ch": i + 1, "val": v} for i, v in enumerate(frame) if v])
+            await context.ola_manager.maybe_send(uni)
     publisher = await build_publisher(settings)
 
     async def publish(state: dict[str, Any]) -> None:
@@ -216,14 +254,30 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     else:
         output_cb = ola_driver
 
+    fanout: StateFanout | None = None
+    if settings.engine_fanout:
+        # hardware output first and never queued behind disk/network; WS clients get every transition
+        fanout = StateFanout(metrics=context.core)
+        if output_cb is not None:
+            fanout.add("output", output_cb, latest_only=True)  # type: ignore[arg-type]
+        # late-bound: project switches replace context.store
+        fanout.add("persist", lambda state: context.store.save(state), latest_only=True)  # type: ignore[arg-type]
+        fanout.add("mqtt", publish, latest_only=True)
+        fanout.add("ws", context.hub.send_state, maxsize=settings.engine_fanout_queue)
+
     engine = Engine(
         publish_state_cb=publish,
         broadcast_state_cb=context.hub.send_state,
-        persist_state_cb=context.store.save,
+        persist_state_cb=lambda state: context.store.save(state),  # type: ignore[arg-type]
         dedupe_accept=context.dedupe.accept,
         ola_cb=output_cb,  # type: ignore[arg-type]
         queue_limit=settings.queue_size,
+        lane_sources={**DEFAULT_SOURCES, settings.dmx_input_src: LANE_CONSOLE},
         metrics=context.metrics,
+        coalesce=settings.engine_coalesce,
+        batch_max=settings.engine_batch_max,
+        batch_max_ms=settings.engine_batch_max_ms,
+        fanout=fanout,
     )
     context.engine = engine
     context.mqtt_publisher = publisher
@@ -303,13 +357,53 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         fade_engine = fe
         # attach for API access
         setattr(context, "_fade_engine", fe)
+    if context.universe_store is not None:
+        context.universe_store_task = asyncio.create_task(
+            context.universe_store.run(context.dmx, interval_s=settings.universe_store_interval_ms / 1000),
+            name="universe_store",
+        )
+    # Cue list playbacks, submasters and effects (idle until started)
+    reload_playbacks(context)
+
+    def cue_apply(universe: int, frame, mask):
+        return context.dmx.apply_layer_frame(universe, LAYER_PLAYBACK, frame, mask)
+
+    def submaster_apply(universe: int, frame, mask):
+        return context.dmx.apply_layer_frame(universe, LAYER_SUBMASTERS, frame, mask)
+
+    def effects_apply(universe: int, frame, mask):
+        return context.dmx.apply_layer_frame(universe, LAYER_EFFECTS, frame, mask)
+
+    async def layer_ola_apply(universe: int, delta: list[dict[str, int]]) -> None:
+        if context.ola_manager is not None:
+            context.ola_manager.apply_patch(universe, delta)
+            await context.ola_manager.maybe_send(universe)
+
+    context.cues_task = asyncio.create_task(
+        context.cues.run(apply_frame=cue_apply, broadcast=context.hub.send_payload, ola_apply=layer_ola_apply),
+        name="cue_engine",
+    )
+    context.submasters_task = asyncio.create_task(
+        context.submasters.run(
+            apply_frame=submaster_apply,
+            broadcast=context.hub.send_payload,
+            ola_apply=layer_ola_apply,
+            ltp_for=context.dmx.ltp_mask,
+        ),
+        name="submaster_engine",
+    )
+    context.effects_task = asyncio.create_task(
+        context.effects.run(apply_frame=effects_apply, broadcast=context.hub.send_payload, ola_apply=layer_ola_apply),
+        name="effects_engine",
+    )
     # Fixtures load (optional)
     if settings.fixtures_enabled:
         try:
-            profiles = load_profiles(settings.fixture_profiles_dir)
+            profiles = load_profiles(settings.fixture_profiles_dir, settings.attr_default_merge)
             instances = load_patch(settings.fixture_patch_file, profiles)
             context.fixture_profiles = profiles
             context.fixture_instances = instances
+            context.dmx.set_merge_masks(ltp_masks(instances))
         except Exception:
             context.fixture_profiles = {}
             context.fixture_instances = {}
@@ -349,7 +443,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
                     # trigger recompute to purge stale
                     for uni in list({u for (u, _) in receiver.sources.keys()}):
                         comp = receiver._recompute_composite(uni)
-                        if comp is not None:
+                        if not any(u == uni for (u, _) in receiver.sources.keys()):
+                            # last source timed out: sACN no longer holds LTP channels
+                            context.dmx.release_layer(uni, LAYER_SACN)
+                        elif comp is not None:
                             context.dmx.apply_sacn_composite(uni, comp)
                             context.dmx.recompute_output(uni)
         
@@ -367,6 +464,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         if task is not None:
             task.cancel()
             await asyncio.gather(task, return_exceptions=True)
+        for playback_task in (context.cues_task, context.submasters_task, context.effects_task):
+            if playback_task is not None:
+                playback_task.cancel()
+                await asyncio.gather(playback_task, return_exceptions=True)
         # stop sACN
         if sacn_task is not None:
             sacn_task.cancel()
@@ -382,6 +483,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             except Exception:
                 pass
         # Attempt graceful OLA flush and close HTTP client if enabled
+        if context.output_clock_task is not None:
+            context.output_clock_task.cancel()
+            await asyncio.gather(context.output_clock_task, return_exceptions=True)
         if context.ola_manager is not None:
             from contextlib import suppress
             try:
@@ -411,6 +515,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         engine_task.cancel()
         await asyncio.gather(mqtt_task, return_exceptions=True)
         await asyncio.gather(engine_task, return_exceptions=True)
+        await context.store.aclose()
+        await context.dedupe.aclose()
+        if context.universe_store_task is not None:
+            # the task syncs and closes the mapping on cancellation
+            context.universe_store_task.cancel()
+            await asyncio.gather(context.universe_store_task, return_exceptions=True)
         await publisher.disconnect()
 
 
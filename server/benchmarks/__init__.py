@@ -0,0 +1 @@
+"""Micro-benchmarks for hot server paths (run with ``python -m server.benchmarks.<name>``)."""
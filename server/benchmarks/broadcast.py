@@ -0,0 +1,125 @@
+"""Measure WebSocket broadcast cost: per-client stdlib encoding vs encode-once.
+
+Usage:
+    python -m server.benchmarks.broadcast --clients 50 --universes 16 --frames 44
+
+Every frame broadcasts one 32-channel ``state.update`` per universe to every
+client (no-op sockets), then lets the writers drain. "per-client" encodes each
+message with ``json.dumps`` for every client, as a task-per-send hub would;
+"encode-once" goes through ``WSHub`` with ``util.jsonenc``. The snapshot part
+times the full-universe sync a connecting client receives, with and without
+the revision-keyed cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from server.dmx.engine import DMXEngine
+from server.util.jsonenc import BACKEND
+from server.ws_hub import SnapshotCache, WSHub
+
+
+class _NullWS:
+    def __init__(self, port: int) -> None:
+        self.client = SimpleNamespace(host="bench", port=port)
+        self.bytes = 0
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.bytes += len(text)
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+def _messages(universes: int, frames: int, seed: int) -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    out = []
+    rev = 0
+    for _ in range(frames):
+        batch = []
+        for uni in range(universes):
+            rev += 1
+            delta = [{"ch": ch, "val": rng.randrange(256)} for ch in rng.sample(range(1, 513), 32)]
+            batch.append({"type": "state.update", "rev": rev, "ts": rev, "universe": uni, "delta": delta, "full": False})
+        out.append(batch)
+    return out
+
+
+async def _per_client(clients: int, frames: List[List[Dict[str, Any]]]) -> float:
+    sockets = [_NullWS(i) for i in range(clients)]
+    start = time.perf_counter()
+    for batch in frames:
+        for payload in batch:
+            tasks = [asyncio.create_task(ws.send_text(json.dumps(payload))) for ws in sockets]
+            await asyncio.wait(tasks)
+    return time.perf_counter() - start
+
+
+async def _encode_once(clients: int, frames: List[List[Dict[str, Any]]]) -> float:
+    hub = WSHub()
+    sockets = [_NullWS(i) for i in range(clients)]
+    for ws in sockets:
+        await hub.register(ws)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    for batch in frames:
+        for payload in batch:
+            await hub.send_payload(payload)
+        while any(stats["queueDepth"] for stats in hub.client_stats()):
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    for ws in sockets:
+        await hub.unregister(ws)  # type: ignore[arg-type]
+    return elapsed
+
+
+def _snapshots(clients: int, universes: int, cached: bool) -> float:
+    dmx = DMXEngine()
+    for uni in range(universes):
+        dmx.apply_patch(uni, [{"ch": ch, "val": ch % 256} for ch in range(1, 513)])
+    cache = SnapshotCache()
+    start = time.perf_counter()
+    for _ in range(clients):
+        for uni in dmx.universes():
+            if cached:
+                cache.message(dmx, uni)
+            else:
+                delta = [{"ch": i + 1, "val": v} for i, v in enumerate(dmx.frame(uni))]
+                json.dumps({"type": "state.update", "rev": dmx.rev, "ts": dmx.ts, "universe": uni, "delta": delta, "full": True})
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--universes", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=44, help="broadcast frames (44 = one second)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    frames = _messages(args.universes, args.frames, args.seed)
+    results = {
+        "per-client": asyncio.run(_per_client(args.clients, frames)),
+        "encode-once": asyncio.run(_encode_once(args.clients, frames)),
+    }
+    print(f"json backend: {BACKEND}")
+    for name, elapsed in results.items():
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms total, {elapsed / args.frames * 1000:7.2f} ms/frame")
+    print(f"{'speedup':>12}: {results['per-client'] / results['encode-once']:.1f}x")
+    plain = _snapshots(args.clients, args.universes, cached=False)
+    cached = _snapshots(args.clients, args.universes, cached=True)
+    print(f"{'snapshot':>12}: {plain * 1000:8.1f} ms uncached, {cached * 1000:7.1f} ms cached "
+          f"({args.clients} clients x {args.universes} universes)")
+
+
+if __name__ == "__main__":
+    main()
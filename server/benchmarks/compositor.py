@@ -0,0 +1,138 @@
+"""Compare the vectorized DMXEngine compositor with the previous per-channel loop.
+
+Usage:
+    python -m server.benchmarks.compositor --universes 20 --frames 440
+
+Each frame feeds a fresh sACN composite into every universe (the sACN receiver
+path at 44 Hz) and a small local patch into one universe (a fader move).
+The ``fader`` scenario only sends 1-3 channel local patches, which exercises the
+dirty-range path where cost should follow the patch size, not the universe size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from server.dmx.engine import DMXEngine
+
+
+class LoopCompositor:
+    """Reference implementation: bytearray layers merged channel by channel."""
+
+    def __init__(self) -> None:
+        self._local: Dict[int, bytearray] = {}
+        self._sacn: Dict[int, bytearray] = {}
+        self._output: Dict[int, bytearray] = {}
+        self._rev = 0
+
+    def _frame(self, layer: Dict[int, bytearray], universe: int) -> bytearray:
+        if universe not in layer:
+            layer[universe] = bytearray(512)
+        return layer[universe]
+
+    def apply_local_patch(self, universe: int, items: List[dict]) -> Tuple[List[dict], int, int]:
+        frame = self._frame(self._local, universe)
+        changed = False
+        for it in items:
+            idx = int(it["ch"]) - 1
+            if frame[idx] != it["val"]:
+                frame[idx] = it["val"]
+                changed = True
+        return self.recompute_output(universe) if changed else ([], self._rev, 0)
+
+    def apply_sacn_composite(self, universe: int, frame_bytes: bytes) -> Tuple[List[dict], int, int]:
+        frame = self._frame(self._sacn, universe)
+        arr = list(frame_bytes)
+        changed = False
+        for i in range(512):
+            val = int(arr[i]) & 0xFF
+            if frame[i] != val:
+                frame[i] = val
+                changed = True
+        return self.recompute_output(universe) if changed else ([], self._rev, 0)
+
+    def recompute_output(self, universe: int) -> Tuple[List[dict], int, int]:
+        local = self._frame(self._local, universe)
+        sacn = self._frame(self._sacn, universe)
+        out = self._frame(self._output, universe)
+        delta: List[dict] = []
+        for i in range(512):
+            v = local[i] if local[i] >= sacn[i] else sacn[i]
+            if out[i] != v:
+                out[i] = v
+                delta.append({"ch": i + 1, "val": int(v)})
+        if delta:
+            self._rev += 1
+        return delta, self._rev, 0
+
+
+def _workload(universes: int, frames: int, churn: float, seed: int) -> List[List[bytes]]:
+    rng = random.Random(seed)
+    base = [bytearray(rng.randrange(256) for _ in range(512)) for _ in range(universes)]
+    out: List[List[bytes]] = []
+    for _ in range(frames):
+        step: List[bytes] = []
+        for frame in base:
+            for _ in range(int(512 * churn)):
+                frame[rng.randrange(512)] = rng.randrange(256)
+            step.append(bytes(frame))
+        out.append(step)
+    return out
+
+
+def _run(engine: object, workload: List[List[bytes]]) -> float:
+    apply_sacn: Callable[[int, bytes], object] = getattr(engine, "apply_sacn_composite")
+    apply_local: Callable[[int, List[dict]], object] = getattr(engine, "apply_local_patch")
+    start = time.perf_counter()
+    for n, step in enumerate(workload):
+        for uni, frame in enumerate(step):
+            apply_sacn(uni, frame)
+        apply_local(n % len(step), [{"ch": 1 + n % 512, "val": n % 256}])
+    return time.perf_counter() - start
+
+
+def _run_fader(engine: object, universes: int, moves: int, seed: int) -> float:
+    apply_local: Callable[[int, List[dict]], object] = getattr(engine, "apply_local_patch")
+    rng = random.Random(seed)
+    patches = []
+    for n in range(moves):
+        ch = rng.randint(1, 510)
+        patches.append((n % universes, [{"ch": ch + k, "val": (n + k) % 256} for k in range(1 + n % 3)]))
+    start = time.perf_counter()
+    for uni, patch in patches:
+        apply_local(uni, patch)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universes", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=440, help="frames per universe (44 Hz x 10 s)")
+    parser.add_argument("--churn", type=float, default=0.1, help="fraction of channels changed per frame")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenario", choices=("sacn", "fader"), default="sacn")
+    args = parser.parse_args()
+
+    if args.scenario == "fader":
+        ops = args.universes * args.frames
+        results = {
+            "loop": _run_fader(LoopCompositor(), args.universes, ops, args.seed),
+            "vectorized": _run_fader(DMXEngine(), args.universes, ops, args.seed),
+        }
+    else:
+        workload = _workload(args.universes, args.frames, args.churn, args.seed)
+        ops = args.universes * args.frames
+        results = {
+            "loop": _run(LoopCompositor(), workload),
+            "vectorized": _run(DMXEngine(), workload),
+        }
+    for name, elapsed in results.items():
+        print(f"{name:>10}: {elapsed * 1000:8.1f} ms total, {elapsed / ops * 1e6:7.1f} us/op")
+    print(f"{'speedup':>10}: {results['loop'] / results['vectorized']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare head-expiry pruning of ``CommandDeduplicator`` with a full scan per accept.
+
+Usage:
+    python -m server.benchmarks.dedupe --entries 10000 100000 --accepts 500
+
+The cache is pre-filled to ``--entries`` live ids (capacity = entries), then
+``--accepts`` new ids are accepted one by one, as the command path does. The
+"scan" variant reproduces the previous ``_prune`` that listed every expired key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from server.persistence.dedupe import CommandDeduplicator
+
+
+class _ScanDeduplicator(CommandDeduplicator):
+    def _prune(self, now: float) -> None:
+        expired: List[str] = [key for key, ts in self._entries.items() if now - ts >= self.ttl_seconds]
+        for key in expired:
+            self._entries.pop(key, None)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+async def _run(cls: type[CommandDeduplicator], entries: int, accepts: int, root: Path) -> float:
+    dedupe = cls(ttl_seconds=3600, capacity=entries, path=root / f"{cls.__name__}-{entries}.json")
+    now = time.time()
+    for i in range(entries):
+        dedupe._entries[f"warm-{i}"] = now
+    start = time.perf_counter()
+    for i in range(accepts):
+        await dedupe.accept(f"cmd-{i}")
+    elapsed = time.perf_counter() - start
+    await dedupe.aclose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--accepts", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for entries in args.entries:
+            results = {
+                "scan": asyncio.run(_run(_ScanDeduplicator, entries, args.accepts, root)),
+                "head": asyncio.run(_run(CommandDeduplicator, entries, args.accepts, root)),
+            }
+            for name, elapsed in results.items():
+                print(f"{entries:>7} {name:>5}: {elapsed / args.accepts * 1e6:9.2f} us/accept")
+            print(f"{entries:>7} speedup: {results['scan'] / results['head']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare vectorized effect evaluation with a per-fixture loop.
+
+Usage:
+    python -m server.benchmarks.effects --fixtures 400 --ticks 44
+
+Four effects (chase, wave, pulse, rainbow) each drive every fixture; a tick
+evaluates all of them, as ``EffectsEngine.run`` does at ``tick_hz``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import List
+
+from server.dmx.effects import EffectsEngine, compile_effects
+
+
+def _show(fixtures: int) -> dict:
+    return {
+        "universes": [{"id": f"u{u}", "number": u} for u in range(fixtures * 3 // 512 + 1)],
+        "fixtures": [
+            {
+                "id": f"fx{i}",
+                "universeId": f"u{i * 3 // 510}",
+                "dmxAddress": 1 + (i * 3) % 510,
+                "channels": [{"id": f"c{i}-{n}", "number": n + 1} for n in range(3)],
+            }
+            for i in range(fixtures)
+        ],
+    }
+
+
+def _effects(fixtures: int) -> List[dict]:
+    ids = [f"fx{i}" for i in range(fixtures)]
+    return [
+        {"id": typ, "type": typ, "fixtureIds": ids, "speed": 100, "intensity": 100, "isActive": True, "parameters": {}}
+        for typ in ("chase", "wave", "pulse", "rainbow")
+    ]
+
+
+def _run_loop(fixtures: int, ticks: int) -> float:
+    start = time.perf_counter()
+    for n in range(ticks):
+        now = n * 1000 / ticks
+        for i in range(fixtures):
+            _ = 254 if math.floor((now / 2000) % fixtures) == i else 0
+            _ = math.floor((math.sin((now % 3000) / 3000 * 2 * math.pi + i / fixtures * 2 * math.pi) + 1) / 2 * 254)
+            _ = math.floor(math.sin((now % 2000) / 2000 * math.pi) ** 2 * 254)
+            hue = ((now % 5000) / 5000 + i / 12) % 1
+            for shift in (1 / 3, 0, -1 / 3):
+                t = (hue + shift) % 1
+                _ = round((6 * t if t < 1 / 6 else 1.0 if t < 1 / 2 else (2 / 3 - t) * 6 if t < 2 / 3 else 0.0) * 255)
+    return time.perf_counter() - start
+
+
+def _run_vectorized(fixtures: int, ticks: int) -> float:
+    eng = EffectsEngine()
+    eng.load(_effects(fixtures), _show(fixtures))
+    start = time.perf_counter()
+    for n in range(ticks):
+        eng.compose(n * 1000 / ticks)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=int, default=400)
+    parser.add_argument("--ticks", type=int, default=44, help="ticks to evaluate (44 = one second)")
+    args = parser.parse_args()
+
+    compile_effects(_effects(args.fixtures), _show(args.fixtures))  # warm up imports
+    results = {
+        "loop": _run_loop(args.fixtures, args.ticks),
+        "vectorized": _run_vectorized(args.fixtures, args.ticks),
+    }
+    for name, elapsed in results.items():
+        print(f"{name:>10}: {elapsed * 1000:8.1f} ms total, {elapsed / args.ticks * 1000:7.2f} ms/tick")
+    print(f"{'speedup':>10}: {results['loop'] / results['vectorized']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
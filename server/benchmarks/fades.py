@@ -0,0 +1,80 @@
+"""Compare vectorized fade evaluation with per-channel ``FadeTask.value_at`` calls.
+
+Usage:
+    python -m server.benchmarks.fades --universes 16 --channels 512 --ticks 44
+
+Each universe runs one full-universe crossfade; a tick evaluates every fading
+channel once, as ``FadeEngine.run`` does at ``tick_hz``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from server.dmx.fade_engine import FadeStore, FadeTask
+
+
+def _tasks(universes: int, channels: int, seed: int) -> Dict[int, List[FadeTask]]:
+    rng = random.Random(seed)
+    out: Dict[int, List[FadeTask]] = {}
+    for uni in range(universes):
+        chans = range(1, channels + 1)
+        out[uni] = [FadeTask(
+            universe=uni,
+            targets={ch: rng.randrange(256) for ch in chans},
+            start_values={ch: rng.randrange(256) for ch in chans},
+            start_ms=0,
+            duration_ms=1000,
+            easing="s_curve",
+        )]
+    return out
+
+
+def _run_scalar(tasks: Dict[int, List[FadeTask]], ticks: int) -> float:
+    start = time.perf_counter()
+    for n in range(ticks):
+        now_ms = n * 1000 // ticks
+        for lst in tasks.values():
+            deltas: Dict[int, int] = {}
+            for ft in lst:
+                for ch in ft.targets:
+                    deltas[ch] = ft.value_at(ch, now_ms)
+            [{"ch": ch, "val": val} for ch, val in deltas.items()]
+    return time.perf_counter() - start
+
+
+def _run_vectorized(tasks: Dict[int, List[FadeTask]], ticks: int) -> float:
+    stores = {uni: FadeStore(lst) for uni, lst in tasks.items()}
+    start = time.perf_counter()
+    for n in range(ticks):
+        now_ms = n * 1000 // ticks
+        for store in stores.values():
+            chans, values = store.evaluate(now_ms)
+            [{"ch": ch, "val": val} for ch, val in zip(chans.tolist(), values.tolist())]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universes", type=int, default=16)
+    parser.add_argument("--channels", type=int, default=512)
+    parser.add_argument("--ticks", type=int, default=44, help="ticks to evaluate (44 = one second)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    tasks = _tasks(args.universes, args.channels, args.seed)
+    results = {
+        "scalar": _run_scalar(tasks, args.ticks),
+        "vectorized": _run_vectorized(tasks, args.ticks),
+    }
+    per_tick = args.ticks
+    for name, elapsed in results.items():
+        print(f"{name:>10}: {elapsed * 1000:8.1f} ms total, {elapsed / per_tick * 1000:7.2f} ms/tick")
+    print(f"{'speedup':>10}: {results['scalar'] / results['vectorized']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
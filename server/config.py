@@ -26,11 +26,38 @@ class Settings(BaseSettings):
     )
     mqtt_keepalive: PositiveInt = Field(30, description="MQTT keepalive seconds.")
     queue_size: PositiveInt = Field(10_000, description="Max pending mutation commands.")
+    engine_coalesce: bool = Field(
+        False,
+        description="Drain all queued RGB commands per wake-up and apply only the last one.",
+    )
+    engine_batch_max: PositiveInt = Field(256, description="Max commands drained into one batch.")
+    engine_batch_max_ms: PositiveInt = Field(5, description="Max time (ms) spent draining one batch.")
+    engine_fanout: bool = Field(
+        True,
+        description="Deliver state transitions to output/persist/MQTT/WS through independent sink workers.",
+    )
+    engine_fanout_queue: PositiveInt = Field(256, description="Max pending state snapshots for queued sinks (WS).")
+    ws_queue_max: PositiveInt = Field(256, description="Max queued outbound messages per WS client.")
+    ws_slow_client_ms: PositiveInt = Field(
+        2000,
+        description="Disconnect a WS client whose queue stays full (or one send blocks) this long (ms).",
+    )
+    ws_ui_hz: int = Field(
+        30,
+        ge=0,
+        description="Default rate (Hz) at which state.update deltas are flushed to WS clients; 0 sends every update.",
+    )
+    ws_ui_hz_max: PositiveInt = Field(60, description="Highest state.update rate a WS client may request.")
     cmd_dedupe_ttl_seconds: PositiveInt = Field(
         15 * 60,
         description="Time-to-live for command id dedupe entries.",
     )
     cmd_dedupe_capacity: PositiveInt = Field(4096, description="Max dedupe cache size.")
+    cmd_dedupe_fsync_ms: int = Field(
+        1000,
+        ge=0,
+        description="Min interval between fsyncs of the dedupe log (ms); 0 leaves syncing to the OS.",
+    )
     # Optional test/DEV override for dedupe TTL (seconds). Read from env DEDUPE_TTL_SEC if defined.
     dedupe_ttl_override_sec: Optional[int] = Field(None, json_schema_extra={"env": "DEDUPE_TTL_SEC"})
     metrics_enabled: bool = Field(True, description="Expose /metrics endpoint if True.")
@@ -42,6 +69,17 @@ class Settings(BaseSettings):
         Path("data/state.json"),
         description="Path where the last known state is stored.",
     )
+    persist_debounce_ms: int = Field(
+        250,
+        ge=0,
+        description="Write-behind window for state.json (ms); 0 writes on every change.",
+    )
+    persist_fsync: bool = Field(False, description="fsync state.json writes (and the rename) for durability.")
+    universe_store_enabled: bool = Field(
+        True,
+        description="Persist programmer/parked DMX layers to universes.bin and restore them at startup.",
+    )
+    universe_store_interval_ms: PositiveInt = Field(1000, description="Write-behind interval of universes.bin (ms).")
     dedupe_path: Path = Field(
         Path("data/cmd_seen.json"),
         description="Path for persisted dedupe information.",
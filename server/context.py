@@ -20,8 +20,13 @@ from .util.metrics import CoreMetrics
 from .drivers.ola_universe import OLAUniverseManager
 from .fixtures.profiles import Profile
 from .fixtures.patch import FixtureInstance
+from .dmx.cues import CueEngine
+from .dmx.effects import EffectsEngine
 from .dmx.engine import DMXEngine
+from .dmx.submasters import SubmasterEngine
+from .dmx.output_clock import OutputClock
 from .persistence.show import ShowStore
+from .persistence.universes import UniverseStore
 from .persistence.projects import ProjectsStore, ProjectsIndex, ProjectMetadata, ProjectPaths
 from .backups.base import BackupClient
 from .drivers.dmx_input import SparkFunDMXInput
@@ -46,7 +51,17 @@ class AppContext:
     core: CoreMetrics = field(default_factory=CoreMetrics)
     rlimit: RateLimiter = field(default_factory=RateLimiter)
     ola_manager: OLAUniverseManager | None = None
+    output_clock: OutputClock | None = None
+    output_clock_task: asyncio.Task[None] | None = None
+    universe_store: UniverseStore | None = None
+    universe_store_task: asyncio.Task[None] | None = None
     dmx: DMXEngine = field(default_factory=DMXEngine)
+    cues: CueEngine = field(default_factory=CueEngine)
+    cues_task: asyncio.Task[None] | None = None
+    submasters: SubmasterEngine = field(default_factory=SubmasterEngine)
+    submasters_task: asyncio.Task[None] | None = None
+    effects: EffectsEngine = field(default_factory=EffectsEngine)
+    effects_task: asyncio.Task[None] | None = None
     fixture_profiles: dict[str, Profile] | None = None
     fixture_instances: dict[str, FixtureInstance] | None = None
     scenes_store: ScenesStore | None = None
@@ -0,0 +1,316 @@
+"""Server-side cue lists: GO / BACK / GOTO playback into the playback layer.
+
+Each cue points at a stored scene, compiled once into per-universe frames when the
+cue lists are loaded. A cue list runs as one playback; GO crossfades from whatever
+the playback currently outputs to the next cue (rising channels over ``fadeInMs``,
+falling ones over ``fadeOutMs``, both after ``delayMs``). Channels the new cue does
+not set fade out and are released once the cue completes. A cue with ``followMs``
+triggers the next cue that long after it completes.
+
+Several playbacks run at once; their outputs are merged HTP and written to the
+DMX engine's playback layer, so anything on higher layers (sACN, programmer)
+still takes over. Timing uses the fade engine clock (``FadeEngine.now_ms``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+import numpy as np
+
+from .easing import EASINGS
+from .engine import CHANNELS
+from .fade_engine import FadeEngine
+from .layer_writer import ApplyFrame, Broadcast, OlaApply, publish_frames
+from .scenes import ChannelMap, SceneFrame, compile_scene
+
+# (values float64[512], mask bool[512]) of one universe
+_Frame = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class Cue:
+    id: str
+    scene_id: str
+    fade_in_ms: int = 0
+    fade_out_ms: int = 0
+    delay_ms: int = 0
+    follow_ms: int | None = None
+    easing: str = "linear"
+    frames: Dict[int, SceneFrame] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> int:
+        return self.delay_ms + max(self.fade_in_ms, self.fade_out_ms)
+
+
+@dataclass
+class CueList:
+    id: str
+    name: str
+    cues: List[Cue]
+
+    def index_of(self, cue_id: str) -> int | None:
+        for i, cue in enumerate(self.cues):
+            if cue.id == cue_id:
+                return i
+        return None
+
+
+def _ms(value: Any, default: int | None = 0) -> int | None:
+    if value is None:
+        return default
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def compile_cue_lists(specs: Iterable[Any], scenes: Iterable[Mapping[str, Any]], chmap: ChannelMap) -> List[CueList]:
+    """Build cue lists from the show's ``cueLists``; each referenced scene is compiled once."""
+    by_id = {str(s.get("id")): s for s in scenes if isinstance(s, Mapping)}
+    compiled: Dict[str, Dict[int, SceneFrame]] = {}
+    out: List[CueList] = []
+    for spec in specs:
+        if not isinstance(spec, Mapping) or not spec.get("id"):
+            continue
+        cues: List[Cue] = []
+        for i, raw in enumerate(spec.get("cues") or []):
+            if not isinstance(raw, Mapping):
+                continue
+            scene_id = str(raw.get("sceneId") or "")
+            if scene_id not in compiled:
+                scene = by_id.get(scene_id)
+                values = scene.get("channelValues") if scene is not None else None
+                compiled[scene_id] = compile_scene(values if isinstance(values, Mapping) else {}, chmap)
+            fade_in = _ms(raw.get("fadeInMs"))
+            cues.append(Cue(
+                id=str(raw.get("id") or i + 1),
+                scene_id=scene_id,
+                fade_in_ms=fade_in,
+                fade_out_ms=_ms(raw.get("fadeOutMs"), fade_in),
+                delay_ms=_ms(raw.get("delayMs")),
+                follow_ms=_ms(raw.get("followMs"), None),
+                easing=str(raw.get("easing") or "linear"),
+                frames=compiled[scene_id],
+            ))
+        out.append(CueList(id=str(spec["id"]), name=str(spec.get("name") or spec["id"]), cues=cues))
+    return out
+
+
+class CuePlayback:
+    """Runtime state of one cue list."""
+
+    def __init__(self, cue_list: CueList) -> None:
+        self.cue_list = cue_list
+        self.index: int | None = None
+        self.start_ms = 0
+        self.follow_at: int | None = None
+        self._from: Dict[int, _Frame] = {}
+
+    @property
+    def cue(self) -> Cue | None:
+        if self.index is None:
+            return None
+        return self.cue_list.cues[self.index]
+
+    @property
+    def end_ms(self) -> int:
+        cue = self.cue
+        return self.start_ms + (cue.duration_ms if cue is not None else 0)
+
+    def fire(self, index: int, now_ms: int) -> None:
+        self._from = self.evaluate(now_ms)
+        self.index = index
+        self.start_ms = now_ms
+        cue = self.cue_list.cues[index]
+        has_next = index + 1 < len(self.cue_list.cues)
+        self.follow_at = self.end_ms + cue.follow_ms if cue.follow_ms is not None and has_next else None
+
+    def _progress(self, elapsed: int, fade_ms: int, curve: int) -> float:
+        if fade_ms <= 0:
+            return 1.0 if elapsed >= 0 else 0.0
+        return EASINGS.ease(curve, elapsed / fade_ms)
+
+    def evaluate(self, now_ms: int) -> Dict[int, _Frame]:
+        cue = self.cue
+        if cue is None:
+            return {}
+        elapsed = now_ms - self.start_ms - cue.delay_ms
+        curve = EASINGS.resolve(cue.easing)
+        f_in = self._progress(elapsed, cue.fade_in_ms, curve)
+        f_out = self._progress(elapsed, cue.fade_out_ms, curve)
+        done = now_ms >= self.end_ms
+        out: Dict[int, _Frame] = {}
+        zeros = np.zeros(CHANNELS, dtype=np.float64)
+        none = np.zeros(CHANNELS, dtype=bool)
+        for uni in set(self._from) | set(cue.frames):
+            src, src_mask = self._from.get(uni, (zeros, none))
+            target = cue.frames.get(uni)
+            dst = target.values.astype(np.float64) if target is not None else zeros
+            dst_mask = target.mask if target is not None else none
+            span = dst - src
+            values = src + span * np.where(span >= 0, f_in, f_out)
+            mask = dst_mask if done else (src_mask | dst_mask)
+            if mask.any():
+                out[uni] = (values, mask)
+        return out
+
+
+class CueEngine:
+    """All cue-list playbacks; ``run`` writes their merged output at ``tick_hz`` while fading."""
+
+    def __init__(self, *, tick_hz: int = 44) -> None:
+        self.tick_hz = tick_hz
+        self.lists: Dict[str, CueList] = {}
+        self.playbacks: Dict[str, CuePlayback] = {}
+        self._held: Set[int] = set()
+        self._dirty = False
+        self._last_ms = 0
+        self._wake = asyncio.Event()
+
+    def load(self, cue_lists: Iterable[CueList]) -> None:
+        """Replace the cue lists; running playbacks keep their position when their list survives."""
+        self.lists = {cl.id: cl for cl in cue_lists}
+        for list_id, pb in list(self.playbacks.items()):
+            cue_list = self.lists.get(list_id)
+            if cue_list is None or (pb.index is not None and pb.index >= len(cue_list.cues)):
+                del self.playbacks[list_id]
+                continue
+            pb.cue_list = cue_list
+        self._touch()
+
+    def _touch(self) -> None:
+        self._dirty = True
+        self._wake.set()
+
+    def _playback(self, list_id: str) -> CuePlayback | None:
+        cue_list = self.lists.get(list_id)
+        if cue_list is None or not cue_list.cues:
+            return None
+        pb = self.playbacks.get(list_id)
+        if pb is None:
+            pb = CuePlayback(cue_list)
+            self.playbacks[list_id] = pb
+        return pb
+
+    def _fire(self, pb: CuePlayback, index: int) -> bool:
+        if not 0 <= index < len(pb.cue_list.cues):
+            return False
+        pb.fire(index, FadeEngine.now_ms())
+        self._touch()
+        return True
+
+    def go(self, list_id: str) -> bool:
+        pb = self._playback(list_id)
+        if pb is None:
+            return False
+        return self._fire(pb, 0 if pb.index is None else pb.index + 1)
+
+    def back(self, list_id: str) -> bool:
+        pb = self._playback(list_id)
+        if pb is None or pb.index is None:
+            return False
+        return self._fire(pb, pb.index - 1)
+
+    def goto(self, list_id: str, cue_id: str) -> bool:
+        pb = self._playback(list_id)
+        if pb is None:
+            return False
+        index = pb.cue_list.index_of(cue_id)
+        return index is not None and self._fire(pb, index)
+
+    def release(self, list_id: str) -> bool:
+        if self.playbacks.pop(list_id, None) is None:
+            return False
+        self._touch()
+        return True
+
+    def state(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for cue_list in self.lists.values():
+            pb = self.playbacks.get(cue_list.id)
+            cue = pb.cue if pb is not None else None
+            out.append({
+                "id": cue_list.id,
+                "name": cue_list.name,
+                "cues": [c.id for c in cue_list.cues],
+                "current": cue.id if cue is not None else None,
+            })
+        return out
+
+    def _advance(self, now_ms: int) -> None:
+        """Trigger follow cues that are due; fired at their scheduled time, not the tick's."""
+        for pb in self.playbacks.values():
+            while pb.follow_at is not None and pb.follow_at <= now_ms:
+                pb.fire(pb.index + 1, pb.follow_at)
+
+    def compose(self, now_ms: int) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """HTP-merge all playbacks into uint8 frames; universes no longer played get an empty mask."""
+        values: Dict[int, np.ndarray] = {}
+        masks: Dict[int, np.ndarray] = {}
+        for pb in self.playbacks.values():
+            for uni, (vals, mask) in pb.evaluate(now_ms).items():
+                vals = np.where(mask, vals, 0.0)
+                if uni in values:
+                    np.maximum(values[uni], vals, out=values[uni])
+                    masks[uni] |= mask
+                else:
+                    values[uni] = vals
+                    masks[uni] = mask.copy()
+        out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for uni in self._held | set(values):
+            if uni in values:
+                frame = np.clip(np.rint(values[uni]), 0, 255).astype(np.uint8)
+                out[uni] = (frame, masks[uni])
+            else:
+                out[uni] = (np.zeros(CHANNELS, dtype=np.uint8), np.zeros(CHANNELS, dtype=bool))
+        self._held = set(values)
+        return out
+
+    def _fading(self) -> bool:
+        return any(self._last_ms < pb.end_ms for pb in self.playbacks.values())
+
+    def _next_follow(self) -> int | None:
+        due = [pb.follow_at for pb in self.playbacks.values() if pb.follow_at is not None]
+        return min(due) if due else None
+
+    async def run(
+        self,
+        *,
+        apply_frame: ApplyFrame,
+        broadcast: Broadcast,
+        ola_apply: OlaApply | None = None,
+    ) -> None:
+        interval = 1.0 / max(1, int(self.tick_hz))
+        next_at: float | None = None
+        while True:
+            if not self._dirty and not self._fading():
+                # idle: sleep until a command arrives or the next follow cue is due
+                self._wake.clear()
+                follow = self._next_follow()
+                timeout = None if follow is None else max(0.0, (follow - FadeEngine.now_ms()) / 1000)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                next_at = None
+            self._dirty = False
+            loop_start = time.monotonic()
+            if next_at is None:
+                next_at = loop_start
+            now_ms = FadeEngine.now_ms()
+            self._advance(now_ms)
+            self._last_ms = now_ms
+            await publish_frames(self.compose(now_ms), apply_frame=apply_frame, broadcast=broadcast, ola_apply=ola_apply)
+            next_at += interval
+            behind = time.monotonic() - next_at
+            if behind > interval:
+                next_at += int(behind // interval) * interval
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+
+
+__all__ = ["Cue", "CueList", "CuePlayback", "CueEngine", "compile_cue_lists"]
@@ -0,0 +1,266 @@
+"""Easing curves for fades, sampled into fixed-size lookup tables.
+
+Every curve is sampled once into a ``LUT_SIZE`` table over ``t`` in [0, 1];
+evaluation is an indexed lookup with linear interpolation between neighbouring
+entries. The scalar (:meth:`EasingRegistry.ease`) and batched
+(:meth:`EasingRegistry.ease_many`) paths use the same arithmetic, so they return
+identical values.
+
+Curves are referenced by name. Besides the built-ins, ``cubic-bezier(x1,y1,x2,y2)``
+names are sampled on first use into a bounded pool of slots keyed by their control
+points (least recently used slots are reused), and shows can define their own
+curves (``easingCurves`` in the show file) from bezier control points or sampled
+points.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+LUT_SIZE = 4096
+LINEAR = 0  # curve id of "linear"; unknown names fall back to it
+# slots for ad-hoc ``cubic-bezier(...)`` names; more distinct curves than this in
+# use at once would share slots, so keep it well above what a show runs together
+MAX_ADHOC = 64
+
+_BEZIER_RE = re.compile(r"^cubic-bezier\(\s*([^,]+),([^,]+),([^,]+),([^,)]+)\)$")
+
+
+def _expo(t: np.ndarray) -> np.ndarray:
+    out = np.minimum(np.power(2.0, 10 * (t - 1)), 1.0)
+    return np.where(t == 0, 0.0, out)
+
+
+def _expo_out(t: np.ndarray) -> np.ndarray:
+    return np.where(t == 1, 1.0, 1 - np.power(2.0, -10 * t))
+
+
+def _in_out(ease_in: Callable[[np.ndarray], np.ndarray]) -> Callable[[np.ndarray], np.ndarray]:
+    def curve(t: np.ndarray) -> np.ndarray:
+        return np.where(t < 0.5, ease_in(2 * t) / 2, 1 - ease_in(2 - 2 * t) / 2)
+
+    return curve
+
+
+BUILTIN_CURVES: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda t: t,
+    "s_curve": lambda t: t * t * (3 - 2 * t),
+    "expo": _expo,
+    "ease_in": lambda t: t ** 3,
+    "ease_out": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_out": _in_out(lambda t: t ** 3),
+    "expo_out": _expo_out,
+    "expo_in_out": _in_out(_expo),
+    "sine_in_out": lambda t: (1 - np.cos(np.pi * t)) / 2,
+}
+# CSS named timing functions
+BUILTIN_BEZIERS: Dict[str, tuple[float, float, float, float]] = {
+    "ease": (0.25, 0.1, 0.25, 1.0),
+    "css_ease_in": (0.42, 0.0, 1.0, 1.0),
+    "css_ease_out": (0.0, 0.0, 0.58, 1.0),
+    "css_ease_in_out": (0.42, 0.0, 0.58, 1.0),
+}
+
+
+def _check_bezier(x1: float, y1: float, x2: float, y2: float) -> None:
+    for name, v in (("x1", x1), ("x2", x2)):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError(f"cubic-bezier {name} must be within [0, 1]")
+    for v in (y1, y2):
+        if not math.isfinite(v):
+            raise ValueError("cubic-bezier y must be finite")
+
+
+def sample_bezier(x1: float, y1: float, x2: float, y2: float, size: int = LUT_SIZE) -> np.ndarray:
+    """Sample a CSS-style cubic bezier (P0=(0,0), P3=(1,1)) at ``size`` evenly spaced x."""
+    _check_bezier(x1, y1, x2, y2)
+    # x(s) is monotonic for x1, x2 in [0, 1]; sample densely and invert by interpolation
+    s = np.linspace(0.0, 1.0, size * 8)
+    inv = 1 - s
+    xs = 3 * inv * inv * s * x1 + 3 * inv * s * s * x2 + s ** 3
+    ys = 3 * inv * inv * s * y1 + 3 * inv * s * s * y2 + s ** 3
+    return np.interp(np.linspace(0.0, 1.0, size), xs, ys)
+
+
+def sample_points(points: Sequence[float], size: int = LUT_SIZE) -> np.ndarray:
+    """Resample evenly spaced curve points (first at t=0, last at t=1)."""
+    values = np.asarray([float(p) for p in points], dtype=np.float64)
+    if values.size < 2 or not np.isfinite(values).all():
+        raise ValueError("points need at least two finite values")
+    return np.interp(np.linspace(0.0, 1.0, size), np.linspace(0.0, 1.0, values.size), values)
+
+
+class EasingRegistry:
+    def __init__(self, size: int = LUT_SIZE, *, max_adhoc: int = MAX_ADHOC) -> None:
+        self.size = int(size)
+        self.max_adhoc = max(1, int(max_adhoc))
+        self._ids: Dict[str, int] = {}
+        self._lists: List[List[float]] = []
+        # rows beyond len(self._lists) are spare capacity (grown by doubling)
+        self._tables = np.zeros((16, self.size), dtype=np.float64)
+        # canonical control points -> slot id, least recently used first
+        self._adhoc: OrderedDict[tuple[float, float, float, float], int] = OrderedDict()
+        # spellings seen by ``resolve`` -> control points (bounded, saves reparsing)
+        self._spellings: OrderedDict[str, tuple[float, float, float, float]] = OrderedDict()
+        self._builtin: set[str] = set()
+        grid = np.linspace(0.0, 1.0, self.size)
+        for name, fn in BUILTIN_CURVES.items():
+            self._set(name, fn(grid))
+        for name, ctrl in BUILTIN_BEZIERS.items():
+            self._set(name, sample_bezier(*ctrl, size=self.size))
+        self._builtin = set(self._ids)
+
+    def _alloc(self, table: np.ndarray) -> int:
+        cid = len(self._lists)
+        if cid == self._tables.shape[0]:
+            grown = np.zeros((2 * cid, self.size), dtype=np.float64)
+            grown[:cid] = self._tables
+            self._tables = grown
+        self._lists.append(table.tolist())
+        self._tables[cid] = table
+        return cid
+
+    def _store(self, cid: int, table: np.ndarray) -> None:
+        self._lists[cid] = table.tolist()
+        self._tables[cid] = table
+
+    def _set(self, name: str, table: np.ndarray) -> int:
+        table = np.asarray(table, dtype=np.float64).reshape(self.size)
+        cid = self._ids.get(name)
+        if cid is None:
+            cid = self._ids[name] = self._alloc(table)
+        else:
+            # redefining keeps the id, so fades already holding it pick up the new shape
+            self._store(cid, table)
+        return cid
+
+    def names(self) -> List[str]:
+        return list(self._ids)
+
+    def known(self, name: str) -> bool:
+        if name in self._ids:
+            return True
+        try:
+            self._parse_bezier(name)
+        except ValueError:
+            return False
+        return True
+
+    def _parse_bezier(self, name: str) -> tuple[float, float, float, float]:
+        m = _BEZIER_RE.match(name.replace(" ", ""))
+        if m is None:
+            raise ValueError(f"unknown easing: {name}")
+        try:
+            x1, y1, x2, y2 = (float(g) for g in m.groups())
+        except ValueError:
+            raise ValueError(f"invalid cubic-bezier: {name}") from None
+        _check_bezier(x1, y1, x2, y2)
+        # +0.0 folds "-0" into "0", so spellings of the same curve share a slot
+        return (x1 + 0.0, y1 + 0.0, x2 + 0.0, y2 + 0.0)
+
+    def resolve(self, name: str) -> int:
+        """Curve id for ``name``; ``cubic-bezier(...)`` gets a pooled slot, unknown names map to linear."""
+        cid = self._ids.get(name)
+        if cid is not None:
+            return cid
+        ctrl = self._spellings.get(name)
+        if ctrl is None:
+            try:
+                ctrl = self._parse_bezier(name)
+            except ValueError:
+                return LINEAR
+        else:
+            self._spellings.move_to_end(name)
+        self._spellings[name] = ctrl
+        if len(self._spellings) > 4 * self.max_adhoc:
+            self._spellings.popitem(last=False)
+        cid = self._adhoc.get(ctrl)
+        if cid is not None:
+            self._adhoc.move_to_end(ctrl)
+            return cid
+        table = sample_bezier(*ctrl, size=self.size)
+        if len(self._adhoc) < self.max_adhoc:
+            cid = self._alloc(table)
+        else:
+            _, cid = self._adhoc.popitem(last=False)
+            self._store(cid, table)
+        self._adhoc[ctrl] = cid
+        return cid
+
+    def register(self, name: str, table: Sequence[float] | np.ndarray) -> int:
+        if name in self._builtin:
+            raise ValueError(f"cannot redefine built-in easing: {name}")
+        return self._set(name, np.asarray(table, dtype=np.float64))
+
+    def register_curves(self, specs: Iterable[Dict[str, Any]]) -> List[str]:
+        """Register show-file curves: ``{"name", "bezier": [x1, y1, x2, y2]}`` or ``{"name", "points": [...]}``.
+
+        All specs are validated before any is registered. Returns the registered names.
+        """
+        tables: Dict[str, np.ndarray] = {}
+        for spec in specs:
+            if not isinstance(spec, dict):
+                raise ValueError("easing curve must be an object")
+            name = spec.get("name")
+            if not isinstance(name, str) or not name or len(name) > 64:
+                raise ValueError("easing curve needs a name (1-64 chars)")
+            if name in self._builtin:
+                raise ValueError(f"cannot redefine built-in easing: {name}")
+            if "bezier" in spec:
+                ctrl = spec["bezier"]
+                if not isinstance(ctrl, (list, tuple)) or len(ctrl) != 4:
+                    raise ValueError(f"easing {name}: bezier needs [x1, y1, x2, y2]")
+                try:
+                    tables[name] = sample_bezier(*(float(v) for v in ctrl), size=self.size)
+                except (TypeError, ValueError) as exc:
+                    raise ValueError(f"easing {name}: {exc}") from None
+            elif "points" in spec:
+                pts = spec["points"]
+                if not isinstance(pts, (list, tuple)):
+                    raise ValueError(f"easing {name}: points must be a list")
+                try:
+                    tables[name] = sample_points(pts, size=self.size)
+                except (TypeError, ValueError) as exc:
+                    raise ValueError(f"easing {name}: {exc}") from None
+            else:
+                raise ValueError(f"easing {name}: expected 'bezier' or 'points'")
+        for name, table in tables.items():
+            self._set(name, table)
+        return list(tables)
+
+    def ease(self, curve: int, t: float) -> float:
+        """Scalar lookup of ``curve`` at ``t`` (clipped to [0, 1])."""
+        t = 0.0 if t <= 0 else (1.0 if t >= 1 else t)
+        table = self._lists[curve]
+        pos = t * (self.size - 1)
+        i = min(int(pos), self.size - 2)
+        frac = pos - i
+        lo = table[i]
+        return lo + (table[i + 1] - lo) * frac
+
+    def ease_many(self, curves: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Batched lookup: ``curves[k]`` evaluated at ``t[k]``; same arithmetic as :meth:`ease`."""
+        t = np.clip(t, 0.0, 1.0)
+        pos = t * (self.size - 1)
+        i = np.minimum(pos.astype(np.int64), self.size - 2)
+        frac = pos - i
+        lo = self._tables[curves, i]
+        return lo + (self._tables[curves, i + 1] - lo) * frac
+
+
+EASINGS = EasingRegistry()
+
+__all__ = [
+    "EASINGS",
+    "EasingRegistry",
+    "LUT_SIZE",
+    "LINEAR",
+    "MAX_ADHOC",
+    "sample_bezier",
+    "sample_points",
+]
@@ -0,0 +1,241 @@
+"""Server-side effects generator for the show's ``effects`` list.
+
+Supported effect types mirror the browser's generators: ``chase``, ``wave`` (sine),
+``pulse`` and ``rainbow``. Loading compiles every fixture an effect drives into
+flat per-slot arrays (universe, channel, waveform, period, phase, amplitude), so a
+tick is one vectorized evaluation across all effects and fixtures, scattered
+HTP into per-universe frames for the DMX engine's effects layer.
+
+Per-fixture phase spread: ``parameters.spread`` is the fraction of a cycle spread
+across the effect's fixtures (wave defaults to 1, pulse to 0; rainbow steps 30°
+per fixture unless ``spread`` is given). Other effect types are left to the UI.
+Missing ``speed``/``intensity`` default to the UI's 50 and 100; entries with
+non-numeric values are logged and skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+import numpy as np
+
+from .engine import CHANNELS
+from .fade_engine import FadeEngine
+from .layer_writer import ApplyFrame, Broadcast, OlaApply, publish_frames
+from .scenes import fixture_addresses
+
+CHASE = 0
+WAVE = 1
+PULSE = 2
+RAINBOW = 3
+
+_KINDS = {"chase": CHASE, "wave": WAVE, "sine": WAVE, "pulse": PULSE, "rainbow": RAINBOW}
+# cycle length at speed 100, as in the UI (chase: per step)
+_CYCLE_MS = {CHASE: 2000.0, WAVE: 3000.0, PULSE: 2000.0, RAINBOW: 5000.0}
+# hue shift of the r, g, b components for hsl(h, 1, 0.5)
+_RGB_SHIFT = np.array([1 / 3, 0.0, -1 / 3])
+# UI defaults: speed 50, full intensity
+_DEFAULT_SPEED = 50.0
+_FULL_INTENSITY = 100.0
+
+logger = logging.getLogger("dmx.effects")
+
+
+@dataclass
+class EffectSlots:
+    """Flat per-(effect, fixture, channel) parameters of all running effects."""
+
+    effect: np.ndarray  # index into the effect id list
+    universe: np.ndarray
+    channel: np.ndarray  # 0-based
+    kind: np.ndarray
+    period: np.ndarray  # ms
+    phase: np.ndarray  # fraction of a cycle
+    intensity: np.ndarray  # 0..100
+    step: np.ndarray  # fixture index (chase)
+    count: np.ndarray  # fixtures in the effect (chase)
+    component: np.ndarray  # 0..2 for rainbow r/g/b
+
+    def __len__(self) -> int:
+        return int(self.channel.size)
+
+
+def _number(value: Any, default: float) -> float:
+    """``value`` as a finite float (``default`` when missing); raises ValueError otherwise."""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f"not a number: {value!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"not a number: {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"not a number: {value!r}")
+    return number
+
+
+def compile_effects(effects: Iterable[Any], show: Mapping[str, Any]) -> Tuple[List[str], EffectSlots]:
+    """Compile supported effects into slots; returns (effect ids, slots)."""
+    fixtures = fixture_addresses(show)
+    ids: List[str] = []
+    cols: Dict[str, List[float]] = {name: [] for name in EffectSlots.__dataclass_fields__}
+    for eff in effects:
+        if not isinstance(eff, Mapping) or not eff.get("id"):
+            continue
+        kind = _KINDS.get(str(eff.get("type")))
+        if kind is None:
+            continue
+        params = eff.get("parameters") if isinstance(eff.get("parameters"), Mapping) else {}
+        fx_ids = [str(f) for f in eff.get("fixtureIds") or [] if str(f) in fixtures]
+        count = len(fx_ids)
+        if not count:
+            continue
+        try:
+            speed = max(1.0, _number(eff.get("speed"), _DEFAULT_SPEED)) / 100
+            intensity = max(0.0, min(_FULL_INTENSITY, _number(eff.get("intensity"), _FULL_INTENSITY)))
+            default_spread = {WAVE: 1.0, RAINBOW: count * 30 / 360}.get(kind, 0.0)
+            step_phase = _number(params.get("spread"), default_spread) / count
+        except ValueError as exc:
+            logger.warning("effect_skipped id=%s: %s", eff["id"], exc)
+            continue
+        eff_index = len(ids)
+        ids.append(str(eff["id"]))
+        for idx, fx_id in enumerate(fx_ids):
+            universe, chans = fixtures[fx_id]
+            used = chans[:3] if kind == RAINBOW else chans[:1]
+            for comp, (_, ch) in enumerate(used):
+                cols["effect"].append(eff_index)
+                cols["universe"].append(universe)
+                cols["channel"].append(ch - 1)
+                cols["kind"].append(kind)
+                cols["period"].append(_CYCLE_MS[kind] / speed)
+                cols["phase"].append(idx * step_phase)
+                cols["intensity"].append(intensity)
+                cols["step"].append(idx)
+                cols["count"].append(count)
+                cols["component"].append(comp)
+    ints = {"effect", "universe", "channel", "kind", "step", "count", "component"}
+    slots = EffectSlots(**{
+        name: np.array(values, dtype=np.int64 if name in ints else np.float64)
+        for name, values in cols.items()
+    })
+    return ids, slots
+
+
+def evaluate(slots: EffectSlots, now_ms: float) -> np.ndarray:
+    """Values (0..255 ints) of every slot at ``now_ms``, rounded like the UI generators."""
+    cycles = now_ms / np.where(slots.period > 0, slots.period, 1.0)
+    progress = np.mod(cycles + slots.phase, 1.0)
+    out = np.zeros(len(slots), dtype=np.float64)
+    kind = slots.kind
+    chase = kind == CHASE
+    if chase.any():
+        active = np.floor(np.mod(cycles[chase], slots.count[chase])) == slots.step[chase]
+        out[chase] = np.where(active, 1.0, 0.0)
+    wave = kind == WAVE
+    if wave.any():
+        out[wave] = (np.sin(progress[wave] * 2 * np.pi) + 1) / 2
+    pulse = kind == PULSE
+    if pulse.any():
+        out[pulse] = np.sin(progress[pulse] * np.pi) ** 2
+    rainbow = kind == RAINBOW
+    out = out * slots.intensity * 2.55
+    if rainbow.any():
+        t = np.mod(progress[rainbow] + _RGB_SHIFT[slots.component[rainbow]], 1.0)
+        ramp = np.where(t < 1 / 6, 6 * t, np.where(t < 1 / 2, 1.0, np.where(t < 2 / 3, (2 / 3 - t) * 6, 0.0)))
+        out[rainbow] = np.round(ramp * 255) * slots.intensity[rainbow] / 100
+    return np.floor(out).astype(np.int64)
+
+
+class EffectsEngine:
+    """Runs the compiled effects at ``tick_hz`` while any is active; idle otherwise."""
+
+    def __init__(self, *, tick_hz: int = 44) -> None:
+        self.tick_hz = tick_hz
+        self.ids: List[str] = []
+        self._all = compile_effects([], {})[1]
+        self.active: Set[str] = set()
+        self._held: Set[int] = set()
+        self._wake = asyncio.Event()
+        self._select()
+        self._dirty = False
+
+    def load(self, effects: Iterable[Any], show: Mapping[str, Any]) -> None:
+        """Compile the show's effects; those marked ``isActive`` start running."""
+        effects = [e for e in effects if isinstance(e, Mapping)]
+        self.ids, self._all = compile_effects(effects, show)
+        self.active = {str(e["id"]) for e in effects if e.get("isActive") and str(e.get("id")) in self.ids}
+        self._select()
+
+    def _select(self) -> None:
+        running = np.array([eid in self.active for eid in self.ids], dtype=bool)
+        keep = running[self._all.effect] if len(self._all) else np.zeros(0, dtype=bool)
+        self._slots = EffectSlots(**{name: getattr(self._all, name)[keep] for name in EffectSlots.__dataclass_fields__})
+        # scatter targets are fixed until the selection changes: precompute them once
+        self._universes, rows = np.unique(self._slots.universe, return_inverse=True)
+        self._flat = rows * CHANNELS + self._slots.channel
+        self._masks = np.zeros((self._universes.size, CHANNELS), dtype=bool)
+        self._masks.reshape(-1)[self._flat] = True
+        self._dirty = True
+        self._wake.set()
+
+    def start(self, effect_id: str) -> bool:
+        if effect_id not in self.ids:
+            return False
+        self.active.add(effect_id)
+        self._select()
+        return True
+
+    def stop(self, effect_id: str) -> bool:
+        if effect_id not in self.active:
+            return False
+        self.active.discard(effect_id)
+        self._select()
+        return True
+
+    def state(self) -> List[Dict[str, Any]]:
+        return [{"id": eid, "active": eid in self.active} for eid in self.ids]
+
+    def compose(self, now_ms: float) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Evaluate all running slots and scatter them HTP into per-universe frames."""
+        slots = self._slots
+        out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        if len(slots):
+            frames = np.zeros((self._universes.size, CHANNELS), dtype=np.int64)
+            np.maximum.at(frames.reshape(-1), self._flat, evaluate(slots, now_ms))
+            frames = frames.astype(np.uint8)
+            for i, uni in enumerate(self._universes.tolist()):
+                out[uni] = (frames[i], self._masks[i])
+        for uni in self._held - set(out):
+            out[uni] = (np.zeros(CHANNELS, dtype=np.uint8), np.zeros(CHANNELS, dtype=bool))
+        self._held = {uni for uni, (_, mask) in out.items() if mask.any()}
+        return out
+
+    async def run(self, *, apply_frame: ApplyFrame, broadcast: Broadcast, ola_apply: OlaApply | None = None) -> None:
+        interval = 1.0 / max(1, int(self.tick_hz))
+        next_at: float | None = None
+        while True:
+            if not self._dirty and not len(self._slots):
+                self._wake.clear()
+                await self._wake.wait()
+                next_at = None
+            self._dirty = False
+            loop_start = time.monotonic()
+            if next_at is None:
+                next_at = loop_start
+            frames = self.compose(FadeEngine.now_ms())
+            await publish_frames(frames, apply_frame=apply_frame, broadcast=broadcast, ola_apply=ola_apply)
+            next_at += interval
+            behind = time.monotonic() - next_at
+            if behind > interval:
+                next_at += int(behind // interval) * interval
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+
+
+__all__ = ["EffectSlots", "EffectsEngine", "compile_effects", "evaluate"]
@@ -1,101 +1,479 @@
 """General DMX engine with multi-universe state and layered output.
 
-Layers:
- - local_frame: state from local commands and fades
- - sacn_frame: state merged from sACN sources
- - output_frame: max(local, sacn) per channel, published to clients/OLA
+Layers form an ordered stack (see ``dmx/layers.py``): playback, sACN, effects,
+local (programmer: commands and fades) and parked by default. The output frame
+published to clients/OLA merges the stack per channel: HTP channels take the
+highest value, LTP channels (from the fixture patch) the highest-priority layer
+holding the channel, and override layers (parked) win outright.
+
+Layer values and "holds the channel" flags live in ``(layers, rows, 512)`` arrays;
+a universe maps to a row index. The per-channel merge policy is a precompiled
+``(rows, 512)`` LTP mask, so compositing a universe is one batched reduction over
+the layer axis instead of per-channel branching in Python.
+
+Writes mark dirty channel ranges per universe and layer. A recompute only
+merges and diffs the dirty ranges: small patches (a fader move) walk just the
+touched channels, while layer replacements (sACN composites) mark the whole
+frame and take the vectorized full-frame path.
+
+Every output change bumps the global revision and is recorded in a bounded
+per-universe log of changed channels, so a client that reconnects with the last
+revision it saw can be sent just the channels that changed since then.
+
+Readers get immutable ``bytes`` frames cached per universe and invalidated by the
+universe's revision, plus a single-channel accessor that reads the output array
+directly; neither materializes the other universes.
 """
 
 from __future__ import annotations
 
+import bisect
 import time
-from typing import Dict, List, Tuple
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+
+from .layers import LAYER_LOCAL, LAYER_SACN, LayerSpec, default_layers, ordered
+
+CHANNELS = 512
+_INITIAL_ROWS = 4
+# Dirty sets up to this many channels are merged channel-by-channel; larger ones
+# use a vectorized pass over their bounding span.
+_SCALAR_LIMIT = 32
+# Output changes kept per universe for resume-since-rev replay.
+_HISTORY = 256
+_ZERO_FRAME = bytes(CHANNELS)
+_CHANNEL_KEYS = range(1, CHANNELS + 1)
+
+
+def _delta_from(idx: np.ndarray, values: np.ndarray, offset: int = 0) -> List[dict]:
+    return [{"ch": ch + offset + 1, "val": val} for ch, val in zip(idx.tolist(), values.tolist())]
+
+
+class DirtyRanges:
+    """Sorted, merged half-open channel index ranges awaiting recompute."""
+
+    __slots__ = ("ranges", "full")
 
-class DMXEngine:
     def __init__(self) -> None:
-        # universe -> 512-byte frame for each layer
-        self._local: Dict[int, bytearray] = {0: bytearray(512)}
-        self._sacn: Dict[int, bytearray] = {}
-        self._output: Dict[int, bytearray] = {0: bytearray(512)}
+        self.ranges: List[Tuple[int, int]] = []
+        self.full = False
+
+    def __bool__(self) -> bool:
+        return self.full or bool(self.ranges)
+
+    def add(self, lo: int, hi: int) -> None:
+        if self.full:
+            return
+        ranges = self.ranges
+        pos = bisect.bisect_left(ranges, (lo, hi))
+        # merge with the predecessor when it touches or overlaps
+        if pos > 0 and ranges[pos - 1][1] >= lo:
+            pos -= 1
+            lo = ranges[pos][0]
+            hi = max(hi, ranges[pos][1])
+            del ranges[pos]
+        while pos < len(ranges) and ranges[pos][0] <= hi:
+            hi = max(hi, ranges[pos][1])
+            del ranges[pos]
+        ranges.insert(pos, (lo, hi))
+
+    def mark_full(self) -> None:
+        self.full = True
+        self.ranges.clear()
+
+    def update(self, other: "DirtyRanges") -> None:
+        if other.full:
+            self.mark_full()
+            return
+        for lo, hi in other.ranges:
+            self.add(lo, hi)
+
+    def count(self) -> int:
+        if self.full:
+            return CHANNELS
+        return sum(hi - lo for lo, hi in self.ranges)
+
+    def clear(self) -> None:
+        self.ranges.clear()
+        self.full = False
+
+
+class DMXEngine:
+    def __init__(self, history: int = _HISTORY, layers: Sequence[LayerSpec] | None = None) -> None:
+        self._layers: List[LayerSpec] = ordered(layers if layers is not None else default_layers())
+        self._layer_index: Dict[str, int] = {spec.name: i for i, spec in enumerate(self._layers)}
+        self._overrides: List[int] = [i for i, spec in enumerate(self._layers) if spec.override]
+        n = len(self._layers)
+        # universe -> row in the layer arrays
+        self._rows: Dict[int, int] = {}
+        # layer values (0 where the layer does not hold the channel) and hold flags
+        self._values = np.zeros((n, _INITIAL_ROWS, CHANNELS), dtype=np.uint8)
+        self._active = np.zeros((n, _INITIAL_ROWS, CHANNELS), dtype=bool)
+        # per-channel merge policy: True = LTP, False = HTP
+        self._ltp = np.zeros((_INITIAL_ROWS, CHANNELS), dtype=bool)
+        self._output = np.zeros((_INITIAL_ROWS, CHANNELS), dtype=np.uint8)
+        self._bind_views()
+        # (universe, layer) -> pending dirty ranges
+        self._dirty: Dict[Tuple[int, str], DirtyRanges] = {}
         self._rev: int = 0
         self._ts: int = int(time.time() * 1000)
+        # Revisions restart with the process; clients resuming by rev must present
+        # the epoch they saw so revs from a previous run are never trusted.
+        self._epoch: int = self._ts
+        self._history = max(1, int(history))
+        # universe -> global rev of its last output change / registration
+        self._urev: Dict[int, int] = {}
+        self._born: Dict[int, int] = {}
+        # universe -> (rev, changed channel indexes) for recent output changes
+        self._log: Dict[int, Deque[Tuple[int, Sequence[int]]]] = {}
+        # universe -> newest rev no longer covered by the log
+        self._floor: Dict[int, int] = {}
+        # universe -> (universe rev, immutable output frame)
+        self._frames: Dict[int, Tuple[int, bytes]] = {}
+        self._row(0)
+
+    def _bind_views(self) -> None:
+        # Flat memoryviews give cheap scalar access for the per-channel path.
+        self._values_mv = memoryview(self._values.reshape(-1))
+        self._active_mv = memoryview(self._active.reshape(-1))
+        self._ltp_mv = memoryview(self._ltp.reshape(-1))
+        self._output_mv = memoryview(self._output.reshape(-1))
+        # distance between the same channel of adjacent layers in the flat views
+        self._stride = self._output.size
+
+    def _row(self, universe: int) -> int:
+        row = self._rows.get(universe)
+        if row is not None:
+            return row
+        row = len(self._rows)
+        if row >= self._output.shape[0]:
+            self._grow(row + 1)
+        self._rows[universe] = row
+        self._urev[universe] = self._born[universe] = self._floor[universe] = self._rev
+        self._log[universe] = deque(maxlen=self._history)
+        return row
+
+    def _grow(self, min_rows: int) -> None:
+        rows = self._output.shape[0]
+        while rows < min_rows:
+            rows *= 2
+        for name in ("_ltp", "_output"):
+            old = getattr(self, name)
+            new = np.zeros((rows, CHANNELS), dtype=old.dtype)
+            new[: old.shape[0]] = old
+            setattr(self, name, new)
+        for name in ("_values", "_active"):
+            old = getattr(self, name)
+            new = np.zeros((old.shape[0], rows, CHANNELS), dtype=old.dtype)
+            new[:, : old.shape[1]] = old
+            setattr(self, name, new)
+        self._bind_views()
 
-    def _frame_local(self, universe: int) -> bytearray:
-        if universe not in self._local:
-            self._local[universe] = bytearray(512)
-        return self._local[universe]
+    def _dirty_for(self, universe: int, layer: str) -> DirtyRanges:
+        key = (universe, layer)
+        dirty = self._dirty.get(key)
+        if dirty is None:
+            dirty = DirtyRanges()
+            self._dirty[key] = dirty
+        return dirty
 
-    def _frame_sacn(self, universe: int) -> bytearray:
-        if universe not in self._sacn:
-            self._sacn[universe] = bytearray(512)
-        return self._sacn[universe]
+    def _layer(self, layer: str) -> int:
+        try:
+            return self._layer_index[layer]
+        except KeyError:
+            raise ValueError(f"unknown layer: {layer}") from None
 
-    def _frame_output(self, universe: int) -> bytearray:
-        if universe not in self._output:
-            self._output[universe] = bytearray(512)
-        return self._output[universe]
+    def universes(self) -> List[int]:
+        return list(self._rows.keys())
+
+    def layers(self) -> List[LayerSpec]:
+        """Layer stack from lowest to highest priority."""
+        return list(self._layers)
 
     def apply_patch(self, universe: int, items: List[dict]) -> Tuple[List[dict], int, int]:
         """Apply a local patch and recompute output. Returns (delta, rev, ts)."""
         return self.apply_local_patch(universe, items)
 
     def apply_local_patch(self, universe: int, items: List[dict]) -> Tuple[List[dict], int, int]:
-        """Apply a patch to the local layer and recompute output. Returns output delta."""
+        """Apply a patch to the local layer and recompute the touched channels. Returns output delta."""
+        return self.apply_layer_patch(universe, LAYER_LOCAL, items)
+
+    def apply_layer_patch(self, universe: int, layer: str, items: List[dict]) -> Tuple[List[dict], int, int]:
+        """Set channels on ``layer`` (the layer then holds them) and recompute. Returns output delta."""
         uni = int(universe)
-        frame = self._frame_local(uni)
+        li = self._layer(layer)
         latest: Dict[int, int] = {}
         for it in items:
             ch = int(it.get("ch"))
             val = int(it.get("val"))
-            if 1 <= ch <= 512 and 0 <= val <= 255:
-                latest[ch] = val
+            if 1 <= ch <= CHANNELS and 0 <= val <= 255:
+                latest[ch - 1] = val
+        if not latest:
+            return [], self._rev, self._ts
+        row = self._row(uni)
+        base = li * self._stride + row * CHANNELS
+        values, active = self._values_mv, self._active_mv
+        dirty = self._dirty_for(uni, layer)
         changed = False
-        for ch, val in latest.items():
-            idx = ch - 1
-            if frame[idx] != val:
-                frame[idx] = val
+        for idx, val in latest.items():
+            i = base + idx
+            if values[i] != val or not active[i]:
+                values[i] = val
+                active[i] = True
+                dirty.add(idx, idx + 1)
                 changed = True
         return self.recompute_output(uni) if changed else ([], self._rev, self._ts)
 
     def apply_sacn_composite(self, universe: int, frame_bytes: bytes | bytearray | list[int]) -> Tuple[List[dict], int, int]:
-        """Replace sACN composite frame for universe and recompute output."""
+        """Replace sACN composite frame for universe and recompute output (full-frame path)."""
+        return self.apply_layer_frame(universe, LAYER_SACN, frame_bytes)
+
+    def apply_layer_frame(
+        self,
+        universe: int,
+        layer: str,
+        frame_bytes: bytes | bytearray | list[int] | np.ndarray,
+        mask: Sequence[bool] | np.ndarray | None = None,
+    ) -> Tuple[List[dict], int, int]:
+        """Replace all 512 channels of ``layer`` for universe and recompute output (full-frame path).
+
+        ``mask`` limits which channels the layer holds afterwards (all when None); values
+        outside it are stored as 0.
+        """
         uni = int(universe)
-        frame = self._frame_sacn(uni)
-        # normalize to list of 512 ints
-        arr = list(frame_bytes)
-        if len(arr) < 512:
-            arr = arr + [0] * (512 - len(arr))
-        changed = False
-        for i in range(512):
-            val = int(arr[i]) & 0xFF
-            if frame[i] != val:
-                frame[i] = val
-                changed = True
-        return self.recompute_output(uni) if changed else ([], self._rev, self._ts)
+        li = self._layer(layer)
+        row = self._row(uni)
+        incoming = self._normalize_frame(frame_bytes)
+        holds = np.ones(CHANNELS, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)[:CHANNELS]
+        if mask is not None:
+            incoming = np.where(holds, incoming, 0).astype(np.uint8)
+        frame = self._values[li, row]
+        held = self._active[li, row]
+        if np.array_equal(frame, incoming) and np.array_equal(held, holds):
+            return [], self._rev, self._ts
+        frame[:] = incoming
+        held[:] = holds
+        self._dirty_for(uni, layer).mark_full()
+        return self.recompute_output(uni)
 
-    def recompute_output(self, universe: int) -> Tuple[List[dict], int, int]:
-        """Compute output = max(local, sacn) per channel; return delta vs last output."""
+    def release_layer(self, universe: int, layer: str, channels: Iterable[int] | None = None) -> Tuple[List[dict], int, int]:
+        """Stop ``layer`` holding the given channels (1-based; all when None) and recompute."""
         uni = int(universe)
-        local = self._frame_local(uni)
-        sacn = self._frame_sacn(uni)
-        out = self._frame_output(uni)
-        delta: List[dict] = []
-        for i in range(512):
-            v = local[i] if local[i] >= sacn[i] else sacn[i]
-            if out[i] != v:
-                out[i] = v
-                delta.append({"ch": i + 1, "val": int(v)})
-        if delta:
-            self._rev += 1
-            self._ts = int(time.time() * 1000)
+        li = self._layer(layer)
+        row = self._rows.get(uni)
+        if row is None:
+            return [], self._rev, self._ts
+        held = self._active[li, row]
+        dirty = self._dirty_for(uni, layer)
+        if channels is None:
+            if not held.any():
+                return [], self._rev, self._ts
+            self._values[li, row] = 0
+            held[:] = False
+            dirty.mark_full()
+        else:
+            idx = sorted({int(ch) - 1 for ch in channels if 1 <= int(ch) <= CHANNELS})
+            idx = [i for i in idx if held[i]]
+            if not idx:
+                return [], self._rev, self._ts
+            self._values[li, row, idx] = 0
+            held[idx] = False
+            for i in idx:
+                dirty.add(i, i + 1)
+        return self.recompute_output(uni)
+
+    def set_ltp_mask(self, universe: int, mask: Sequence[bool] | np.ndarray | None) -> Tuple[List[dict], int, int]:
+        """Set the merge policy of a universe (True = LTP per channel; None = all HTP)."""
+        uni = int(universe)
+        row = self._row(uni)
+        new = np.zeros(CHANNELS, dtype=bool) if mask is None else np.asarray(mask, dtype=bool).reshape(CHANNELS)
+        if np.array_equal(self._ltp[row], new):
+            return [], self._rev, self._ts
+        self._ltp[row] = new
+        return self.recompute_output(uni, full=True)
+
+    def set_merge_masks(self, masks: Mapping[int, Sequence[bool] | np.ndarray]) -> Dict[int, Tuple[List[dict], int, int]]:
+        """Replace all merge policies; universes missing from ``masks`` revert to HTP.
+
+        Returns ``{universe: (delta, rev, ts)}`` for universes whose output changed.
+        """
+        out: Dict[int, Tuple[List[dict], int, int]] = {}
+        for uni in set(self._rows) | {int(u) for u in masks}:
+            res = self.set_ltp_mask(uni, masks.get(uni))
+            if res[0]:
+                out[uni] = res
+        return out
+
+    @staticmethod
+    def _normalize_frame(frame_bytes: bytes | bytearray | memoryview | list[int] | np.ndarray) -> np.ndarray:
+        if isinstance(frame_bytes, np.ndarray) and frame_bytes.dtype == np.uint8:
+            arr = frame_bytes
+        elif isinstance(frame_bytes, (bytes, bytearray, memoryview)):
+            arr = np.frombuffer(frame_bytes, dtype=np.uint8)
+        else:
+            arr = (np.asarray(frame_bytes, dtype=np.int64) & 0xFF).astype(np.uint8)
+        if arr.shape[0] >= CHANNELS:
+            return arr[:CHANNELS]
+        out = np.zeros(CHANNELS, dtype=np.uint8)
+        out[: arr.shape[0]] = arr
+        return out
+
+    def _take_dirty(self, universe: int) -> DirtyRanges:
+        pending = DirtyRanges()
+        for layer in self._layer_index:
+            dirty = self._dirty.get((universe, layer))
+            if dirty:
+                pending.update(dirty)
+                dirty.clear()
+        return pending
+
+    def recompute_output(self, universe: int, *, full: bool = False) -> Tuple[List[dict], int, int]:
+        """Merge the layer stack over the dirty channels; return delta vs last output.
+
+        ``full=True`` ignores dirty tracking and re-merges the whole frame.
+        """
+        uni = int(universe)
+        row = self._row(uni)
+        pending = self._take_dirty(uni)
+        if full:
+            pending.mark_full()
+        if not pending:
+            return [], self._rev, self._ts
+        if pending.full or pending.count() > _SCALAR_LIMIT:
+            lo = 0 if pending.full else pending.ranges[0][0]
+            hi = CHANNELS if pending.full else pending.ranges[-1][1]
+            merged = self._merge_span(row, lo, hi)
+            out = self._output[row, lo:hi]
+            idx = np.flatnonzero(merged != out)
+            if idx.size == 0:
+                return [], self._rev, self._ts
+            values = merged[idx]
+            out[idx] = values
+            delta = _delta_from(idx, values, lo)
+            changed: Sequence[int] = (idx + lo).astype(np.uint16)
+        else:
+            delta = self._merge_scalar(row, pending.ranges)
+            if not delta:
+                return [], self._rev, self._ts
+            changed = [d["ch"] - 1 for d in delta]
+        self._rev += 1
+        self._ts = int(time.time() * 1000)
+        self._record(uni, changed)
         return delta, self._rev, self._ts
 
+    def _record(self, universe: int, changed: Sequence[int]) -> None:
+        log = self._log[universe]
+        if len(log) == log.maxlen:
+            self._floor[universe] = log[0][0]
+        log.append((self._rev, changed))
+        self._urev[universe] = self._rev
+
+    def deltas_since(self, universe: int, rev: int) -> Optional[List[dict]]:
+        """Return the merged output delta of ``universe`` after global ``rev``.
+
+        Values are the current output of every channel that changed since ``rev``.
+        Returns None when the log cannot cover the gap (evicted history, a rev
+        from the future, or a universe registered at/after ``rev``); the caller
+        must then send a full snapshot.
+        """
+        uni = int(universe)
+        rev = int(rev)
+        row = self._rows.get(uni)
+        if row is None or rev > self._rev or self._born[uni] >= rev or rev < self._floor[uni]:
+            return None
+        if self._urev[uni] <= rev:
+            return []
+        mask = np.zeros(CHANNELS, dtype=bool)
+        for entry_rev, changed in reversed(self._log[uni]):
+            if entry_rev <= rev:
+                break
+            mask[changed] = True
+        idx = np.flatnonzero(mask)
+        return _delta_from(idx, self._output[row, idx])
+
+    def _merge_span(self, row: int, lo: int, hi: int) -> np.ndarray:
+        values = self._values[:, row, lo:hi]
+        merged = np.maximum.reduce(values)
+        ltp = self._ltp[row, lo:hi]
+        if ltp.any():
+            active = self._active[:, row, lo:hi]
+            # highest layer holding each channel; layers not holding it carry 0
+            top = values.shape[0] - 1 - active[::-1].argmax(axis=0)
+            held = np.take_along_axis(values, top[np.newaxis], axis=0)[0]
+            merged = np.where(ltp, held, merged)
+        for li in self._overrides:
+            parked = self._active[li, row, lo:hi]
+            if parked.any():
+                merged = np.where(parked, self._values[li, row, lo:hi], merged)
+        return merged
+
+    def _merge_scalar(self, row: int, ranges: List[Tuple[int, int]]) -> List[dict]:
+        base = row * CHANNELS
+        values, active, ltp, out = self._values_mv, self._active_mv, self._ltp_mv, self._output_mv
+        stride = self._stride
+        layer_offsets = [li * stride for li in range(len(self._layers))]
+        top_down = layer_offsets[::-1]
+        override_offsets = [li * stride for li in self._overrides]
+        delta: List[dict] = []
+        for lo, hi in ranges:
+            for i in range(base + lo, base + hi):
+                v = 0
+                if ltp[i]:
+                    for off in top_down:
+                        if active[off + i]:
+                            v = values[off + i]
+                            break
+                else:
+                    for off in layer_offsets:
+                        x = values[off + i]
+                        if x > v:
+                            v = x
+                for off in override_offsets:
+                    if active[off + i]:
+                        v = values[off + i]
+                if out[i] != v:
+                    out[i] = v
+                    delta.append({"ch": i - base + 1, "val": v})
+        return delta
+
+    def frame(self, universe: int) -> bytes:
+        """Immutable 512-byte output frame of ``universe`` (zeros if unknown).
+
+        The bytes object is cached until the universe's output changes, so repeated
+        reads at the same revision return the same object.
+        """
+        uni = int(universe)
+        row = self._rows.get(uni)
+        if row is None:
+            return _ZERO_FRAME
+        rev = self._urev[uni]
+        cached = self._frames.get(uni)
+        if cached is not None and cached[0] == rev:
+            return cached[1]
+        data = self._output[row].tobytes()
+        self._frames[uni] = (rev, data)
+        return data
+
+    def frames(self) -> Dict[int, bytes]:
+        """Immutable output frames of all registered universes."""
+        return {uni: self.frame(uni) for uni in self._rows}
+
+    def channel(self, universe: int, ch: int) -> int:
+        """Current output value of one channel (1-based); 0 for unknown universes/channels."""
+        row = self._rows.get(int(universe))
+        ch = int(ch)
+        if row is None or not 1 <= ch <= CHANNELS:
+            return 0
+        return self._output_mv[row * CHANNELS + ch - 1]
+
     def snapshot(self) -> Dict[int, Dict[int, int]]:
-        out: Dict[int, Dict[int, int]] = {}
-        for uni, frame in self._output.items():
-            out[uni] = {i + 1: int(v) for i, v in enumerate(frame) if True}
-        return out
+        """``{universe: {ch: val}}`` for all universes, built from the cached frames.
+
+        Prefer :meth:`frame` or :meth:`channel` when only part of the state is needed.
+        """
+        return {uni: dict(zip(_CHANNEL_KEYS, data)) for uni, data in self.frames().items()}
 
     @property
     def rev(self) -> int:
@@ -105,6 +483,41 @@ class DMXEngine:
     def ts(self) -> int:
         return self._ts
 
+    @property
+    def epoch(self) -> int:
+        """Identifies this process's revision sequence (boot time in ms)."""
+        return self._epoch
+
+    def universe_rev(self, universe: int) -> int:
+        """Global rev of the last output change in ``universe`` (0 if unknown)."""
+        return self._urev.get(int(universe), 0)
+
+    def ltp_mask(self, universe: int) -> np.ndarray:
+        """Copy of the universe's merge policy (True = LTP channel)."""
+        row = self._rows.get(int(universe))
+        if row is None:
+            return np.zeros(CHANNELS, dtype=bool)
+        return self._ltp[row].copy()
+
+    def layer_state(self, universe: int, layer: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only views of ``layer``'s values and hold flags in ``universe`` (zeros if unknown)."""
+        li = self._layer(layer)
+        row = self._rows.get(int(universe))
+        if row is None:
+            return np.zeros(CHANNELS, dtype=np.uint8), np.zeros(CHANNELS, dtype=bool)
+        values = self._values[li, row].view()
+        held = self._active[li, row].view()
+        values.flags.writeable = False
+        held.flags.writeable = False
+        return values, held
+
     # Diagnostics
+    def layer_frame(self, universe: int, layer: str) -> list[int]:
+        li = self._layer(layer)
+        row = self._rows.get(int(universe))
+        if row is None:
+            return [0] * CHANNELS
+        return self._values[li, row].tolist()
+
     def sacn_frame(self, universe: int) -> list[int]:
-        return list(self._frame_sacn(int(universe)))
+        return self.layer_frame(universe, LAYER_SACN)
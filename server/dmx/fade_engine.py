@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .easing import EASINGS
 
 
 def _clamp(v: int) -> int:
@@ -26,30 +32,117 @@ class FadeTask:
         if self.duration_ms <= 0:
             return tv
         t = (now_ms - self.start_ms) / self.duration_ms
-        if t <= 0:
-            f = 0.0
-        elif t >= 1:
-            f = 1.0
-        else:
-            if self.easing == "linear":
-                f = t
-            elif self.easing == "s_curve":
-                f = t * t * (3 - 2 * t)
-            elif self.easing == "expo":
-                f = 0 if t == 0 else 2 ** (10 * (t - 1))
-                if f > 1:
-                    f = 1.0
-            else:
-                f = t
+        f = EASINGS.ease(EASINGS.resolve(self.easing), t)
         return _clamp(round(sv + (tv - sv) * f))
 
 
+class FadeStore:
+    """Array-backed view of one universe's fades: one slot per (task, channel).
+
+    Slots follow task order, so when several tasks fade the same channel the most
+    recently added one wins, exactly as evaluating the tasks one by one would.
+    Rebuilt whenever the task list changes; evaluation is a single vectorized step.
+    """
+
+    def __init__(self, tasks: List[FadeTask]) -> None:
+        chans: List[int] = []
+        start: List[int] = []
+        target: List[int] = []
+        start_ms: List[int] = []
+        duration: List[int] = []
+        curves: List[int] = []
+        for ft in tasks:
+            curve = EASINGS.resolve(ft.easing)
+            for ch, tv in ft.targets.items():
+                chans.append(ch)
+                sv = ft.start_values.get(ch, 0)
+                start.append(sv)
+                target.append(tv)
+                start_ms.append(ft.start_ms)
+                duration.append(ft.duration_ms)
+                curves.append(curve)
+        self.channels = np.array(chans, dtype=np.int64)
+        self.start = np.array(start, dtype=np.float64)
+        self.span = np.array(target, dtype=np.float64) - self.start
+        self.start_ms = np.array(start_ms, dtype=np.float64)
+        self.duration = np.array(duration, dtype=np.float64)
+        self.instant = self.duration <= 0
+        self.curves = np.array(curves, dtype=np.int64)
+        # index of the winning (last) slot per channel when channels repeat
+        self.winners: np.ndarray | None = None
+        if len(set(chans)) != len(chans):
+            _, first_rev = np.unique(self.channels[::-1], return_index=True)
+            self.winners = len(chans) - 1 - first_rev
+
+    def __len__(self) -> int:
+        return int(self.channels.size)
+
+    def evaluate(self, now_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (channels, values) of all slots at ``now_ms``; matches ``FadeTask.value_at``."""
+        duration = np.where(self.instant, 1.0, self.duration)
+        t = (now_ms - self.start_ms) / duration
+        f = EASINGS.ease_many(self.curves, t)
+        # zero-length fades jump straight to the target
+        f = np.where(self.instant, 1.0, f)
+        values = np.clip(np.rint(self.start + self.span * f), 0, 255).astype(np.int64)
+        if self.winners is None:
+            return self.channels, values
+        return self.channels[self.winners], values[self.winners]
+
+
 @dataclass
 class FadeEngine:
     tick_hz: int = 44
     tasks: Dict[int, List[FadeTask]] = field(default_factory=dict)
     _running: bool = False
     _task: asyncio.Task | None = None
+    # universe -> array view of tasks[universe]; dropped whenever that list changes
+    _stores: Dict[int, FadeStore] = field(default_factory=dict)
+    # universe -> ch -> tasks fading that channel (oldest first), so LTP cancel is O(channels)
+    _owners: Dict[int, Dict[int, List[FadeTask]]] = field(default_factory=dict)
+    # universe -> number of fading (task, channel) slots, for the active gauge
+    _slots: Dict[int, int] = field(default_factory=dict)
+    # (end_ms, seq, task) min-heap; entries of cancelled tasks are skipped when popped
+    _deadlines: List[Tuple[int, int, FadeTask]] = field(default_factory=list)
+    _seq: Iterator[int] = field(default_factory=itertools.count)
+    # tasks whose queue delay has not been observed yet
+    _queued: List[FadeTask] = field(default_factory=list)
+    # set by add_fade; the run loop sleeps on it while there is nothing to fade
+    _wake: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @staticmethod
+    def now_ms() -> int:
+        """Fade timeline clock (monotonic ms); ``add_fade`` start times must use it."""
+        return int(time.monotonic() * 1000)
+
+    def _store(self, universe: int) -> FadeStore:
+        store = self._stores.get(universe)
+        if store is None:
+            store = FadeStore(self.tasks.get(universe, []))
+            self._stores[universe] = store
+        return store
+
+    def _set_gauges(self, universe: int, metrics: Any | None) -> None:
+        if metrics is None or not hasattr(metrics, "set_fade_active"):
+            return
+        try:
+            metrics.set_fade_active(universe, self._slots.get(universe, 0))
+            if hasattr(metrics, "set_fade_jobs_active"):
+                metrics.set_fade_jobs_active(universe, len(self.tasks.get(universe, ())))
+        except Exception:
+            pass
+
+    def _drop_tasks(self, universe: int, dropped: List[FadeTask]) -> None:
+        """Remove ``dropped`` from the universe's task list, releasing the bucket when empty."""
+        gone = set(map(id, dropped))
+        remain = [ft for ft in self.tasks.get(universe, []) if id(ft) not in gone]
+        self._stores.pop(universe, None)
+        if remain:
+            self.tasks[universe] = remain
+        else:
+            self.tasks.pop(universe, None)
+            self._owners.pop(universe, None)
+            self._slots.pop(universe, None)
 
     def add_fade(self, *, universe: int, patch: List[dict], duration_ms: int, now_ms: int, get_current: callable, easing: str = "linear", metrics: Any | None = None) -> None:
         # Build start values from current frame
@@ -58,11 +151,20 @@ class FadeEngine:
         for it in patch:
             ch = int(it["ch"]) ; val = int(it["val"]) ; targets[ch] = val
             start_values[ch] = int(get_current(universe, ch))
+        if not targets:
+            return
         task = FadeTask(universe=universe, targets=targets, start_values=start_values, start_ms=now_ms, duration_ms=duration_ms, easing=easing)
         now_mono = time.monotonic()
         task.queued_at = {ch: now_mono for ch in targets.keys()}
-        lst = self.tasks.setdefault(universe, [])
-        lst.append(task)
+        self._queued.append(task)
+        self.tasks.setdefault(universe, []).append(task)
+        owners = self._owners.setdefault(universe, {})
+        for ch in targets:
+            owners.setdefault(ch, []).append(task)
+        self._slots[universe] = self._slots.get(universe, 0) + len(targets)
+        heapq.heappush(self._deadlines, (now_ms + duration_ms, next(self._seq), task))
+        self._stores.pop(universe, None)
+        self._wake.set()
         # metrics: started + active
         if metrics is not None and hasattr(metrics, "set_fade_active"):
             try:
@@ -70,108 +172,111 @@ class FadeEngine:
                     metrics.inc_fades_started(universe, len(targets))
             except Exception:
                 pass
-            try:
-                ch_count = sum(len(ft.targets) for ft in lst)
-                metrics.set_fade_active(universe, ch_count)
-                if hasattr(metrics, "set_fade_jobs_active"):
-                    metrics.set_fade_jobs_active(universe, len(lst))
-            except Exception:
-                pass
+            self._set_gauges(universe, metrics)
 
     def cancel_channels(self, universe: int, channels: List[int], *, metrics: Any | None = None, reason: str = "ltp") -> None:
         """Remove channels from active fades (LTP)."""
         uni = int(universe)
-        lst = self.tasks.get(uni, [])
-        if not lst:
+        owners = self._owners.get(uni)
+        if not owners:
             return
-        chans = set(int(c) for c in channels)
-        remain: List[FadeTask] = []
         cancelled = 0
-        for ft in lst:
-            before = set(ft.targets.keys())
-            ft.targets = {ch: v for ch, v in ft.targets.items() if ch not in chans}
-            ft.start_values = {ch: v for ch, v in ft.start_values.items() if ch not in chans}
-            for ch in list(ft.queued_at.keys()):
-                if ch in chans:
-                    ft.queued_at.pop(ch, None)
-            removed = len(before & chans)
-            cancelled += removed
-            if ft.targets:
-                remain.append(ft)
-        self.tasks[uni] = remain
+        emptied: List[FadeTask] = []
+        for ch in set(int(c) for c in channels):
+            holders = owners.pop(ch, None)
+            if not holders:
+                continue
+            for ft in holders:
+                ft.targets.pop(ch, None)
+                ft.start_values.pop(ch, None)
+                ft.queued_at.pop(ch, None)
+                cancelled += 1
+                if not ft.targets:
+                    emptied.append(ft)
+        if cancelled:
+            self._slots[uni] -= cancelled
+            self._stores.pop(uni, None)
+        if emptied:
+            self._drop_tasks(uni, emptied)
         if metrics is not None:
-            try:
-                ch_count = sum(len(ft.targets) for ft in remain)
-                metrics.set_fade_active(uni, ch_count)
-                if hasattr(metrics, "set_fade_jobs_active"):
-                    metrics.set_fade_jobs_active(uni, len(remain))
-            except Exception:
-                pass
+            self._set_gauges(uni, metrics)
             try:
                 if hasattr(metrics, "inc_fades_cancelled"):
                     metrics.inc_fades_cancelled(uni, reason, max(0, int(cancelled)))
             except Exception:
                 pass
 
+    def _pop_finished(self, now_ms: int) -> Dict[int, List[FadeTask]]:
+        """Pop every task whose fade has ended by ``now_ms``, grouped by universe."""
+        finished: Dict[int, List[FadeTask]] = {}
+        heap = self._deadlines
+        while heap and heap[0][0] <= now_ms:
+            _, _, ft = heapq.heappop(heap)
+            if ft.targets:  # fully cancelled tasks are already gone
+                finished.setdefault(ft.universe, []).append(ft)
+        return finished
+
+    def _finish(self, universe: int, done: List[FadeTask]) -> int:
+        """Retire finished tasks; returns the number of channels they completed."""
+        owners = self._owners.get(universe, {})
+        completed = 0
+        for ft in done:
+            completed += len(ft.targets)
+            for ch in ft.targets:
+                holders = owners.get(ch)
+                if holders is not None:
+                    holders.remove(ft)
+                    if not holders:
+                        del owners[ch]
+        self._slots[universe] = self._slots.get(universe, 0) - completed
+        self._drop_tasks(universe, done)
+        return completed
+
+    def _observe_queued(self, metrics: Any | None) -> None:
+        queued, self._queued = self._queued, []
+        now = time.monotonic()
+        for ft in queued:
+            if hasattr(metrics, "observe_queue_delay"):
+                for at in ft.queued_at.values():
+                    try:
+                        metrics.observe_queue_delay(ft.universe, int((now - at) * 1000))
+                    except Exception:
+                        pass
+            ft.queued_at.clear()
+
     async def run(self, *, apply_patch: callable, broadcast: callable, ola_apply: callable | None = None, metrics=None) -> None:
         if self._running:
             return
         self._running = True
         interval = 1.0 / max(1, int(self.tick_hz))
+        next_at: float | None = None
         try:
             while True:
+                if not self.tasks:
+                    # idle: no wakeups until add_fade brings new work
+                    self._wake.clear()
+                    await self._wake.wait()
+                    next_at = None
                 loop_start = time.monotonic()
-                now_ms = int(time.time() * 1000)
-                # Gather deltas per universe
-                for uni, lst in list(self.tasks.items()):
-                    if not lst:
-                        # drop empty buckets so gauges can reset
-                        self.tasks.pop(uni, None)
-                        if metrics is not None and hasattr(metrics, "set_fade_active"):
-                            try:
-                                metrics.set_fade_active(uni, 0)
-                                if hasattr(metrics, "set_fade_jobs_active"):
-                                    metrics.set_fade_jobs_active(uni, 0)
-                            except Exception:
-                                pass
-                        continue
+                if next_at is None:
+                    # first tick of a burst runs immediately and starts the deadline grid
+                    next_at = loop_start
+                if metrics is not None and hasattr(metrics, "observe_fade_tick_jitter"):
+                    metrics.observe_fade_tick_jitter(int((loop_start - next_at) * 1000))
+                now_ms = int(loop_start * 1000)
+                if self._queued:
+                    self._observe_queued(metrics)
+                finished = self._pop_finished(now_ms)
+                for uni in list(self.tasks):
                     u_start = time.monotonic()
-                    deltas: Dict[int, int] = {}
-                    remaining: List[FadeTask] = []
-                    done_completed_channels = 0
-                    for ft in lst:
-                        done = now_ms >= ft.start_ms + ft.duration_ms
-                        channels = list(ft.targets.keys())
-                        for ch in channels:
-                            if ch in ft.queued_at and hasattr(metrics, "observe_queue_delay"):
-                                try:
-                                    delay_ms = int((time.monotonic() - ft.queued_at[ch]) * 1000)
-                                    metrics.observe_queue_delay(uni, delay_ms)
-                                except Exception:
-                                    pass
-                                finally:
-                                    ft.queued_at.pop(ch, None)
-                            v = ft.value_at(ch, now_ms)
-                            deltas[ch] = v
-                        if not done:
-                            remaining.append(ft)
-                        else:
-                            done_completed_channels += len(channels)
-                    if remaining:
-                        self.tasks[uni] = remaining
-                    else:
-                        self.tasks.pop(uni, None)
+                    # one vectorized evaluation for every fading channel of the universe
+                    chans, values = self._store(uni).evaluate(now_ms)
+                    done = finished.get(uni)
+                    done_completed_channels = self._finish(uni, done) if done else 0
                     # metrics: active count
-                    if metrics is not None and hasattr(metrics, "set_fade_active"):
-                        try:
-                            ch_count = sum(len(ft.targets) for ft in remaining)
-                            metrics.set_fade_active(uni, ch_count)
-                            if hasattr(metrics, "set_fade_jobs_active"):
-                                metrics.set_fade_jobs_active(uni, len(remaining))
-                        except Exception:
-                            pass
-                    if deltas:
-                        delta_list = [{"ch": ch, "val": val} for ch, val in deltas.items()]
+                    self._set_gauges(uni, metrics)
+                    if chans.size:
+                        delta_list = [{"ch": ch, "val": val} for ch, val in zip(chans.tolist(), values.tolist())]
                         delta, rev, ts = apply_patch(uni, delta_list)
                         if delta:
                             await broadcast({
@@ -200,13 +305,24 @@ class FadeEngine:
                             metrics.inc_fades_cancelled(uni, "done", int(done_completed_channels))
                         except Exception:
                             pass
-                dur = time.monotonic() - loop_start
                 if callable(metrics):
                     try:
                         metrics()
                     except Exception:
                         pass
-                await asyncio.sleep(max(0.0, interval - dur))
+                next_at += interval
+                behind = time.monotonic() - next_at
+                if behind > interval:
+                    # overran whole ticks: skip them rather than bursting to catch up
+                    missed = int(behind // interval)
+                    next_at += missed * interval
+                    if metrics is not None and hasattr(metrics, "inc_fade_ticks_missed"):
+                        try:
+                            metrics.inc_fade_ticks_missed(missed)
+                        except Exception:
+                            pass
+                # always yields, so producers get a turn even when the next tick is already due
+                await asyncio.sleep(max(0.0, next_at - time.monotonic()))
         except asyncio.CancelledError:
             self._running = False
             raise
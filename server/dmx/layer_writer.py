@@ -0,0 +1,42 @@
+"""Publish generator output (cues, effects) into a DMX engine layer."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("dmx.layer_writer")
+
+# apply_frame(universe, values uint8[512], mask bool[512]) -> (delta, rev, ts)
+ApplyFrame = Callable[[int, np.ndarray, np.ndarray], Tuple[List[dict], int, int]]
+Broadcast = Callable[[Dict[str, Any]], Awaitable[None]]
+OlaApply = Callable[[int, List[dict]], Awaitable[None]]
+
+
+async def publish_frames(
+    frames: Mapping[int, Tuple[np.ndarray, np.ndarray]],
+    *,
+    apply_frame: ApplyFrame,
+    broadcast: Broadcast,
+    ola_apply: OlaApply | None = None,
+) -> None:
+    """Apply each universe frame, then broadcast and forward the resulting output delta."""
+    for uni, (frame, mask) in frames.items():
+        try:
+            delta, rev, ts = apply_frame(uni, frame, mask)
+        except Exception:
+            logger.exception("layer_apply_failed universe=%s", uni)
+            continue
+        if not delta:
+            continue
+        await broadcast({"type": "state.update", "rev": rev, "ts": ts, "universe": uni, "delta": delta, "full": False})
+        if ola_apply is not None:
+            try:
+                await ola_apply(uni, delta)
+            except Exception:
+                pass
+
+
+__all__ = ["ApplyFrame", "Broadcast", "OlaApply", "publish_frames"]
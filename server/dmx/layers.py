@@ -0,0 +1,67 @@
+"""Playback layer stack for the DMX compositor.
+
+Layers are ordered by priority (lowest first). Per channel, the output is:
+ - HTP channels: the highest value of all layers
+ - LTP channels: the value of the highest-priority layer holding the channel
+ - override layers (parked): replace whatever the stack produced where they hold a value
+
+Channels are HTP unless the fixture patch marks them LTP, which keeps unpatched
+universes behaving like the original ``max(local, sacn)`` merge.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+LAYER_PLAYBACK = "playback"
+LAYER_SUBMASTERS = "submasters"
+LAYER_SACN = "sacn"
+LAYER_EFFECTS = "effects"
+LAYER_LOCAL = "local"  # programmer: direct commands and fades
+LAYER_PARKED = "parked"
+
+# sACN sources default to priority 100; LOCAL_PRIORITY is configured relative to it.
+SACN_PRIORITY = 100
+
+
+@dataclass(frozen=True)
+class LayerSpec:
+    name: str
+    priority: int
+    override: bool = False
+
+
+def default_layers(local_priority: int = 255) -> List[LayerSpec]:
+    return [
+        LayerSpec(LAYER_PLAYBACK, 50),
+        LayerSpec(LAYER_SUBMASTERS, 60),
+        LayerSpec(LAYER_SACN, SACN_PRIORITY),
+        LayerSpec(LAYER_EFFECTS, 150),
+        LayerSpec(LAYER_LOCAL, int(local_priority)),
+        LayerSpec(LAYER_PARKED, 1_000_000, override=True),
+    ]
+
+
+def ordered(layers: Sequence[LayerSpec]) -> List[LayerSpec]:
+    """Validate layer names and return the stack sorted by priority (stable)."""
+    names = [spec.name for spec in layers]
+    if not names:
+        raise ValueError("layer stack is empty")
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate layer names: {names}")
+    return sorted(layers, key=lambda spec: spec.priority)
+
+
+__all__ = [
+    "LAYER_PLAYBACK",
+    "LAYER_SUBMASTERS",
+    "LAYER_SACN",
+    "LAYER_EFFECTS",
+    "LAYER_LOCAL",
+    "LAYER_PARKED",
+    "SACN_PRIORITY",
+    "LayerSpec",
+    "default_layers",
+    "ordered",
+]
@@ -0,0 +1,91 @@
+"""Frame clock that paces DMX output for all universes.
+
+Producers (commands, fades, RGB state) only mark a universe dirty; the clock sends
+every dirty universe exactly once per frame to each registered sink. Frames are
+scheduled on absolute deadlines (``start + n * interval``) so send time does not
+accumulate as drift, and a change arriving mid-frame is always carried by the
+next frame: the last value of a burst reaches the fixtures without waiting for
+another change.
+
+While nothing is dirty the clock sleeps on an event instead of ticking; the first
+change after an idle period is sent immediately when at least one interval has
+passed since the previous frame.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Set
+
+logger = logging.getLogger("dmx.output_clock")
+
+# sink(universe) sends the universe's current frame to one output
+OutputSink = Callable[[int], Awaitable[object]]
+
+
+class OutputClock:
+    def __init__(
+        self,
+        *,
+        fps: int = 44,
+        metrics=None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = 1.0 / max(1, int(fps))
+        self._metrics = metrics
+        self._clock = clock
+        self._sinks: List[OutputSink] = []
+        self._dirty: Set[int] = set()
+        self._wake = asyncio.Event()
+        self._next_at: float | None = None
+
+    def add_sink(self, sink: OutputSink) -> None:
+        self._sinks.append(sink)
+
+    def mark_dirty(self, universe: int) -> None:
+        self._dirty.add(int(universe))
+        self._wake.set()
+
+    def pending(self) -> Set[int]:
+        return set(self._dirty)
+
+    async def tick(self) -> int:
+        """Send all dirty universes to every sink now. Returns the number of universes sent."""
+        dirty, self._dirty = self._dirty, set()
+        if not dirty or not self._sinks:
+            return 0
+        sends = [sink(uni) for uni in sorted(dirty) for sink in self._sinks]
+        for res in await asyncio.gather(*sends, return_exceptions=True):
+            if isinstance(res, Exception):
+                logger.warning("output_send_failed", exc_info=res)
+        if self._metrics is not None:
+            self._metrics.inc_output_frames(len(dirty))
+        return len(dirty)
+
+    async def run(self) -> None:
+        interval = self.interval
+        while True:
+            if not self._dirty:
+                self._wake.clear()
+                await self._wake.wait()
+            now = self._clock()
+            if self._next_at is None or now > self._next_at:
+                # coming back from idle: the frame slot is free, restart the grid now
+                self._next_at = now
+            delay = self._next_at - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.tick()
+            self._next_at += interval
+            behind = self._clock() - self._next_at
+            if behind > interval:
+                # a slow send overran whole frames: skip them instead of bursting to catch up
+                missed = int(behind // interval)
+                self._next_at += missed * interval
+                if self._metrics is not None:
+                    self._metrics.inc_output_frames_late(missed)
+
+
+__all__ = ["OutputClock", "OutputSink"]
@@ -0,0 +1,93 @@
+"""Compile stored scenes into per-universe frames.
+
+Scenes keep the frontend's ``channelValues`` keyed by channel id. The show's
+``fixtures``/``universes`` lists resolve those ids to DMX addresses the same way
+the UI does when recalling a scene (``dmxAddress + channel.number - 1`` in the
+fixture's universe). Purely numeric keys are taken as universe 0 channels.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from .engine import CHANNELS
+
+# channel id -> (universe number, absolute channel 1..512)
+ChannelMap = Dict[str, Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class SceneFrame:
+    """One universe of a compiled scene: 512 values plus the channels the scene sets."""
+
+    values: np.ndarray  # uint8, 0 where not set
+    mask: np.ndarray  # bool
+
+
+def fixture_addresses(show: Mapping[str, Any] | None) -> Dict[str, Tuple[int, List[Tuple[str | None, int]]]]:
+    """fixture id -> (universe number, [(channel id, absolute channel)] in fixture channel order)."""
+    show = show or {}
+    numbers: Dict[str, int] = {}
+    for uni in show.get("universes") or []:
+        if isinstance(uni, dict) and "id" in uni:
+            try:
+                numbers[str(uni["id"])] = int(uni.get("number", 0))
+            except (TypeError, ValueError):
+                continue
+    out: Dict[str, Tuple[int, List[Tuple[str | None, int]]]] = {}
+    for fx in show.get("fixtures") or []:
+        if not isinstance(fx, dict) or "id" not in fx:
+            continue
+        base = fx.get("dmxAddress")
+        base = base if isinstance(base, int) else 1
+        chans: List[Tuple[str | None, int]] = []
+        for ch in fx.get("channels") or []:
+            if not isinstance(ch, dict):
+                continue
+            number = ch.get("number")
+            offset = number - 1 if isinstance(number, int) else 0
+            ch_id = str(ch["id"]) if "id" in ch else None
+            chans.append((ch_id, max(1, min(CHANNELS, base + offset))))
+        out[str(fx["id"])] = (numbers.get(str(fx.get("universeId")), 0), chans)
+    return out
+
+
+def channel_map(show: Mapping[str, Any] | None) -> ChannelMap:
+    out: ChannelMap = {}
+    for uni, chans in fixture_addresses(show).values():
+        for ch_id, ch in chans:
+            if ch_id is not None:
+                out[ch_id] = (uni, ch)
+    return out
+
+
+def compile_scene(channel_values: Mapping[str, Any], chmap: ChannelMap) -> Dict[int, SceneFrame]:
+    """Resolve a scene's ``channelValues`` to dense per-universe frames; unknown ids are skipped."""
+    values: Dict[int, np.ndarray] = {}
+    masks: Dict[int, np.ndarray] = {}
+    for key, raw in channel_values.items():
+        addr = chmap.get(str(key))
+        if addr is None:
+            try:
+                addr = (0, int(key))
+            except (TypeError, ValueError):
+                continue
+        uni, ch = addr
+        if not 1 <= ch <= CHANNELS:
+            continue
+        try:
+            val = max(0, min(255, int(raw)))
+        except (TypeError, ValueError):
+            continue
+        if uni not in values:
+            values[uni] = np.zeros(CHANNELS, dtype=np.uint8)
+            masks[uni] = np.zeros(CHANNELS, dtype=bool)
+        values[uni][ch - 1] = val
+        masks[uni][ch - 1] = True
+    return {uni: SceneFrame(values[uni], masks[uni]) for uni in values}
+
+
+__all__ = ["ChannelMap", "SceneFrame", "channel_map", "compile_scene", "fixture_addresses"]
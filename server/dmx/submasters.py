@@ -0,0 +1,176 @@
+"""Fader-controlled submasters: scenes blended by a 0..1 level into their own layer.
+
+Each submaster in the show's ``submasters`` list points at a stored scene. Loading
+stacks the compiled scenes per universe into ``(n, 512)`` value and mask arrays, so
+moving a fader is a single scalar write into the level vector and every frame is
+one vectorized merge across all submasters:
+
+* HTP channels take the highest ``value * level`` of the submasters holding them.
+* LTP channels take the unscaled value of the most recently moved submaster that
+  holds them and is above zero.
+
+Channels are released once every submaster holding them is back at zero. The
+blend is written to the DMX engine's submasters layer, between cue playbacks and
+sACN, and frames are only produced when a level changes (at most ``tick_hz``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple
+
+import numpy as np
+
+from .engine import CHANNELS
+from .layer_writer import ApplyFrame, Broadcast, OlaApply, publish_frames
+from .scenes import ChannelMap, SceneFrame, compile_scene
+
+# universe -> bool[512] (True = LTP channel)
+LtpLookup = Callable[[int], np.ndarray]
+
+
+@dataclass
+class Submaster:
+    id: str
+    name: str
+    scene_id: str
+    level: float = 0.0
+
+
+def _level(value: Any, default: float = 0.0) -> float:
+    try:
+        return max(0.0, min(1.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def compile_submasters(
+    specs: Iterable[Any], scenes: Iterable[Mapping[str, Any]], chmap: ChannelMap
+) -> Tuple[List[Submaster], Dict[int, Tuple[np.ndarray, np.ndarray]]]:
+    """Build submasters and their per-universe ``(values (n, 512), masks (n, 512))`` stacks."""
+    by_id = {str(s.get("id")): s for s in scenes if isinstance(s, Mapping)}
+    subs: List[Submaster] = []
+    frames: List[Dict[int, SceneFrame]] = []
+    for spec in specs:
+        if not isinstance(spec, Mapping) or not spec.get("id"):
+            continue
+        scene_id = str(spec.get("sceneId") or "")
+        scene = by_id.get(scene_id)
+        values = scene.get("channelValues") if scene is not None else None
+        frames.append(compile_scene(values if isinstance(values, Mapping) else {}, chmap))
+        subs.append(Submaster(
+            id=str(spec["id"]),
+            name=str(spec.get("name") or spec["id"]),
+            scene_id=scene_id,
+            level=_level(spec.get("level")),
+        ))
+    stacks: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    for uni in sorted({uni for compiled in frames for uni in compiled}):
+        values = np.zeros((len(subs), CHANNELS), dtype=np.float32)
+        masks = np.zeros((len(subs), CHANNELS), dtype=bool)
+        for i, compiled in enumerate(frames):
+            frame = compiled.get(uni)
+            if frame is not None:
+                values[i] = frame.values
+                masks[i] = frame.mask
+        stacks[uni] = (values, masks)
+    return subs, stacks
+
+
+def _all_htp(universe: int) -> np.ndarray:
+    return np.zeros(CHANNELS, dtype=bool)
+
+
+class SubmasterEngine:
+    """Submaster levels and their blend; ``run`` publishes a frame after each level change."""
+
+    def __init__(self, *, tick_hz: int = 44) -> None:
+        self.tick_hz = tick_hz
+        self.submasters: List[Submaster] = []
+        self._index: Dict[str, int] = {}
+        self._stacks: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.levels = np.zeros(0, dtype=np.float32)
+        # move order of each submaster (higher = moved later), for LTP
+        self._seq = np.zeros(0, dtype=np.int64)
+        self._moves = 0
+        self._held: Set[int] = set()
+        self._dirty = False
+        self._wake = asyncio.Event()
+
+    def load(self, submasters: Iterable[Submaster], stacks: Mapping[int, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Replace the submasters; faders that survive the reload keep their level."""
+        previous = {sub.id: sub.level for sub in self.submasters}
+        self.submasters = list(submasters)
+        self._index = {sub.id: i for i, sub in enumerate(self.submasters)}
+        self._stacks = dict(stacks)
+        for sub in self.submasters:
+            sub.level = previous.get(sub.id, sub.level)
+        self.levels = np.array([sub.level for sub in self.submasters], dtype=np.float32)
+        self._seq = np.arange(len(self.submasters), dtype=np.int64)
+        self._moves = len(self.submasters)
+        self._touch()
+
+    def _touch(self) -> None:
+        self._dirty = True
+        self._wake.set()
+
+    def set_level(self, submaster_id: str, level: float) -> bool:
+        index = self._index.get(submaster_id)
+        if index is None:
+            return False
+        level = _level(level)
+        self.submasters[index].level = level
+        self.levels[index] = level
+        self._seq[index] = self._moves
+        self._moves += 1
+        self._touch()
+        return True
+
+    def state(self) -> List[Dict[str, Any]]:
+        return [{"id": sub.id, "name": sub.name, "sceneId": sub.scene_id, "level": sub.level} for sub in self.submasters]
+
+    def compose(self, ltp_for: LtpLookup = _all_htp) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Blend all submasters into uint8 frames; universes no longer held get an empty mask."""
+        live = self.levels > 0
+        out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        held: Set[int] = set()
+        for uni, (values, masks) in self._stacks.items():
+            holders = masks & live[:, None]
+            mask = holders.any(axis=0)
+            if not mask.any():
+                continue
+            htp = (values * self.levels[:, None]).max(axis=0)
+            order = np.where(holders, self._seq[:, None], -1)
+            ltp = values[order.argmax(axis=0), np.arange(CHANNELS)]
+            blend = np.where(ltp_for(uni), ltp, htp)
+            frame = np.where(mask, np.clip(np.rint(blend), 0, 255), 0).astype(np.uint8)
+            out[uni] = (frame, mask)
+            held.add(uni)
+        for uni in self._held - held:
+            out[uni] = (np.zeros(CHANNELS, dtype=np.uint8), np.zeros(CHANNELS, dtype=bool))
+        self._held = held
+        return out
+
+    async def run(
+        self,
+        *,
+        apply_frame: ApplyFrame,
+        broadcast: Broadcast,
+        ola_apply: OlaApply | None = None,
+        ltp_for: LtpLookup = _all_htp,
+    ) -> None:
+        interval = 1.0 / max(1, int(self.tick_hz))
+        while True:
+            if not self._dirty:
+                self._wake.clear()
+                await self._wake.wait()
+            self._dirty = False
+            # fader moves arriving within one tick are folded into the next frame
+            next_at = time.monotonic() + interval
+            await publish_frames(self.compose(ltp_for), apply_frame=apply_frame, broadcast=broadcast, ola_apply=ola_apply)
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+
+
+__all__ = ["LtpLookup", "Submaster", "SubmasterEngine", "compile_submasters"]
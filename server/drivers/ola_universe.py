@@ -1,4 +1,9 @@
-"""OLA output with per-universe frame store, 44fps guard, and debounce."""
+"""OLA output with per-universe frame store, 44fps guard, and debounce.
+
+When an :class:`~server.dmx.output_clock.OutputClock` is attached to the manager,
+``maybe_send`` only marks the universe dirty and the clock calls
+``send_universe`` once per frame; the per-universe rate guard is then bypassed.
+"""
 
 from __future__ import annotations
 
@@ -130,6 +135,27 @@ class UniverseFrame:
             frame = self._frame.copy()
             self._last_sent = frame
         # Send outside lock
+        await self._post(frame)
+
+    async def send_frame(self) -> bool:
+        """Send the current frame without the rate guard (paced by the output clock).
+
+        Identical frames are still skipped. Returns True if a frame was posted.
+        """
+        async with self._lock:
+            if self._last_sent is not None and self._frame == self._last_sent:
+                inc_ident = getattr(self._metrics, "ola_inc_skipped_identical", None)
+                if callable(inc_ident):
+                    inc_ident(self.ola_universe)  # type: ignore[misc]
+                else:
+                    self._metrics.inc_skip_identical(self.ola_universe)
+                return False
+            frame = self._frame.copy()
+            self._last_sent = frame
+        await self._post(frame)
+        return True
+
+    async def _post(self, frame: list[int]) -> None:
         url = self.base_url if self.base_url.endswith("/set_dmx") else f"{self.base_url}/set_dmx"
         data = {
             "u": str(self.ola_universe),
@@ -222,6 +248,7 @@ class OLAUniverseManager:
         self.http_post = http_post or requests.post
         self.metrics = metrics or OLAMetrics({}, {}, {}, {})
         self._universes: Dict[int, UniverseFrame] = {}
+        self._clock: Any = None
         # Shared HTTP client
         self._client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=4, max_connections=8))
 
@@ -245,10 +272,21 @@ class OLAUniverseManager:
         uf = self._resolve(universe)
         return uf.apply_patch(items)
 
+    def attach_clock(self, clock: Any) -> None:
+        """Route sends through an output clock; it calls :meth:`send_universe` per frame."""
+        self._clock = clock
+        clock.add_sink(self.send_universe)
+
     async def maybe_send(self, universe: int) -> None:
+        if self._clock is not None:
+            self._clock.mark_dirty(universe)
+            return
         uf = self._resolve(universe)
         await uf.maybe_send()
 
+    async def send_universe(self, universe: int) -> bool:
+        return await self._resolve(universe).send_frame()
+
     def on_rgb_state(self, r: int, g: int, b: int) -> None:
         uf = self._resolve(0)
         uf.apply_patch([{"ch": 1, "val": r}, {"ch": 2, "val": g}, {"ch": 3, "val": b}])
@@ -259,7 +297,7 @@ class OLAUniverseManager:
     async def flush_all(self) -> None:
         for uni in list(self._universes.keys()):
             with anyio.move_on_after(0.2):
-                await self._universes[uni].maybe_send()
+                await self._universes[uni].send_frame()
 
     async def aclose(self) -> None:
         try:
@@ -5,8 +5,10 @@ from __future__ import annotations
 import asyncio
 import time
 from dataclasses import dataclass, field
-from typing import Awaitable, Callable, Deque, Dict
+from typing import Awaitable, Callable, Dict, List, Mapping, Tuple
 
+from .fanout import StateFanout
+from .lanes import DEFAULT_SOURCES, LaneQueue, LaneSpec, default_lanes
 from .models import RGBCommand, STATE_SCHEMA
 
 PublishStateCallback = Callable[[dict[str, int | str]], Awaitable[None]]
@@ -21,6 +23,9 @@ class EngineMetrics:
     processed: int = 0
     deduped: int = 0
     dropped: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    last_batch_size: int = 0
     last_latency_ms: int = 0
 
 
@@ -34,7 +39,16 @@ class Engine:
     dedupe_accept: Callable[[str | None], Awaitable[bool]] | None = None
     ola_cb: Callable[[dict[str, int | str]], Awaitable[None]] | None = None
     queue_limit: int = 10_000
+    # priority lanes (default: split of queue_limit) and src -> lane classification
+    lanes: List[LaneSpec] | None = None
+    lane_sources: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_SOURCES))
     metrics: EngineMetrics = field(default_factory=EngineMetrics)
+    # drain mode: apply only the last of the commands queued at wake-up
+    coalesce: bool = False
+    batch_max: int = 256
+    batch_max_ms: float = 5.0
+    # when set, snapshots go to per-sink workers instead of awaiting each callback
+    fanout: StateFanout | None = None
 
     def __post_init__(self) -> None:
         initial_ts = int(time.time() * 1000)
@@ -47,42 +61,35 @@ class Engine:
             "updatedBy": "init",
             "ts": initial_ts,
         }
-        self._queue: asyncio.Queue[RGBCommand] = asyncio.Queue(maxsize=self.queue_limit)
-        self._queue_lock = asyncio.Lock()
+        self._queue: LaneQueue[RGBCommand] = LaneQueue(
+            self.lanes or default_lanes(self.queue_limit),
+            sources=self.lane_sources,
+        )
         self._running = False
         self._state_lock = asyncio.Lock()
+        # enqueue sequence of the newest command applied; lanes dequeue out of
+        # submission order, so anything older has already been overwritten
+        self._applied_seq = 0
 
     async def submit(self, cmd: RGBCommand) -> bool:
-        """Submit a command for processing, respecting backpressure."""
+        """Submit a command into its source's lane, respecting that lane's backpressure."""
 
         try:
-            self._queue.put_nowait(cmd)
-            return True
+            if self._queue.put_nowait(cmd, cmd.src) is not None:
+                self.metrics.dropped += 1
         except asyncio.QueueFull:
-            async with self._queue_lock:
-                dropped = self._drop_ui_command()
-                if dropped:
-                    self.metrics.dropped += 1
-                    self._queue.put_nowait(cmd)
-                    return True
-            await self._queue.put(cmd)
-            return True
-
-    def _drop_ui_command(self) -> bool:
-        queue = self._queue
-        try:
-            internal_queue: Deque[RGBCommand] = queue._queue  # type: ignore[attr-defined]
-        except AttributeError:  # pragma: no cover - CPython specific safeguard
-            return False
-        for idx, item in enumerate(internal_queue):
-            if item.src == "ui":
-                del internal_queue[idx]
-                return True
-        return False
+            await self._queue.put(cmd, cmd.src)
+        return True
 
     def queue_depth(self) -> int:
         return self._queue.qsize()
 
+    def lane_depths(self) -> Dict[str, int]:
+        return self._queue.depths()
+
+    def lane_dropped(self) -> Dict[str, int]:
+        return self._queue.dropped()
+
     def queue_empty(self) -> bool:
         return self._queue.empty()
 
@@ -98,15 +105,24 @@ class Engine:
         if self._running:
             return
         self._running = True
+        if self.fanout is not None:
+            self.fanout.start()
         try:
             while True:
-                cmd = await self._queue.get()
+                if self.coalesce:
+                    await self._run_batch()
+                    continue
+                seq, cmd = await self._queue.get_entry()
                 start = time.perf_counter()
                 if self.dedupe_accept is not None:
                     accepted = await self.dedupe_accept(cmd.cmdId)
                     if not accepted:
                         self.metrics.deduped += 1
                         continue
+                if seq < self._applied_seq:
+                    self.metrics.coalesced += 1
+                    continue
+                self._applied_seq = seq
                 updated = await self._apply(cmd)
                 if not updated:
                     continue
@@ -115,8 +131,53 @@ class Engine:
                 self.metrics.last_latency_ms = latency_ms
         except asyncio.CancelledError:
             self._running = False
+            if self.fanout is not None:
+                await self.fanout.aclose()
             raise
 
+    async def _run_batch(self) -> None:
+        """Drain the queue and apply only the newest accepted command (last write wins).
+
+        Lanes are dequeued by priority, not submission order, so "newest" is the
+        command with the highest enqueue sequence, not the last one drained.
+        Draining stops after ``batch_max`` commands or ``batch_max_ms`` so a steady
+        stream of commands cannot delay the state transition indefinitely.
+        """
+
+        batch: List[Tuple[int, RGBCommand]] = [await self._queue.get_entry()]
+        start = time.perf_counter()
+        deadline = start + self.batch_max_ms / 1000
+        while len(batch) < self.batch_max and time.perf_counter() < deadline:
+            try:
+                batch.append(self._queue.get_entry_nowait())
+            except asyncio.QueueEmpty:
+                break
+        latest: RGBCommand | None = None
+        latest_seq = -1
+        accepted = 0
+        for seq, cmd in batch:
+            # every id still goes through dedupe so later retries are recognised
+            if self.dedupe_accept is not None and not await self.dedupe_accept(cmd.cmdId):
+                self.metrics.deduped += 1
+                continue
+            if seq > latest_seq:
+                latest, latest_seq = cmd, seq
+            accepted += 1
+        self.metrics.batches += 1
+        self.metrics.last_batch_size = len(batch)
+        if latest is None:
+            return
+        self.metrics.coalesced += accepted - 1
+        if latest_seq < self._applied_seq:
+            # a newer command was applied by an earlier batch
+            self.metrics.coalesced += 1
+            return
+        self._applied_seq = latest_seq
+        if not await self._apply(latest):
+            return
+        self.metrics.processed += 1
+        self.metrics.last_latency_ms = int((time.perf_counter() - start) * 1000)
+
     async def _apply(self, cmd: RGBCommand) -> bool:
         r = max(0, min(255, int(cmd.r)))
         g = max(0, min(255, int(cmd.g)))
@@ -139,11 +200,7 @@ class Engine:
                 }
             )
             snapshot = dict(self.state)
-        await self.persist_state_cb(snapshot)
-        await self.publish_state_cb(snapshot)
-        await self.broadcast_state_cb(snapshot)
-        if self.ola_cb is not None:
-            await self.ola_cb(snapshot)
+        await self._emit(snapshot)
         return True
 
     async def replace_state(self, state: dict[str, int | str], src: str = "project-switch") -> dict[str, int | str]:
@@ -161,12 +218,18 @@ class Engine:
         async with self._state_lock:
             self.state.update(sanitized)
             snapshot = dict(self.state)
+        await self._emit(snapshot)
+        return snapshot
+
+    async def _emit(self, snapshot: dict[str, int | str]) -> None:
+        if self.fanout is not None and self.fanout.running:
+            self.fanout.offer(snapshot)
+            return
         await self.persist_state_cb(snapshot)
         await self.publish_state_cb(snapshot)
         await self.broadcast_state_cb(snapshot)
         if self.ola_cb is not None:
             await self.ola_cb(snapshot)
-        return snapshot
 
 
 __all__ = ["Engine", "EngineMetrics"]
@@ -0,0 +1,131 @@
+"""Decoupled fan-out of engine state transitions to their sinks."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Tuple
+
+from .util.metrics import CoreMetrics
+
+logger = logging.getLogger("fanout")
+
+SinkCallback = Callable[[dict[str, int | str]], Awaitable[None]]
+
+
+class StateSink:
+    """One sink with its own pending queue and worker.
+
+    ``latest_only`` sinks keep just the newest snapshot (a pending one is replaced and
+    counted as dropped); the others queue up to ``maxsize`` snapshots and drop the
+    oldest on overflow.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        callback: SinkCallback,
+        *,
+        latest_only: bool = False,
+        maxsize: int = 256,
+        metrics: CoreMetrics | None = None,
+    ) -> None:
+        self.name = name
+        self.callback = callback
+        self.latest_only = latest_only
+        self.maxsize = max(1, int(maxsize))
+        self.metrics = metrics
+        self._pending: Deque[Tuple[dict[str, int | str], float]] = deque()
+        self._ready = asyncio.Event()
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def offer(self, snapshot: dict[str, int | str]) -> None:
+        limit = 1 if self.latest_only else self.maxsize
+        dropped = 0
+        while len(self._pending) >= limit:
+            self._pending.popleft()
+            dropped += 1
+        self._pending.append((snapshot, time.perf_counter()))
+        if self.metrics is not None:
+            if dropped:
+                self.metrics.inc_sink_dropped(self.name, dropped)
+            self.metrics.set_sink_queue_depth(self.name, len(self._pending))
+        self._ready.set()
+
+    async def _deliver(self, snapshot: dict[str, int | str], queued_at: float) -> None:
+        try:
+            await self.callback(snapshot)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("sink_failed", extra={"seq": snapshot.get("seq")})
+            if self.metrics is not None:
+                self.metrics.inc_sink_error(self.name)
+            return
+        if self.metrics is not None:
+            self.metrics.observe_sink_lag(self.name, int((time.perf_counter() - queued_at) * 1000))
+
+    async def run(self) -> None:
+        while True:
+            if not self._pending:
+                self._ready.clear()
+                await self._ready.wait()
+            snapshot, queued_at = self._pending.popleft()
+            if self.metrics is not None:
+                self.metrics.set_sink_queue_depth(self.name, len(self._pending))
+            await self._deliver(snapshot, queued_at)
+
+    async def drain(self) -> None:
+        """Deliver whatever is still pending (used on shutdown)."""
+        while self._pending:
+            snapshot, queued_at = self._pending.popleft()
+            await self._deliver(snapshot, queued_at)
+
+
+class StateFanout:
+    """Hands each state snapshot to every sink without waiting for any of them."""
+
+    def __init__(self, metrics: CoreMetrics | None = None) -> None:
+        self.metrics = metrics
+        self.sinks: Dict[str, StateSink] = {}
+        self._tasks: List[asyncio.Task[None]] = []
+
+    def add(self, name: str, callback: SinkCallback, *, latest_only: bool = False, maxsize: int = 256) -> StateSink:
+        sink = StateSink(name, callback, latest_only=latest_only, maxsize=maxsize, metrics=self.metrics)
+        self.sinks[name] = sink
+        return sink
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(sink.run(), name=f"fanout_{name}") for name, sink in self.sinks.items()]
+
+    def offer(self, snapshot: dict[str, int | str]) -> None:
+        for sink in self.sinks.values():
+            sink.offer(snapshot)
+
+    async def aclose(self, timeout: float = 1.0) -> None:
+        """Stop the workers, then flush pending snapshots so the last state still lands.
+
+        Each sink gets ``timeout`` seconds to flush; a hung sink is abandoned.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for sink in self.sinks.values():
+            try:
+                await asyncio.wait_for(sink.drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("sink_flush_timeout", extra={"src": sink.name})
+
+
+__all__ = ["SinkCallback", "StateFanout", "StateSink"]
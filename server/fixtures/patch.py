@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
+import numpy as np
 import yaml
 
 from server.util.schema import load_schemas
@@ -21,6 +22,7 @@ class FixtureInstance:
     invert: Dict[str, bool]
     occupied: Set[int]
     attr_map: Dict[str, Dict[str, int]]  # attr -> {"index": ch} or {"coarse": ch, "fine": ch}
+    merge: Dict[int, str] = field(default_factory=dict)  # absolute ch -> "LTP" | "HTP"
 
 
 def _load_file(path: Path) -> dict[str, Any]:
@@ -48,6 +50,7 @@ def load_patch(path: Path, profiles: Dict[str, Profile]) -> Dict[str, FixtureIns
         # Build occupied channel set and attr_map
         occ: Set[int] = set()
         attr_map: Dict[str, Dict[str, int]] = {}
+        merge: Dict[int, str] = {}
         for chdef in prof.channels:
             if (chdef.resolution == "16bit") and (chdef.coarse_index is not None and chdef.fine_index is not None):
                 coarse_abs = addr + int(chdef.coarse_index) - 1
@@ -56,18 +59,35 @@ def load_patch(path: Path, profiles: Dict[str, Profile]) -> Dict[str, FixtureIns
                     raise ValueError(f"16-bit channel exceeds 512 at fixture {fx_id}")
                 occ.update({coarse_abs, fine_abs})
                 attr_map[chdef.attr] = {"coarse": coarse_abs, "fine": fine_abs}
+                merge[coarse_abs] = merge[fine_abs] = chdef.merge
             else:
                 abs_ch = addr + int(chdef.index) - 1
                 if abs_ch < 1 or abs_ch > 512:
                     raise ValueError(f"channel out of range at fixture {fx_id}")
                 occ.add(abs_ch)
                 attr_map[chdef.attr] = {"index": abs_ch}
+                merge[abs_ch] = chdef.merge
         # overlaps
         occ_set = occupied_per_uni.setdefault(uni, set())
         overlap = occ_set.intersection(occ)
         if overlap:
             raise ValueError(f"address overlap in universe {uni}: {sorted(overlap)}")
         occ_set.update(occ)
-        instances[fx_id] = FixtureInstance(id=fx_id, name=name, profile=prof, universe=uni, address=addr, invert=invert, occupied=occ, attr_map=attr_map)
+        instances[fx_id] = FixtureInstance(id=fx_id, name=name, profile=prof, universe=uni, address=addr, invert=invert, occupied=occ, attr_map=attr_map, merge=merge)
     return instances
 
+
+def ltp_masks(instances: Dict[str, FixtureInstance]) -> Dict[int, np.ndarray]:
+    """Compile per-universe merge masks (True = LTP) for the DMX engine layer stack.
+
+    Channels not occupied by a fixture stay HTP.
+    """
+    masks: Dict[int, np.ndarray] = {}
+    for inst in instances.values():
+        mask = masks.get(inst.universe)
+        if mask is None:
+            mask = masks[inst.universe] = np.zeros(512, dtype=bool)
+        for ch, policy in inst.merge.items():
+            mask[ch - 1] = policy == "LTP"
+    return masks
+
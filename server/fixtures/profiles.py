@@ -34,7 +34,7 @@ def _load_file(path: Path) -> dict[str, Any]:
     return json.loads(text)
 
 
-def load_profiles(dir_path: Path) -> Dict[str, Profile]:
+def load_profiles(dir_path: Path, default_merge: str = "LTP") -> Dict[str, Profile]:
     schema = load_schemas()._load("shared/schema/fixture.profile.schema.json")
     profiles: Dict[str, Profile] = {}
     if not dir_path.exists():
@@ -57,7 +57,7 @@ def load_profiles(dir_path: Path) -> Dict[str, Profile]:
             chans.append(ChannelDef(
                 index=int(cd["index"]),
                 attr=str(cd["attr"]),
-                merge=str(cd.get("merge", "LTP")),
+                merge=str(cd.get("merge") or default_merge).upper(),
                 resolution=str(res),
                 coarse_index=cd.get("coarse_index"),
                 fine_index=cd.get("fine_index"),
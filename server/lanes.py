@@ -0,0 +1,176 @@
+"""Priority lanes for the engine's command queue.
+
+Commands are classified by ``src`` into lanes (console/sACN, automation/MQTT, UI),
+each with its own capacity and shedding policy. ``get`` serves the lanes in a
+weighted round robin, so a flood in one lane cannot starve the others. Since that
+order is not submission order, every item is stamped with a monotonic enqueue
+sequence; ``get_entry`` returns it for callers that need "newest wins".
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Generic, List, Mapping, Tuple, TypeVar
+
+T = TypeVar("T")
+
+LANE_CONSOLE = "console"
+LANE_AUTOMATION = "automation"
+LANE_UI = "ui"
+
+# what to do with a new command when its lane is full
+SHED_OLDEST = "drop_oldest"  # evict the lane's oldest command
+BLOCK = "block"  # make the submitter wait for room
+
+
+@dataclass(frozen=True)
+class LaneSpec:
+    name: str
+    capacity: int
+    weight: int = 1
+    shed: str = SHED_OLDEST
+
+
+def default_lanes(queue_limit: int) -> List[LaneSpec]:
+    """Split ``queue_limit`` across the lanes; console is served first and most often."""
+    quarter = max(1, queue_limit // 4)
+    return [
+        LaneSpec(LANE_CONSOLE, quarter, weight=4),
+        LaneSpec(LANE_AUTOMATION, quarter, weight=2, shed=BLOCK),
+        LaneSpec(LANE_UI, max(1, queue_limit - 2 * quarter), weight=1),
+    ]
+
+
+DEFAULT_SOURCES: Dict[str, str] = {
+    "console": LANE_CONSOLE,
+    "sacn": LANE_CONSOLE,
+    "dmx-input": LANE_CONSOLE,
+    "ui": LANE_UI,
+    "ws": LANE_UI,
+    "rest": LANE_UI,
+}
+
+
+@dataclass
+class _Lane(Generic[T]):
+    spec: LaneSpec
+    items: Deque[Tuple[int, T]] = field(default_factory=deque)
+    dropped: int = 0
+    space: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def full(self) -> bool:
+        return len(self.items) >= self.spec.capacity
+
+
+class LaneQueue(Generic[T]):
+    """Bounded multi-lane queue with per-lane shedding and weighted-fair ``get``."""
+
+    def __init__(
+        self,
+        lanes: List[LaneSpec],
+        *,
+        sources: Mapping[str, str] | None = None,
+        default_lane: str = LANE_AUTOMATION,
+    ) -> None:
+        if not lanes:
+            raise ValueError("at least one lane is required")
+        for spec in lanes:
+            if spec.capacity < 1 or spec.weight < 1:
+                raise ValueError(f"lane {spec.name}: capacity and weight must be >= 1")
+        self._lanes: List[_Lane[T]] = [_Lane(spec) for spec in lanes]
+        self._by_name = {lane.spec.name: lane for lane in self._lanes}
+        if default_lane not in self._by_name:
+            raise ValueError(f"unknown default lane: {default_lane}")
+        self.sources: Dict[str, str] = {
+            src: name for src, name in dict(sources or DEFAULT_SOURCES).items() if name in self._by_name
+        }
+        self.default_lane = default_lane
+        self._size = 0
+        self._seq = 0
+        self._ready = asyncio.Event()
+        self._cursor = 0
+        self._credit = self._lanes[0].spec.weight
+
+    def lane_for(self, src: str | None) -> str:
+        return self.sources.get(str(src), self.default_lane)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def depths(self) -> Dict[str, int]:
+        return {lane.spec.name: len(lane.items) for lane in self._lanes}
+
+    def dropped(self) -> Dict[str, int]:
+        return {lane.spec.name: lane.dropped for lane in self._lanes}
+
+    def put_nowait(self, item: T, src: str | None) -> T | None:
+        """Enqueue ``item`` in the lane of ``src``; returns the item shed to make room, if any.
+
+        Raises ``asyncio.QueueFull`` when a blocking lane is full.
+        """
+        lane = self._by_name[self.lane_for(src)]
+        evicted: T | None = None
+        if lane.full:
+            if lane.spec.shed == BLOCK:
+                raise asyncio.QueueFull
+            _, evicted = lane.items.popleft()
+            lane.dropped += 1
+            self._size -= 1
+        self._seq += 1
+        lane.items.append((self._seq, item))
+        self._size += 1
+        self._ready.set()
+        return evicted
+
+    async def put(self, item: T, src: str | None) -> None:
+        lane = self._by_name[self.lane_for(src)]
+        while lane.full and lane.spec.shed == BLOCK:
+            lane.space.clear()
+            await lane.space.wait()
+        self.put_nowait(item, src)
+
+    def get_entry_nowait(self) -> Tuple[int, T]:
+        """Next ``(enqueue sequence, item)`` in weighted round robin order."""
+        if self._size == 0:
+            raise asyncio.QueueEmpty
+        # weighted round robin: a lane is served up to ``weight`` times before moving on
+        while True:
+            lane = self._lanes[self._cursor]
+            if lane.items and self._credit > 0:
+                self._credit -= 1
+                self._size -= 1
+                lane.space.set()
+                return lane.items.popleft()
+            self._cursor = (self._cursor + 1) % len(self._lanes)
+            self._credit = self._lanes[self._cursor].spec.weight
+
+    def get_nowait(self) -> T:
+        return self.get_entry_nowait()[1]
+
+    async def get_entry(self) -> Tuple[int, T]:
+        while self._size == 0:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_entry_nowait()
+
+    async def get(self) -> T:
+        return (await self.get_entry())[1]
+
+
+__all__ = [
+    "BLOCK",
+    "DEFAULT_SOURCES",
+    "LANE_AUTOMATION",
+    "LANE_CONSOLE",
+    "LANE_UI",
+    "LaneQueue",
+    "LaneSpec",
+    "SHED_OLDEST",
+    "default_lanes",
+]
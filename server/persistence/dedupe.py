@@ -1,13 +1,21 @@
-"""Command deduplication cache with persistence."""
+"""Command deduplication cache with persistence.
+
+Accepted command ids are appended to a JSON-lines log (``<path stem>.log`` next to
+``path``) by a write-behind task, so ``accept`` never touches the disk. When the
+log grows past twice the cache capacity it is compacted off the event loop into a
+snapshot of the live entries (temp file + rename). Startup replays the legacy
+``path`` JSON (if present) and the log.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import json
+import os
 import time
 from collections import OrderedDict
 from pathlib import Path
-from typing import Iterable
+from typing import IO, List
 
 
 class CommandDeduplicator:
@@ -19,50 +27,85 @@ class CommandDeduplicator:
         ttl_seconds: int,
         capacity: int,
         path: Path,
+        flush_interval_ms: int = 50,
+        fsync_interval_ms: int = 1000,
     ) -> None:
         self.ttl_seconds = ttl_seconds
         self.capacity = capacity
         self.path = path
+        self.log_path = path.with_name(path.stem + ".log")
+        self.flush_interval_ms = max(0, int(flush_interval_ms))
+        # 0 leaves syncing to the OS
+        self.fsync_interval_ms = max(0, int(fsync_interval_ms))
         self._entries: OrderedDict[str, float] = OrderedDict()
         self._lock = asyncio.Lock()
+        self._pending: List[str] = []
+        self._log_lines = 0
+        self._log: IO[str] | None = None
+        self._last_fsync = 0.0
+        self._writer: asyncio.Task[None] | None = None
+        self._write_lock = asyncio.Lock()
         self._load()
 
     def _load(self) -> None:
+        now = time.time()
+        # keep entries in timestamp order so expiry can pop from the head
+        for cmd_id, ts in sorted(self._read_legacy() + self._read_log(), key=lambda item: item[1]):
+            if now - ts < self.ttl_seconds:
+                self._entries[cmd_id] = ts
+                self._entries.move_to_end(cmd_id)
+        self._prune(now)
+
+    def _read_legacy(self) -> list[tuple[str, float]]:
         if not self.path.exists():
-            return
+            return []
         try:
             data = json.loads(self.path.read_text("utf-8"))
         except (OSError, json.JSONDecodeError):
-            return
-        now = time.time()
+            return []
+        if not isinstance(data, dict):
+            return []
+        out: list[tuple[str, float]] = []
         for cmd_id, ts in data.items():
             if not isinstance(cmd_id, str):
                 continue
             try:
-                ts_val = float(ts)
+                out.append((cmd_id, float(ts)))
             except (TypeError, ValueError):
                 continue
-            if now - ts_val < self.ttl_seconds:
-                self._entries[cmd_id] = ts_val
-        self._prune(now)
+        return out
 
-    def _save(self) -> None:
+    def _read_log(self) -> list[tuple[str, float]]:
         try:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            self.path.write_text(json.dumps(self._entries), encoding="utf-8")
+            lines = self.log_path.read_text("utf-8").splitlines()
         except OSError:
-            # Persistence is best-effort.
-            pass
+            return []
+        self._log_lines = len(lines)
+        out: list[tuple[str, float]] = []
+        for line in lines:
+            try:
+                cmd_id, ts = json.loads(line)
+                out.append((str(cmd_id), float(ts)))
+            except (ValueError, TypeError):
+                # torn tail after a crash
+                continue
+        return out
 
     def _prune(self, now: float) -> None:
-        ttl = self.ttl_seconds
-        expired: Iterable[str] = [
-            key for key, ts in self._entries.items() if now - ts >= ttl
-        ]
-        for key in expired:
-            self._entries.pop(key, None)
-        while len(self._entries) > self.capacity:
-            self._entries.popitem(last=False)
+        """Drop expired entries from the head, then the oldest ones beyond ``capacity``.
+
+        Entries are kept in timestamp order (``accept`` appends with the current
+        time), so this stops at the first live entry: amortized O(1) per accept.
+        """
+        entries = self._entries
+        cutoff = now - self.ttl_seconds
+        while entries:
+            key = next(iter(entries))
+            if entries[key] > cutoff:
+                break
+            del entries[key]
+        while len(entries) > self.capacity:
+            entries.popitem(last=False)
 
     async def accept(self, cmd_id: str | None) -> bool:
         """Return True if the command should be processed."""
@@ -71,14 +114,87 @@ class CommandDeduplicator:
             return True
         now = time.time()
         async with self._lock:
+            self._prune(now)
             if cmd_id in self._entries:
-                if now - self._entries[cmd_id] < self.ttl_seconds:
-                    return False
+                return False
             self._entries[cmd_id] = now
-            self._entries.move_to_end(cmd_id)
-            self._prune(now)
-            self._save()
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            self._pending.append(json.dumps([cmd_id, now]) + "\n")
+            if self._writer is None or self._writer.done():
+                self._writer = asyncio.create_task(self._write_later(), name="dedupe_log")
         return True
 
+    async def _write_later(self) -> None:
+        # ids accepted during a write found this task still running: drain them too
+        while self._pending:
+            await asyncio.sleep(self.flush_interval_ms / 1000)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Append pending ids to the log (compacting it when it has grown too long)."""
+        async with self._write_lock:
+            lines, self._pending = self._pending, []
+            if not lines:
+                return
+            try:
+                if self._log_lines + len(lines) > 2 * self.capacity:
+                    snapshot = [json.dumps([k, ts]) + "\n" for k, ts in self._entries.items()]
+                    await asyncio.to_thread(self._compact, snapshot)
+                    self._log_lines = len(snapshot)
+                else:
+                    await asyncio.to_thread(self._append, lines)
+                    self._log_lines += len(lines)
+            except OSError:
+                # Persistence is best-effort.
+                pass
+
+    def _open_log(self) -> IO[str]:
+        if self._log is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.log_path, "a", encoding="utf-8")
+        return self._log
+
+    def _append(self, lines: List[str]) -> None:
+        log = self._open_log()
+        log.writelines(lines)
+        log.flush()
+        self._maybe_fsync(log)
+
+    def _maybe_fsync(self, log: IO[str]) -> None:
+        if not self.fsync_interval_ms:
+            return
+        now = time.monotonic()
+        if (now - self._last_fsync) * 1000 >= self.fsync_interval_ms:
+            os.fsync(log.fileno())
+            self._last_fsync = now
+
+    def _compact(self, snapshot: List[str]) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp = self.log_path.with_name(self.log_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.writelines(snapshot)
+            fh.flush()
+            if self.fsync_interval_ms:
+                os.fsync(fh.fileno())
+        os.replace(tmp, self.log_path)
+        # the snapshot supersedes the legacy JSON file
+        if self.path.exists():
+            self.path.unlink()
+
+    async def aclose(self) -> None:
+        """Flush pending ids and close the log."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            # not cancelled: it may be mid-write in a worker thread
+            await asyncio.gather(writer, return_exceptions=True)
+        await self.flush()
+        async with self._write_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
 
 __all__ = ["CommandDeduplicator"]
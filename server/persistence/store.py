@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import time
 from pathlib import Path
 from typing import Any, TypedDict
 
+from ..util.metrics import CoreMetrics
+
 
 class RGBState(TypedDict):
     schema: str
@@ -19,13 +23,34 @@ class RGBState(TypedDict):
 
 
 class StateStore:
-    """Persist last known state to disk for warm restarts."""
+    """Persist last known state to disk for warm restarts.
+
+    With ``debounce_ms > 0`` saves are write-behind: the newest state is kept in
+    memory and written once per window, so a burst of commands costs one file
+    write.  Every write goes to a temp file that is renamed over ``path``
+    (optionally fsynced), so a crash never leaves a torn ``state.json``.
+    """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        debounce_ms: int = 0,
+        fsync: bool = False,
+        metrics: CoreMetrics | None = None,
+    ) -> None:
         self.path = path
+        self.debounce_ms = max(0, int(debounce_ms))
+        self.fsync = fsync
+        self.metrics = metrics
         self._lock = asyncio.Lock()
+        self._pending: dict[str, Any] | None = None
+        self._pending_since: float | None = None
+        self._flusher: asyncio.Task[None] | None = None
 
     async def load(self) -> RGBState | None:
+        if self._pending is not None:
+            return dict(self._pending)  # type: ignore[return-value]
         try:
             data = await asyncio.to_thread(self.path.read_text, "utf-8")
         except FileNotFoundError:
@@ -44,10 +69,61 @@ class StateStore:
         return payload  # type: ignore[return-value]
 
     async def save(self, state: RGBState) -> None:
+        if self.debounce_ms <= 0:
+            async with self._lock:
+                await self._write(dict(state), time.perf_counter())
+            return
+        self._pending = dict(state)
+        if self._pending_since is None:
+            self._pending_since = time.perf_counter()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later(), name="state_store_flush")
+
+    async def _flush_later(self) -> None:
+        # keep going while saves land during a write: they found this task still running
+        while self._pending is not None:
+            await asyncio.sleep(self.debounce_ms / 1000)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write the pending state now (no-op when nothing is pending)."""
         async with self._lock:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            data = json.dumps(state, separators=(",", ":"))
-            await asyncio.to_thread(self.path.write_text, data, "utf-8")
+            state, since = self._pending, self._pending_since
+            self._pending = None
+            self._pending_since = None
+            if state is not None and since is not None:
+                await self._write(state, since)
+
+    async def aclose(self) -> None:
+        """Flush pending state and stop the write-behind timer."""
+        await self.flush()
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+
+    async def _write(self, state: dict[str, Any], since: float) -> None:
+        data = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        await asyncio.to_thread(self._replace, data)
+        if self.metrics is not None:
+            self.metrics.observe_persist(int((time.perf_counter() - since) * 1000), len(data))
+
+    def _replace(self, data: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        if self.fsync and os.name == "posix":
+            # make the rename itself durable
+            fd = os.open(self.path.parent, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
 
 
 __all__ = ["StateStore", "RGBState"]
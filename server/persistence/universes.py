@@ -0,0 +1,202 @@
+"""Memory-mapped binary store of DMX layer frames for warm restarts.
+
+Layout (little-endian)::
+
+    header   magic "DMXU", version u16, layers u16, capacity u32, count u32, rev u64
+    names    layers x 16-byte layer names
+    slots    capacity x i32 universe numbers (-1 = free)
+    data     capacity x layers x (512 values + 64 bytes of packed "holds" bits)
+
+Only operator-owned layers are stored by default (programmer and parked):
+generated layers (cue playback, submasters, effects) and live sACN input are
+rebuilt by their sources after a restart, and restoring them would leave
+stale values that nothing releases.
+
+``sync`` copies the engine's layer rows into the mapping and is cheap enough to
+run once per second; ``restore`` replays the stored frames into a fresh engine
+before the first output frame is sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from ..dmx.engine import CHANNELS, DMXEngine
+from ..dmx.layers import LAYER_LOCAL, LAYER_PARKED
+
+MAGIC = b"DMXU"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQ")
+_NAME_BYTES = 16
+_MASK_BYTES = CHANNELS // 8
+_LAYER_BYTES = CHANNELS + _MASK_BYTES
+DEFAULT_LAYERS = (LAYER_LOCAL, LAYER_PARKED)
+
+
+class UniverseStore:
+    """Fixed-size slots of per-layer frames in one memory-mapped file."""
+
+    def __init__(self, path: Path, *, layers: Sequence[str] = DEFAULT_LAYERS, capacity: int = 64) -> None:
+        self.path = path
+        self.layers: List[str] = list(layers)
+        self.capacity = max(1, int(capacity))
+        self.rev = 0
+        self._slots: Dict[int, int] = {}
+        self._mm: mmap.mmap | None = None
+        self._synced_rev = -1
+
+    def _size(self, capacity: int) -> int:
+        return self._data_offset(capacity) + capacity * len(self.layers) * _LAYER_BYTES
+
+    def _slots_offset(self) -> int:
+        return _HEADER.size + len(self.layers) * _NAME_BYTES
+
+    def _data_offset(self, capacity: int) -> int:
+        return self._slots_offset() + capacity * 4
+
+    def _names(self) -> bytes:
+        return b"".join(name.encode("utf-8")[:_NAME_BYTES].ljust(_NAME_BYTES, b"\0") for name in self.layers)
+
+    def open(self) -> None:
+        """Map the file, creating (or recreating, if incompatible) it as needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._map_existing():
+            self._create(self.capacity, {})
+
+    def _map_existing(self) -> bool:
+        try:
+            fh = open(self.path, "r+b")
+        except FileNotFoundError:
+            return False
+        with fh:
+            head = fh.read(_HEADER.size + len(self.layers) * _NAME_BYTES)
+            if len(head) < _HEADER.size:
+                return False
+            magic, version, n_layers, capacity, _count, rev = _HEADER.unpack_from(head)
+            if magic != MAGIC or version != VERSION or n_layers != len(self.layers):
+                return False
+            if head[_HEADER.size:] != self._names():
+                return False
+            fh.seek(0, 2)
+            if fh.tell() != self._size(capacity):
+                return False
+            self._mm = mmap.mmap(fh.fileno(), 0)
+        self.capacity = capacity
+        self.rev = rev
+        slots = np.frombuffer(self._mm, dtype="<i4", count=capacity, offset=self._slots_offset())
+        self._slots = {int(uni): i for i, uni in enumerate(slots.tolist()) if uni >= 0}
+        return True
+
+    def _create(self, capacity: int, frames: Dict[int, bytes]) -> None:
+        self.close()
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.truncate(self._size(capacity))
+        tmp.replace(self.path)
+        with open(self.path, "r+b") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0)
+        self.capacity = capacity
+        self._mm[_HEADER.size:self._slots_offset()] = self._names()
+        np.frombuffer(self._mm, dtype="<i4", count=capacity, offset=self._slots_offset())[:] = -1
+        self._slots = {}
+        for uni, block in frames.items():
+            self._block(self._slot(uni)).reshape(-1)[:] = np.frombuffer(block, dtype=np.uint8)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        assert self._mm is not None
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, len(self.layers), self.capacity, len(self._slots), self.rev)
+
+    def _block(self, slot: int) -> np.ndarray:
+        """Writable view of one universe's ``(layers, 576)`` block."""
+        assert self._mm is not None
+        offset = self._data_offset(self.capacity) + slot * len(self.layers) * _LAYER_BYTES
+        flat = np.frombuffer(self._mm, dtype=np.uint8, count=len(self.layers) * _LAYER_BYTES, offset=offset)
+        return flat.reshape(len(self.layers), _LAYER_BYTES)
+
+    def _slot(self, universe: int) -> int:
+        slot = self._slots.get(universe)
+        if slot is not None:
+            return slot
+        if len(self._slots) >= self.capacity:
+            # grow: copy the used blocks into a file twice the size
+            frames = {uni: self._block(i).tobytes() for uni, i in self._slots.items()}
+            self._create(self.capacity * 2, frames)
+            return self._slot(universe)
+        slot = len(self._slots)
+        self._slots[universe] = slot
+        assert self._mm is not None
+        struct.pack_into("<i", self._mm, self._slots_offset() + slot * 4, universe)
+        return slot
+
+    def universes(self) -> List[int]:
+        return sorted(self._slots)
+
+    def sync(self, dmx: DMXEngine) -> bool:
+        """Copy the engine's stored layers into the mapping; no-op when its rev is unchanged."""
+        if self._mm is None or dmx.rev == self._synced_rev:
+            return False
+        names = [name for name in self.layers if name in {spec.name for spec in dmx.layers()}]
+        # assign slots first: growing remaps the file, which must not happen while a block view is held
+        slots = [(uni, self._slot(uni)) for uni in dmx.universes()]
+        for uni, slot in slots:
+            block = self._block(slot)
+            for i, name in enumerate(self.layers):
+                if name not in names:
+                    continue
+                values, held = dmx.layer_state(uni, name)
+                block[i, :CHANNELS] = values
+                block[i, CHANNELS:] = np.packbits(held)
+        self.rev = dmx.rev
+        self._synced_rev = dmx.rev
+        self._write_header()
+        return True
+
+    def restore(self, dmx: DMXEngine) -> List[int]:
+        """Load stored layer frames into ``dmx``; returns the universes that hold anything."""
+        if self._mm is None:
+            return []
+        known = {spec.name for spec in dmx.layers()}
+        restored: List[int] = []
+        for uni, slot in sorted(self._slots.items()):
+            block = self._block(slot)
+            touched = False
+            for i, name in enumerate(self.layers):
+                held = np.unpackbits(block[i, CHANNELS:])[:CHANNELS].astype(bool)
+                if name not in known or not held.any():
+                    continue
+                dmx.apply_layer_frame(uni, name, block[i, :CHANNELS].copy(), held)
+                touched = True
+            if touched:
+                restored.append(uni)
+        return restored
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+
+    async def run(self, dmx: DMXEngine, *, interval_s: float = 1.0) -> None:
+        """Write-behind loop: sync changed state and flush it to disk every ``interval_s``."""
+        try:
+            while True:
+                await asyncio.sleep(interval_s)
+                if self.sync(dmx):
+                    await asyncio.to_thread(self.flush)
+        finally:
+            self.sync(dmx)
+            self.close()
+
+
+__all__ = ["DEFAULT_LAYERS", "UniverseStore"]
@@ -6,6 +6,7 @@ from typing import Any
 
 from pydantic import ValidationError
 
+from ..dmx.easing import EASINGS
 from ..models import CustomLayoutModel, SceneModel
 from ..persistence.scenes import ScenesStore
 from ..persistence.show import ShowStore
@@ -24,6 +25,20 @@ def sanitize_scene_list(payload: object) -> list[dict[str, Any]]:
     return sanitized
 
 
+def register_easing_curves(payload: object) -> list[dict[str, Any]]:
+    """Register the show's custom easing curves, dropping invalid entries."""
+    if not isinstance(payload, list):
+        return []
+    registered: list[dict[str, Any]] = []
+    for item in payload:
+        try:
+            EASINGS.register_curves([item])
+        except ValueError:
+            continue
+        registered.append(item)
+    return registered
+
+
 async def load_scenes(store: ScenesStore | None) -> list[dict[str, Any]]:
     if store is None:
         return []
@@ -53,6 +68,9 @@ async def load_show_snapshot(store: ShowStore | None) -> dict[str, Any]:
         "servos": raw.get("servos") if isinstance(raw.get("servos"), list) else [],
         "midiMappings": raw.get("midiMappings") if isinstance(raw.get("midiMappings"), list) else [],
         "scenes": sanitize_scene_list(raw.get("scenes")),
+        "cueLists": raw.get("cueLists") if isinstance(raw.get("cueLists"), list) else [],
+        "submasters": raw.get("submasters") if isinstance(raw.get("submasters"), list) else [],
+        "easingCurves": register_easing_curves(raw.get("easingCurves")),
     }
     layout_raw = raw.get("customLayout")
     if isinstance(layout_raw, dict):
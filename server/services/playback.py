@@ -0,0 +1,20 @@
+"""Rebuild server-side playbacks (cue lists, submasters, effects) from the current scenes and show."""
+
+from __future__ import annotations
+
+from ..context import AppContext
+from ..dmx.cues import compile_cue_lists
+from ..dmx.scenes import channel_map
+from ..dmx.submasters import compile_submasters
+
+
+def reload_playbacks(context: AppContext) -> None:
+    """Recompile the show's ``cueLists`` and ``submasters`` against the stored scenes and reload its ``effects``."""
+    show = context.show_snapshot or {}
+    specs = show.get("cueLists")
+    chmap = channel_map(show)
+    context.cues.load(compile_cue_lists(specs if isinstance(specs, list) else [], context.scenes or [], chmap))
+    specs = show.get("submasters")
+    context.submasters.load(*compile_submasters(specs if isinstance(specs, list) else [], context.scenes or [], chmap))
+    effects = show.get("effects")
+    context.effects.load(effects if isinstance(effects, list) else [], show)
@@ -4,21 +4,27 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import time
 from typing import Any, Tuple
 
 from ..context import AppContext
+from ..dmx.engine import CHANNELS
 from ..engine import Engine
 from ..persistence.dedupe import CommandDeduplicator
 from ..persistence.projects import ProjectMetadata, ProjectPaths, ProjectsStore
 from ..persistence.scenes import ScenesStore
 from ..persistence.show import ShowStore
 from ..persistence.store import StateStore
+from ..persistence.universes import UniverseStore
 from ..backups.base import BackupVersion
 from ..services.data import load_scenes, load_show_snapshot
+from ..services.playback import reload_playbacks
 from ..util.ulid import new_ulid
 from ..models import STATE_SCHEMA
 
+logger = logging.getLogger("projects")
+
 
 async def switch_active_project(context: AppContext, project_id: str) -> ProjectMetadata:
     if not context.projects_enabled or context.projects_store is None or context.projects_index is None:
@@ -39,13 +45,23 @@ async def switch_active_project(context: AppContext, project_id: str) -> Project
 
 
 async def _swap_project_stores(context: AppContext, paths: ProjectPaths) -> None:
-    context.store = StateStore(paths.state_path)
+    # flush write-behind state of the outgoing project before swapping files
+    await context.store.aclose()
+    context.store = StateStore(
+        paths.state_path,
+        debounce_ms=context.settings.persist_debounce_ms,
+        fsync=context.settings.persist_fsync,
+        metrics=context.core,
+    )
+    await context.dedupe.aclose()
     context.dedupe = CommandDeduplicator(
         ttl_seconds=context.settings.cmd_dedupe_ttl_seconds,
         capacity=context.settings.cmd_dedupe_capacity,
         path=paths.dedupe_path,
+        fsync_interval_ms=context.settings.cmd_dedupe_fsync_ms,
     )
     context.engine.dedupe_accept = context.dedupe.accept
+    await _swap_universe_store(context, paths)
     context.scenes_store = ScenesStore(paths.scenes_path)
     context.show_store = ShowStore(paths.show_path)
     restored = await context.store.load()
@@ -67,6 +83,61 @@ async def _swap_project_stores(context: AppContext, paths: ProjectPaths) -> None
     context.show_snapshot = await load_show_snapshot(context.show_store)
     if not context.scenes and context.show_snapshot.get("scenes"):
         context.scenes = list(context.show_snapshot.get("scenes"))
+    reload_playbacks(context)
+
+
+async def _swap_universe_store(context: AppContext, paths: ProjectPaths) -> None:
+    if context.universe_store is None:
+        return
+    if context.universe_store_task is not None:
+        # the task syncs the outgoing project's frames and closes the mapping on cancellation
+        context.universe_store_task.cancel()
+        await asyncio.gather(context.universe_store_task, return_exceptions=True)
+        context.universe_store_task = None
+    context.universe_store.close()
+    before = context.dmx.frames()
+    # programmer/parked values belong to the outgoing project
+    for universe in context.dmx.universes():
+        for layer in context.universe_store.layers:
+            context.dmx.release_layer(universe, layer)
+    store = UniverseStore(paths.state_path.parent / "universes.bin", layers=context.universe_store.layers)
+    try:
+        store.open()
+        store.restore(context.dmx)
+    except OSError:
+        logger.exception("universe_store_open_failed")
+        store = None
+    context.universe_store = store
+    if store is not None:
+        context.universe_store_task = asyncio.create_task(
+            store.run(context.dmx, interval_s=context.settings.universe_store_interval_ms / 1000),
+            name="universe_store",
+        )
+    await _publish_output_changes(context, before)
+
+
+async def _publish_output_changes(context: AppContext, before: dict[int, bytes]) -> None:
+    """Send each universe whose output differs from ``before`` to OLA and the WS clients."""
+    blank = bytes(CHANNELS)
+    for universe, frame in sorted(context.dmx.frames().items()):
+        old = before.get(universe, blank)
+        delta = [{"ch": i + 1, "val": val} for i, val in enumerate(frame) if val != old[i]]
+        if not delta:
+            continue
+        await context.hub.send_payload({
+            "type": "state.update",
+            "rev": context.dmx.universe_rev(universe),
+            "ts": context.dmx.ts,
+            "universe": universe,
+            "delta": delta,
+            "full": False,
+        })
+        if context.ola_manager is not None:
+            try:
+                context.ola_manager.apply_patch(universe, delta)
+                await context.ola_manager.maybe_send(universe)
+            except Exception:
+                pass
 
 
 def serialize_project(meta: ProjectMetadata) -> dict[str, Any]:
@@ -122,5 +193,6 @@ async def restore_backup(context: AppContext, project_id: str, version_id: str)
     context.show_snapshot = show_snapshot if isinstance(show_snapshot, dict) else {}
     if context.show_store is not None:
         await context.show_store.save(context.show_snapshot)
+    reload_playbacks(context)
     await context.engine.replace_state(state, src=f"restore:{version_id}")
     return data
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import os
 import socket
 import sys
 import threading
@@ -111,11 +112,20 @@ def _free_port() -> int:
 
 
 @pytest.fixture(scope="session")
-def live_server_url() -> str:
+def live_server_url(tmp_path_factory: pytest.TempPathFactory) -> str:
     """
     Boot uvicorn in a background thread and wait for /healthz.
     Assumes MQTT either reachable or server handles backoff.
+    Persistent files go to a fresh directory so runs don't see each other's state.
     """
+    data_dir = tmp_path_factory.mktemp("live_data")
+    env = {
+        "DMX_PERSISTENCE_PATH": str(data_dir / "state.json"),
+        "DMX_DEDUPE_PATH": str(data_dir / "cmd_seen.json"),
+        "DMX_DESKTOP_PREFS_PATH": str(data_dir / "desktop_prefs.json"),
+    }
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
     port = _free_port()
     config = uvicorn.Config(
         "server.app:create_app",
@@ -141,3 +151,8 @@ def live_server_url() -> str:
     yield base
     server.should_exit = True
     t.join(timeout=5)
+    for key, value in saved.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from server.dmx.cues import CueEngine, CuePlayback, compile_cue_lists
+from server.dmx.engine import DMXEngine
+from server.dmx.layers import LAYER_LOCAL, LAYER_PLAYBACK
+from server.dmx.scenes import channel_map, compile_scene
+
+SHOW = {
+    "universes": [{"id": "u-a", "number": 0}, {"id": "u-b", "number": 2}],
+    "fixtures": [
+        {"id": "par", "universeId": "u-a", "dmxAddress": 10, "channels": [{"id": "dim", "number": 1}, {"id": "red", "number": 2}]},
+        {"id": "far", "universeId": "u-b", "dmxAddress": 1, "channels": [{"id": "far-dim", "number": 1}]},
+    ],
+}
+SCENES = [
+    {"id": "s1", "name": "One", "timestamp": 1, "channelValues": {"dim": 200, "far-dim": 100}},
+    {"id": "s2", "name": "Two", "timestamp": 1, "channelValues": {"red": 50, "dim": 100}},
+]
+CUE_LISTS = [{
+    "id": "main",
+    "cues": [
+        {"id": "1", "sceneId": "s1"},
+        {"id": "2", "sceneId": "s2", "fadeInMs": 1000, "fadeOutMs": 500, "delayMs": 100, "followMs": 0},
+        {"id": "3", "sceneId": "missing"},
+    ],
+}]
+
+
+def test_compile_scene_resolves_channel_ids() -> None:
+    frames = compile_scene({"dim": 200, "red": 300, "far-dim": 7, "5": 1, "nope": 9}, channel_map(SHOW))
+    assert sorted(frames) == [0, 2]
+    assert frames[0].values[9] == 200 and frames[0].values[10] == 255
+    assert frames[0].values[4] == 1
+    assert frames[0].mask.sum() == 3
+    assert frames[2].values[0] == 7
+
+
+def test_playback_split_fade_and_follow() -> None:
+    cue_list = compile_cue_lists(CUE_LISTS, SCENES, channel_map(SHOW))[0]
+    pb = CuePlayback(cue_list)
+    pb.fire(0, 0)
+    out = pb.evaluate(0)
+    assert out[0][0][9] == 200 and out[2][0][0] == 100
+
+    pb.fire(1, 1000)
+    assert pb.end_ms == 1000 + 100 + 1000
+    # follow with 0ms fires cue 3 as soon as cue 2 completes
+    assert pb.follow_at == pb.end_ms
+    # still in the delay
+    assert pb.evaluate(1100)[0][0][9] == 200
+    values, mask = pb.evaluate(1350)[0]
+    # dim falls 200 -> 100 over fadeOut (half done), red rises 0 -> 50 over fadeIn (quarter done)
+    assert values[9] == pytest.approx(150)
+    assert values[10] == pytest.approx(12.5)
+    assert mask[9] and mask[10]
+    # far-dim is not in cue 2: it fades out, then is released
+    assert pb.evaluate(1350)[2][0][0] == pytest.approx(50)
+    assert 2 not in pb.evaluate(2100)
+
+
+def test_engine_commands_and_htp_compose() -> None:
+    eng = CueEngine()
+    lists = compile_cue_lists(CUE_LISTS + [{"id": "side", "cues": [{"id": "a", "sceneId": "s2"}]}], SCENES, channel_map(SHOW))
+    eng.load(lists)
+    assert not eng.back("main")
+    assert eng.go("main") and eng.go("side")
+    assert not eng.goto("main", "42") and not eng.go("nope")
+    frames = eng.compose(10**12)
+    values, mask = frames[0]
+    # dim: max(200 from main, 100 from side); red only from side
+    assert values[9] == 200 and values[10] == 50
+    assert eng.release("main")
+    frames = eng.compose(10**12)
+    # universe 2 was only held by "main": released with an empty mask
+    assert not frames[2][1].any()
+    assert frames[0][0][9] == 100
+    assert [s["current"] for s in eng.state()] == [None, "a"]
+
+
+async def test_run_writes_playback_layer() -> None:
+    dmx = DMXEngine()
+    eng = CueEngine()
+    eng.load(compile_cue_lists(CUE_LISTS, SCENES, channel_map(SHOW)))
+    sent = []
+
+    async def broadcast(payload):
+        sent.append(payload)
+
+    task = asyncio.create_task(eng.run(
+        apply_frame=lambda uni, frame, mask: dmx.apply_layer_frame(uni, LAYER_PLAYBACK, frame, mask),
+        broadcast=broadcast,
+    ))
+    try:
+        eng.go("main")
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if dmx.channel(2, 1) == 100:
+                break
+        assert dmx.channel(0, 10) == 200 and dmx.channel(2, 1) == 100
+        assert {p["universe"] for p in sent} == {0, 2}
+        # the programmer still overrides the playback layer
+        dmx.apply_layer_patch(0, LAYER_LOCAL, [{"ch": 10, "val": 5}])
+        assert dmx.channel(0, 10) == 200  # HTP
+        assert np.array_equal(dmx.layer_frame(0, LAYER_PLAYBACK)[9:11], [200, 0])
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_cue_commands_via_rest(test_app: tuple) -> None:
+    app, context, _ = test_app
+    with TestClient(app) as client:
+        body = {**SHOW, "scenes": SCENES, "cueLists": CUE_LISTS}
+        assert client.post("/import", json=body).status_code == 200
+        base = {"ts": 0, "cueList": "main"}
+        ack = client.post("/command", json={**base, "type": "cue.go", "id": "c-1"}).json()
+        assert ack["accepted"] is True
+        ack = client.post("/command", json={**base, "type": "cue.goto", "id": "c-2", "cue": "3"}).json()
+        assert ack["accepted"] is True
+        ack = client.post("/command", json={**base, "type": "cue.go", "id": "c-3", "cueList": "other"}).json()
+        assert ack == {"ack": "c-3", "accepted": False, "reason": "not_found"}
+        cues = client.get("/cues").json()
+        assert cues == [{"id": "main", "name": "main", "cues": ["1", "2", "3"], "current": "3"}]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+from server.persistence.dedupe import CommandDeduplicator
+
+
+def _dedupe(path: Path, **kwargs) -> CommandDeduplicator:
+    return CommandDeduplicator(ttl_seconds=60, capacity=4, path=path, flush_interval_ms=0, **kwargs)
+
+
+async def test_accept_appends_and_restart_replays(tmp_path: Path) -> None:
+    path = tmp_path / "cmd_seen.json"
+    dedupe = _dedupe(path)
+    assert await dedupe.accept("a") and await dedupe.accept("b")
+    assert not await dedupe.accept("a")
+    assert not path.exists()  # accept never rewrites the snapshot
+    await dedupe.aclose()
+    lines = (tmp_path / "cmd_seen.log").read_text("utf-8").splitlines()
+    assert [json.loads(line)[0] for line in lines] == ["a", "b"]
+
+    # a torn tail line (crash mid-append) is ignored
+    with open(tmp_path / "cmd_seen.log", "a", encoding="utf-8") as fh:
+        fh.write('["c", 12')
+    again = _dedupe(path)
+    assert not await again.accept("b")
+    assert await again.accept("c")
+    await again.aclose()
+
+
+async def test_log_is_compacted_and_legacy_json_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "cmd_seen.json"
+    path.write_text(json.dumps({"old": time.time(), "stale": time.time() - 3600}), encoding="utf-8")
+    dedupe = _dedupe(path, fsync_interval_ms=0)
+    assert not await dedupe.accept("old") and await dedupe.accept("stale")
+    for i in range(10):
+        assert await dedupe.accept(f"id-{i}")
+        await dedupe.flush()
+    await dedupe.aclose()
+    # capacity 4: the log never grows past 2x capacity and holds only live ids
+    lines = (tmp_path / "cmd_seen.log").read_text("utf-8").splitlines()
+    assert len(lines) <= 8
+    assert not path.exists()
+    restarted = _dedupe(path)
+    assert not await restarted.accept("id-9")
+    assert await restarted.accept("id-0")  # evicted by capacity
+    await restarted.aclose()
+
+
+async def test_expiry_pops_from_head(tmp_path: Path, monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr("server.persistence.dedupe.time.time", lambda: clock[0])
+    dedupe = CommandDeduplicator(ttl_seconds=10, capacity=100, path=tmp_path / "d.json", flush_interval_ms=0)
+    for i in range(5):
+        assert await dedupe.accept(f"id-{i}")
+        clock[0] += 3
+    # now=1015: id-0 (1000) and id-1 (1003) are past the 10 s TTL
+    assert await dedupe.accept("fresh")
+    assert list(dedupe._entries) == ["id-2", "id-3", "id-4", "fresh"]
+    assert await dedupe.accept("id-0")
+    assert not await dedupe.accept("id-4")
+    await dedupe.aclose()
+
+
+async def test_accept_during_blocked_write_is_logged(tmp_path: Path) -> None:
+    path = tmp_path / "cmd_seen.json"
+    dedupe = _dedupe(path)
+    release = threading.Event()
+    writing = threading.Event()
+    original = dedupe._append
+
+    def slow_append(lines: list[str]) -> None:
+        writing.set()
+        release.wait(2)
+        original(lines)
+
+    dedupe._append = slow_append  # type: ignore[method-assign]
+    assert await dedupe.accept("first")
+    while not writing.is_set():
+        await asyncio.sleep(0.001)
+    assert await dedupe.accept("second")
+    release.set()
+    await asyncio.sleep(0.1)
+    # without aclose(): the writer must have drained "second" on its own
+    ids = [json.loads(line)[0] for line in (tmp_path / "cmd_seen.log").read_text("utf-8").splitlines()]
+    assert ids == ["first", "second"]
+    await dedupe.aclose()
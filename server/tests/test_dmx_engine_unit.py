@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import random
+
+from server.benchmarks.compositor import LoopCompositor
+from server.dmx.engine import DMXEngine
+
+
+def test_vectorized_compositor_matches_loop_reference():
+    rng = random.Random(7)
+    ref = LoopCompositor()
+    eng = DMXEngine()
+    for step in range(200):
+        uni = rng.randrange(3)
+        if step % 3 == 0:
+            frame = bytes(rng.randrange(256) for _ in range(512))
+            expected, _, _ = ref.apply_sacn_composite(uni, frame)
+            actual, _, _ = eng.apply_sacn_composite(uni, frame)
+        else:
+            items = [{"ch": rng.randint(1, 512), "val": rng.randrange(256)} for _ in range(rng.randint(1, 5))]
+            # reference has no LWW canonicalization; feed it the deduplicated patch
+            latest = {it["ch"]: it["val"] for it in items}
+            expected, _, _ = ref.apply_local_patch(uni, [{"ch": c, "val": v} for c, v in latest.items()])
+            actual, _, _ = eng.apply_local_patch(uni, items)
+        assert sorted(actual, key=lambda d: d["ch"]) == sorted(expected, key=lambda d: d["ch"])
+    snap = eng.snapshot()
+    for uni, frame in ref._output.items():
+        assert [snap[uni][ch] for ch in range(1, 513)] == list(frame)
+
+
+def test_sacn_composite_accepts_short_lists_and_grows_universes():
+    eng = DMXEngine()
+    delta, rev, _ = eng.apply_sacn_composite(9, [300, 5])
+    # values are masked to a byte, missing channels are zero
+    assert delta == [{"ch": 1, "val": 300 & 0xFF}, {"ch": 2, "val": 5}]
+    assert rev == 1
+    for uni in range(10, 20):
+        eng.apply_local_patch(uni, [{"ch": 512, "val": uni}])
+    assert eng.snapshot()[19][512] == 19
+    assert eng.snapshot()[9][2] == 5
+    assert eng.sacn_frame(9)[:2] == [44, 5]
+    # unchanged composite produces no delta and no rev bump
+    assert eng.apply_sacn_composite(9, [300, 5])[0] == []
+    assert eng.rev == rev + 10
+
+
+def test_dirty_ranges_merge_adjacent_and_overlapping():
+    from server.dmx.engine import DirtyRanges
+
+    d = DirtyRanges()
+    d.add(10, 11)
+    d.add(12, 13)
+    d.add(11, 12)
+    d.add(40, 45)
+    d.add(0, 1)
+    assert d.ranges == [(0, 1), (10, 13), (40, 45)]
+    d.add(5, 42)
+    assert d.ranges == [(0, 1), (5, 45)]
+    assert d.count() == 41
+    d.mark_full()
+    d.add(3, 4)
+    assert d.full and d.ranges == [] and d.count() == 512
+
+
+def test_local_patch_recomputes_only_touched_channels():
+    eng = DMXEngine()
+    eng.apply_sacn_composite(0, bytes([50] * 512))
+    # small patch: only the patched channel is re-merged, HTP keeps sACN on others
+    delta, _, _ = eng.apply_local_patch(0, [{"ch": 3, "val": 200}])
+    assert delta == [{"ch": 3, "val": 200}]
+    delta, _, _ = eng.apply_local_patch(0, [{"ch": 3, "val": 10}])
+    assert delta == [{"ch": 3, "val": 50}]
+    # large patch takes the vectorized span path but yields the same semantics
+    big = [{"ch": ch, "val": 100 if ch % 2 else 0} for ch in range(100, 200)]
+    delta, _, _ = eng.apply_local_patch(0, big)
+    assert delta == [{"ch": ch, "val": 100} for ch in range(101, 200, 2)]
+    assert not eng._take_dirty(0)
+
+
+def test_deltas_since_merges_log_and_detects_gaps():
+    eng = DMXEngine(history=4)
+    _, rev0, _ = eng.apply_local_patch(0, [{"ch": 1, "val": 10}])
+    eng.apply_local_patch(0, [{"ch": 2, "val": 20}])
+    eng.apply_local_patch(0, [{"ch": 1, "val": 11}])
+    eng.apply_sacn_composite(1, [0, 0, 5])
+    # changes to other universes do not leak into the merged delta
+    assert eng.deltas_since(0, rev0) == [{"ch": 1, "val": 11}, {"ch": 2, "val": 20}]
+    assert eng.deltas_since(0, eng.rev) == []
+    assert eng.universe_rev(0) == eng.rev - 1
+    # universe 1 was registered after rev0: the client never saw it
+    assert eng.deltas_since(1, rev0) is None
+    assert eng.deltas_since(0, eng.rev + 1) is None
+    big = [{"ch": ch, "val": 1} for ch in range(100, 200)]
+    for val in range(2, 6):
+        eng.apply_local_patch(0, [dict(it, val=val) for it in big])
+    # history of four entries no longer reaches back to rev0
+    assert eng.deltas_since(0, rev0) is None
+    assert eng.deltas_since(0, eng.rev - 1) == [{"ch": ch, "val": 5} for ch in range(100, 200)]
+
+
+def test_frames_are_cached_per_universe_revision():
+    eng = DMXEngine()
+    eng.apply_local_patch(1, [{"ch": 4, "val": 40}])
+    f0, f1 = eng.frame(0), eng.frame(1)
+    assert isinstance(f1, bytes) and f1[3] == 40 and len(f1) == 512
+    eng.apply_local_patch(0, [{"ch": 1, "val": 1}])
+    # only the changed universe is re-materialized
+    assert eng.frame(1) is f1
+    assert eng.frame(0) is not f0 and eng.frame(0)[0] == 1
+    assert eng.channel(1, 4) == 40 and eng.channel(1, 513) == 0
+    # reading an unknown universe neither registers it nor allocates a row
+    assert eng.frame(7) == bytes(512) and eng.channel(7, 1) == 0
+    assert sorted(eng.frames()) == [0, 1]
+    assert eng.snapshot()[1][4] == 40
+
+
+def test_layer_stack_merges_htp_ltp_and_parked():
+    from server.dmx.layers import LAYER_PARKED, LAYER_PLAYBACK, LAYER_SACN
+
+    eng = DMXEngine()
+    mask = [False] * 512
+    mask[0] = mask[1] = True  # ch1-2 LTP, rest HTP
+    eng.set_ltp_mask(0, mask)
+    eng.apply_layer_patch(0, LAYER_PLAYBACK, [{"ch": 1, "val": 200}, {"ch": 3, "val": 200}])
+    eng.apply_sacn_composite(0, [90, 0, 90])
+    # LTP: sACN sits above playback; HTP: highest value wins
+    assert [eng.channel(0, ch) for ch in (1, 3)] == [90, 200]
+    # local holding 0 on an LTP channel still takes precedence
+    delta, _, _ = eng.apply_local_patch(0, [{"ch": 1, "val": 0}])
+    assert delta == [{"ch": 1, "val": 0}]
+    eng.apply_layer_patch(0, LAYER_PARKED, [{"ch": 3, "val": 5}])
+    assert eng.channel(0, 3) == 5
+    # releasing layers falls back to whatever is held below
+    eng.release_layer(0, "local", [1])
+    eng.release_layer(0, LAYER_SACN)
+    eng.release_layer(0, LAYER_PARKED)
+    assert [eng.channel(0, ch) for ch in (1, 3)] == [200, 200]
+    # dropping the mask reverts the universe to HTP
+    eng.apply_local_patch(0, [{"ch": 1, "val": 10}])
+    assert eng.channel(0, 1) == 10
+    assert eng.set_merge_masks({}) == {0: ([{"ch": 1, "val": 200}], eng.rev, eng.ts)}
+
+
+def test_span_and_scalar_merge_paths_agree(monkeypatch):
+    import numpy as np
+
+    from server.dmx import engine as engine_mod
+    from server.dmx.layers import LayerSpec
+
+    stack = [LayerSpec("a", 1), LayerSpec("b", 2), LayerSpec("c", 3), LayerSpec("p", 9, override=True)]
+    rng = random.Random(3)
+    ops = []
+    for _ in range(300):
+        layer = rng.choice("abcp")
+        kind = rng.random()
+        chans = rng.sample(range(1, 513), rng.randint(1, 60))
+        if kind < 0.7:
+            ops.append(("patch", layer, [{"ch": c, "val": rng.randrange(256)} for c in chans]))
+        else:
+            ops.append(("release", layer, chans))
+    mask = np.array([rng.random() < 0.5 for _ in range(512)])
+
+    def run(limit: int) -> bytes:
+        monkeypatch.setattr(engine_mod, "_SCALAR_LIMIT", limit)
+        eng = DMXEngine(layers=stack)
+        eng.set_ltp_mask(0, mask)
+        for kind, layer, arg in ops:
+            if kind == "patch":
+                eng.apply_layer_patch(0, layer, arg)
+            else:
+                eng.release_layer(0, layer, arg)
+        return eng.frame(0)
+
+    assert run(0) == run(10_000)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from server.dmx.easing import EASINGS, LINEAR, EasingRegistry, sample_bezier
+
+
+def test_builtin_curves_match_closed_form() -> None:
+    reg = EasingRegistry()
+    for t in (0.0, 0.1, 0.37, 0.5, 0.81, 1.0):
+        assert reg.ease(reg.resolve("linear"), t) == pytest.approx(t, abs=1e-6)
+        assert reg.ease(reg.resolve("s_curve"), t) == pytest.approx(t * t * (3 - 2 * t), abs=1e-6)
+    assert reg.ease(reg.resolve("expo"), 0.0) == 0.0
+    assert reg.ease(reg.resolve("expo"), 1.0) == 1.0
+    # out of range t is clipped
+    assert reg.ease(reg.resolve("ease_in_out"), -1.0) == 0.0
+    assert reg.ease(reg.resolve("ease_in_out"), 2.0) == 1.0
+
+
+def test_bezier_sampling_matches_css_reference() -> None:
+    # linear control points sample to the identity
+    table = sample_bezier(0.0, 0.0, 1.0, 1.0, size=257)
+    assert np.allclose(table, np.linspace(0.0, 1.0, 257), atol=1e-4)
+    reg = EasingRegistry()
+    # CSS "ease" at x=0.5 is ~0.8024
+    assert reg.ease(reg.resolve("ease"), 0.5) == pytest.approx(0.8024, abs=1e-3)
+    cid = reg.resolve("cubic-bezier(0.42, 0, 0.58, 1)")
+    assert cid != LINEAR
+    assert reg.resolve("cubic-bezier(0.42,0,0.58,1)") == cid
+    assert reg.resolve("nope") == LINEAR
+    assert not reg.known("cubic-bezier(2,0,0.5,1)")
+
+
+def test_adhoc_beziers_are_canonical_and_bounded() -> None:
+    reg = EasingRegistry(size=64, max_adhoc=2)
+    rows = len(reg.names())
+    a = reg.resolve("cubic-bezier(0.5, 0, 0.5, 1)")
+    assert reg.resolve("cubic-bezier(.50,-0,0.5,1.0)") == a
+    b = reg.resolve("cubic-bezier(0.1, 0, 0.9, 1)")
+    reg.resolve("cubic-bezier(0.5,0,0.5,1)")  # a is now the most recently used
+    c = reg.resolve("cubic-bezier(0.2, 0.3, 0.4, 0.5)")
+    # the least recently used slot (b) is reused for the new curve
+    assert c == b and c != a
+    assert reg.ease(c, 0.5) == pytest.approx(float(sample_bezier(0.2, 0.3, 0.4, 0.5, size=64)[32]), abs=0.02)
+    ids = {reg.resolve(f"cubic-bezier(0.{i % 10}, {i}, 0.5, 1)") for i in range(100)}
+    # a hundred distinct curves still live in the two pooled slots
+    assert ids == {a, b}
+    assert len(reg.names()) == rows
+
+
+def test_ease_many_matches_scalar() -> None:
+    reg = EasingRegistry()
+    rng = np.random.default_rng(3)
+    curves = rng.integers(0, len(reg.names()), size=500)
+    t = rng.uniform(-0.2, 1.2, size=500)
+    batched = reg.ease_many(curves, t)
+    for k in range(500):
+        assert batched[k] == reg.ease(int(curves[k]), float(t[k]))
+
+
+def test_register_show_curves() -> None:
+    reg = EasingRegistry()
+    names = reg.register_curves([
+        {"name": "snap", "bezier": [0.9, 0.0, 1.0, 0.0]},
+        {"name": "bump", "points": [0, 1, 0.5, 1]},
+    ])
+    assert names == ["snap", "bump"]
+    assert reg.ease(reg.resolve("bump"), 1 / 3) == pytest.approx(1.0, abs=1e-3)
+    with pytest.raises(ValueError):
+        reg.register_curves([{"name": "s_curve", "points": [0, 1]}])
+    with pytest.raises(ValueError):
+        # one bad entry rejects the whole batch
+        reg.register_curves([{"name": "ok", "points": [0, 1]}, {"name": "bad", "bezier": [1, 2]}])
+    assert not reg.known("ok")
+
+
+def test_import_registers_curves_and_fade_rejects_unknown(test_app: tuple) -> None:
+    app, context, _ = test_app
+    with TestClient(app) as client:
+        body = {"scenes": [], "easingCurves": [{"name": "test-import-curve", "points": [0, 0.2, 1]}]}
+        assert client.post("/import", json=body).status_code == 200
+        assert EASINGS.known("test-import-curve")
+        assert client.post("/import", json={"easingCurves": [{"name": "linear", "points": [0, 1]}]}).status_code == 400
+        cmd = {"type": "dmx.fade", "id": "e-1", "ts": 0, "universe": 0, "durationMs": 100, "patch": [{"ch": 1, "val": 10}]}
+        ack = client.post("/command", json={**cmd, "easing": "wobble"}).json()
+        assert ack["accepted"] is False
+        assert ack["errors"] == [{"path": "/easing", "msg": "unknown easing: wobble"}]
+        ack = client.post("/command", json={**cmd, "id": "e-2", "easing": "test-import-curve"}).json()
+        assert ack["accepted"] is True
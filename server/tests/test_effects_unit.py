@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import math
+
+from fastapi.testclient import TestClient
+
+from server.dmx.effects import EffectsEngine, compile_effects, evaluate
+
+FIXTURES = [
+    {"id": f"fx{i}", "universeId": "u", "dmxAddress": 1 + i * 3, "channels": [{"id": f"c{i}-{n}", "number": n + 1} for n in range(3)]}
+    for i in range(4)
+]
+SHOW = {"universes": [{"id": "u", "number": 1}], "fixtures": FIXTURES}
+FX_IDS = [fx["id"] for fx in FIXTURES]
+
+
+def _effect(eid: str, typ: str, **extra) -> dict:
+    return {"id": eid, "name": eid, "type": typ, "fixtureIds": FX_IDS, "speed": 100, "intensity": 100,
+            "isActive": False, "parameters": {}, **extra}
+
+
+def test_waveforms_match_ui_formulas() -> None:
+    effects = [_effect("c", "chase"), _effect("w", "wave"), _effect("p", "pulse"), _effect("r", "rainbow"), _effect("x", "fire")]
+    ids, slots = compile_effects(effects, SHOW)
+    assert ids == ["c", "w", "p", "r"]  # unsupported types are left to the UI
+    now = 2345.0
+    values = evaluate(slots, now).tolist()
+    expected = []
+    for i in range(4):  # chase: one fixture at a time, 2000ms per step
+        expected.append(math.floor(100 * 2.55) if math.floor((now / 2000) % 4) == i else 0)
+    for i in range(4):  # wave: phase spread over the fixtures
+        progress = (now % 3000) / 3000 * 2 * math.pi
+        wave = (math.sin(progress + i / 4 * 2 * math.pi) + 1) / 2
+        assert abs(values[len(expected)] - math.floor(wave * 100 * 2.55)) <= 1
+        expected.append(values[len(expected)])
+    pulse = math.floor(math.sin((now % 2000) / 2000 * math.pi) ** 2 * 100 * 2.55)
+    expected.extend([pulse] * 4)
+    assert values[:12] == expected
+    # rainbow drives r/g/b of each fixture from hsl(hue, 1, 0.5), hue stepping 30 deg per fixture
+    for i in range(4):
+        hue = ((now % 5000) / 5000 * 360 + i * 30) % 360 / 360
+        rgb = [round(_hue2rgb(hue + shift) * 255) for shift in (1 / 3, 0, -1 / 3)]
+        assert values[12 + 3 * i: 15 + 3 * i] == rgb
+
+
+def test_bad_entries_are_skipped_and_intensity_defaults_to_full() -> None:
+    effects = [
+        _effect("spread", "wave", parameters={"spread": "wide"}),
+        _effect("speed", "chase", speed="fast"),
+        _effect("nan", "pulse", intensity=float("nan")),
+        {key: value for key, value in _effect("ok", "pulse").items() if key != "intensity"},
+    ]
+    ids, slots = compile_effects(effects, SHOW)
+    assert ids == ["ok"]
+    assert slots.intensity.tolist() == [100.0] * 4
+
+
+def _hue2rgb(t: float) -> float:
+    t %= 1
+    if t < 1 / 6:
+        return 6 * t
+    if t < 1 / 2:
+        return 1.0
+    if t < 2 / 3:
+        return (2 / 3 - t) * 6
+    return 0.0
+
+
+def test_engine_start_stop_releases_channels() -> None:
+    eng = EffectsEngine()
+    eng.load([_effect("w", "wave", isActive=True), _effect("p", "pulse")], SHOW)
+    assert eng.state() == [{"id": "w", "active": True}, {"id": "p", "active": False}]
+    frames = eng.compose(0.0)
+    values, mask = frames[1]
+    assert mask.sum() == 4 and mask[[0, 3, 6, 9]].all()
+    assert eng.start("p") and not eng.start("nope")
+    # both effects share each fixture's first channel: merged HTP
+    both = eng.compose(500.0)[1][0]
+    assert both[0] == max(evaluate(eng._slots, 500.0)[[0, 4]])
+    assert eng.stop("w") and eng.stop("p")
+    values, mask = eng.compose(600.0)[1]
+    assert not mask.any() and not values.any()
+    assert eng.compose(700.0) == {}
+
+
+def test_effect_commands_via_rest(test_app: tuple) -> None:
+    app, context, _ = test_app
+    with TestClient(app) as client:
+        body = {**SHOW, "scenes": [], "effects": [_effect("w", "wave")]}
+        assert client.post("/import", json=body).status_code == 200
+        ack = client.post("/command", json={"type": "effect.start", "id": "e-1", "ts": 0, "effectId": "w"}).json()
+        assert ack["accepted"] is True
+        assert client.get("/effects").json() == [{"id": "w", "active": True}]
+        ack = client.post("/command", json={"type": "effect.stop", "id": "e-2", "ts": 0, "effectId": "zzz"}).json()
+        assert ack["accepted"] is False and ack["reason"] == "not_found"
@@ -25,7 +25,7 @@ class DedupeStub:
         return True
 
 
-async def build_engine() -> tuple[Engine, list[dict[str, Any]], asyncio.Task[None]]:
+async def build_engine(**options: Any) -> tuple[Engine, list[dict[str, Any]], asyncio.Task[None]]:
     published: list[dict[str, Any]] = []
 
     async def publish(state: dict[str, Any]) -> None:
@@ -43,6 +43,7 @@ async def build_engine() -> tuple[Engine, list[dict[str, Any]], asyncio.Task[Non
         persist_state_cb=persist,
         dedupe_accept=DedupeStub().accept,
         queue_limit=32,
+        **options,
     )
     task = asyncio.create_task(engine.run())
     return engine, published, task
@@ -108,6 +109,44 @@ async def test_engine_bounds() -> None:
         await task
 
 
+@pytest.mark.asyncio
+async def test_engine_coalesces_queued_commands() -> None:
+    engine, published, task = await build_engine(coalesce=True)
+    cmds = [
+        RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="ui", r=i, g=i, b=i, ts=None)
+        for i in range(1, 6)
+    ]
+    # queued before the engine task first runs: drained as one batch
+    for cmd in cmds + [cmds[1]]:
+        await engine.submit(cmd)
+    await asyncio.sleep(0.1)
+    assert engine.state["seq"] == 1
+    assert (engine.state["r"], engine.state["g"], engine.state["b"]) == (5, 5, 5)
+    assert len([p for p in published if "persist" in p]) == 1
+    assert engine.metrics.processed == 1
+    assert engine.metrics.coalesced == 4
+    assert engine.metrics.deduped == 1
+    assert engine.metrics.batches == 1 and engine.metrics.last_batch_size == 6
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_engine_batch_size_is_bounded() -> None:
+    engine, _, task = await build_engine(coalesce=True, batch_max=2)
+    for i in range(1, 6):
+        await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="ui", r=i, g=0, b=0, ts=None))
+    await asyncio.sleep(0.1)
+    # 5 commands in batches of at most 2 -> 3 transitions, last write still wins
+    assert engine.metrics.batches == 3
+    assert engine.state["seq"] == 3 and engine.state["r"] == 5
+    assert engine.metrics.coalesced == 2
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
 def build_commands(values: list[tuple[int, int, int]]) -> list[RGBCommand]:
     commands: list[RGBCommand] = []
     for idx, (r, g, b) in enumerate(values):
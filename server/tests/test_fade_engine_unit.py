@@ -135,3 +135,96 @@ async def test_ltp_cancel_by_patch(fake_clock):
         await task
 
     assert state[0][1] == 10
+
+
+async def test_fade_store_matches_scalar_value_at():
+    import random
+
+    from server.dmx.fade_engine import FadeStore, FadeTask
+
+    rng = random.Random(5)
+    tasks = []
+    for n in range(40):
+        chans = rng.sample(range(1, 65), rng.randint(1, 12))
+        tasks.append(FadeTask(
+            universe=0,
+            targets={ch: rng.randrange(256) for ch in chans},
+            start_values={ch: rng.randrange(256) for ch in chans},
+            start_ms=rng.randrange(0, 2000),
+            duration_ms=rng.choice([0, 1, 7, 333, 1000, 2500]),
+            easing=rng.choice(["linear", "s_curve", "expo", "bogus"]),
+        ))
+    store = FadeStore(tasks)
+    for now_ms in range(0, 5000, 37):
+        expected: Dict[int, int] = {}
+        for ft in tasks:
+            for ch in ft.targets:
+                expected[ch] = ft.value_at(ch, now_ms)
+        chans, values = store.evaluate(now_ms)
+        assert dict(zip(chans.tolist(), values.tolist())) == expected
+
+
+async def test_owner_index_and_deadline_heap():
+    from server.dmx.fade_engine import FadeEngine
+
+    fe = FadeEngine()
+    get_current = lambda u, ch: 0  # noqa: E731
+    fe.add_fade(universe=0, patch=[{"ch": 1, "val": 10}, {"ch": 2, "val": 10}], duration_ms=100, now_ms=0, get_current=get_current)
+    fe.add_fade(universe=0, patch=[{"ch": 2, "val": 20}], duration_ms=500, now_ms=0, get_current=get_current)
+    fe.add_fade(universe=1, patch=[{"ch": 2, "val": 30}], duration_ms=50, now_ms=0, get_current=get_current)
+
+    # LTP takeover of ch2 only touches the fades that own it, in that universe
+    fe.cancel_channels(0, [2, 7])
+    assert [ft.targets for ft in fe.tasks[0]] == [{1: 10}]
+    assert fe.tasks[1][0].targets == {2: 30}
+
+    finished = fe._pop_finished(99)
+    assert list(finished) == [1]
+    assert fe._finish(1, finished[1]) == 1
+    assert 1 not in fe.tasks
+    # the cancelled 500ms fade left nothing behind in the heap
+    finished = fe._pop_finished(1000)
+    assert [ft.targets for ft in finished[0]] == [{1: 10}]
+    fe._finish(0, finished[0])
+    assert fe.tasks == {} and fe._owners == {} and fe._deadlines == []
+
+
+async def test_idle_engine_sleeps_and_reports_missed_ticks(fake_clock):
+    from server.dmx.fade_engine import FadeEngine
+    from server.util.metrics import CoreMetrics
+
+    calls: List[int] = []
+
+    def apply_patch(u: int, items: List[dict]):
+        calls.append(u)
+        if len(calls) == 2:
+            # a slow tick: 3.5 intervals pass, so three deadlines are due
+            fake_clock.t += 3.5 / 44
+        return [], 0, 0
+
+    async def broadcast(payload):
+        return None
+
+    metrics = CoreMetrics()
+    fe = FadeEngine()
+    task = asyncio.create_task(fe.run(apply_patch=apply_patch, broadcast=broadcast, metrics=metrics))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    # nothing to fade: no ticks and no clock-advancing sleeps
+    assert calls == [] and fake_clock.t == 0.0
+
+    fe.add_fade(universe=0, patch=[{"ch": 1, "val": 255}], duration_ms=200, now_ms=fe.now_ms(), get_current=lambda u, ch: 0)
+    for _ in range(40):
+        await asyncio.sleep(0)
+    assert fe.tasks == {}
+    # two are skipped, the third runs late instead of bursting through all of them
+    assert metrics.fade_ticks_missed_total == 2
+    assert metrics.fade_tick_jitter_ms.total == len(calls)
+    # idle again once the fade finished
+    ticks, t = len(calls), fake_clock.t
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert len(calls) == ticks and fake_clock.t == t
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any
+
+import pytest
+
+from server.engine import Engine
+from server.fanout import StateFanout
+from server.models import CMD_SCHEMA, RGBCommand
+from server.util.metrics import CoreMetrics
+from server.util.ulid import new_ulid
+
+
+async def test_slow_sink_does_not_delay_output() -> None:
+    metrics = CoreMetrics()
+    fanout = StateFanout(metrics=metrics)
+    output: list[int] = []
+    persisted: list[int] = []
+    release = asyncio.Event()
+
+    async def fast(state: dict[str, Any]) -> None:
+        output.append(int(state["seq"]))
+
+    async def slow(state: dict[str, Any]) -> None:
+        await release.wait()
+        persisted.append(int(state["seq"]))
+
+    fanout.add("output", fast, latest_only=True)
+    fanout.add("persist", slow, latest_only=True)
+    fanout.start()
+    try:
+        for seq in range(1, 4):
+            fanout.offer({"seq": seq})
+            await asyncio.sleep(0.01)
+        # output saw every transition while persist is stuck on the first one
+        assert output == [1, 2, 3]
+        assert persisted == []
+        release.set()
+        await asyncio.sleep(0.01)
+        # seq 2 was superseded by 3 while persist was busy
+        assert persisted == [1, 3]
+        assert metrics.sink_dropped_total == {"persist": 1}
+        assert metrics.sink_lag_ms["output"].total == 3
+    finally:
+        await fanout.aclose()
+
+
+async def test_queued_sink_drops_oldest_and_flushes_on_close() -> None:
+    metrics = CoreMetrics()
+    fanout = StateFanout(metrics=metrics)
+    seen: list[int] = []
+
+    async def ws(state: dict[str, Any]) -> None:
+        seen.append(int(state["seq"]))
+
+    async def broken(state: dict[str, Any]) -> None:
+        raise RuntimeError("broker down")
+
+    fanout.add("ws", ws, maxsize=2)
+    fanout.add("mqtt", broken, latest_only=True)
+    # not started yet: snapshots pile up in the sink queues
+    for seq in range(1, 5):
+        fanout.offer({"seq": seq})
+    assert metrics.sink_queue_depth == {"ws": 2, "mqtt": 1}
+    await fanout.aclose()
+    assert seen == [3, 4]
+    assert metrics.sink_dropped_total == {"ws": 2, "mqtt": 3}
+    assert metrics.sink_errors_total == {"mqtt": 1}
+
+
+@pytest.mark.asyncio
+async def test_engine_hands_snapshots_to_fanout() -> None:
+    calls: list[str] = []
+
+    async def never(state: dict[str, Any]) -> None:
+        await asyncio.Event().wait()
+
+    async def record(state: dict[str, Any]) -> None:
+        calls.append(f"output:{state['r']}")
+
+    fanout = StateFanout()
+    fanout.add("output", record, latest_only=True)
+    fanout.add("mqtt", never, latest_only=True)
+    engine = Engine(publish_state_cb=never, broadcast_state_cb=never, persist_state_cb=never, fanout=fanout)
+    task = asyncio.create_task(engine.run())
+    try:
+        await asyncio.sleep(0)
+        await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="ui", r=7, g=0, b=0, ts=None))
+        await asyncio.sleep(0.05)
+        # the engine never awaited the hung MQTT sink
+        assert calls == ["output:7"]
+        assert engine.metrics.processed == 1
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.wait_for(task, 1)
@@ -43,3 +43,26 @@ def test_patch_overlap_and_missing_profile(tmp_path: Path):
     with pytest.raises(ValueError):
         load_patch(patch_file, profiles)
 
+
+
+def test_patch_compiles_ltp_masks(tmp_path: Path):
+    from server.fixtures.patch import ltp_masks
+
+    prof_dir = tmp_path / "profiles" ; prof_dir.mkdir()
+    prof = {
+        "id": "Dimmer.Color",
+        "channels": [
+            {"index": 1, "attr": "dimmer", "merge": "HTP"},
+            {"index": 2, "attr": "color"},
+        ],
+    }
+    (prof_dir / "dimmer.json").write_text(json.dumps(prof), encoding="utf-8")
+    patch_file = tmp_path / "patch.json"
+    patch_file.write_text(json.dumps({"fixtures": [{"id": "fx1", "profile": "Dimmer.Color", "universe": 2, "address": 10}]}), encoding="utf-8")
+
+    masks = ltp_masks(load_patch(patch_file, load_profiles(prof_dir)))
+    assert list(masks) == [2]
+    assert masks[2].nonzero()[0].tolist() == [10]  # ch 11 (color) is LTP
+    # attr_default_merge applies to channels without an explicit policy
+    masks = ltp_masks(load_patch(patch_file, load_profiles(prof_dir, "HTP")))
+    assert not masks[2].any()
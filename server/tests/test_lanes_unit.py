@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+
+from server.engine import Engine
+from server.lanes import BLOCK, LaneQueue, LaneSpec
+from server.models import CMD_SCHEMA, RGBCommand
+from server.util.ulid import new_ulid
+
+LANES = [
+    LaneSpec("console", 4, weight=2),
+    LaneSpec("automation", 2, weight=1, shed=BLOCK),
+    LaneSpec("ui", 3, weight=1),
+]
+SOURCES = {"console": "console", "ui": "ui"}
+
+
+def test_weighted_round_robin() -> None:
+    q: LaneQueue[str] = LaneQueue(LANES, sources=SOURCES)
+    for i in range(4):
+        q.put_nowait(f"c{i}", "console")
+    q.put_nowait("m0", "mqtt")
+    for i in range(2):
+        q.put_nowait(f"u{i}", "ui")
+    order = [q.get_nowait() for _ in range(q.qsize())]
+    assert order == ["c0", "c1", "m0", "u0", "c2", "c3", "u1"]
+    assert q.empty()
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+
+
+def test_shedding_policies() -> None:
+    q: LaneQueue[str] = LaneQueue(LANES, sources=SOURCES)
+    for i in range(5):
+        q.put_nowait(f"u{i}", "ui")
+    assert q.depths() == {"console": 0, "automation": 0, "ui": 3}
+    assert q.dropped() == {"console": 0, "automation": 0, "ui": 2}
+    q.put_nowait("m0", None)
+    q.put_nowait("m1", None)
+    with pytest.raises(asyncio.QueueFull):
+        q.put_nowait("m2", None)
+    assert [q.get_nowait() for _ in range(q.qsize())] == ["m0", "u2", "m1", "u3", "u4"]
+
+
+async def test_blocking_lane_waits_for_room() -> None:
+    q: LaneQueue[str] = LaneQueue(LANES, sources=SOURCES)
+    q.put_nowait("m0", "mqtt")
+    q.put_nowait("m1", "mqtt")
+    waiter = asyncio.create_task(q.put("m2", "mqtt"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert await q.get() == "m0"
+    await asyncio.wait_for(waiter, 1)
+    assert q.depths()["automation"] == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_sheds_ui_and_reports_lanes() -> None:
+    async def noop(state: dict) -> None:
+        return None
+
+    engine = Engine(publish_state_cb=noop, broadcast_state_cb=noop, persist_state_cb=noop, queue_limit=8)
+    # queue_limit 8 -> console 2, automation 2, ui 4
+    for i in range(6):
+        await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="ui", r=i, g=0, b=0, ts=None))
+    await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="console", r=99, g=0, b=0, ts=None))
+    assert engine.lane_depths() == {"console": 1, "automation": 0, "ui": 4}
+    assert engine.lane_dropped()["ui"] == 2 and engine.metrics.dropped == 2
+    task = asyncio.create_task(engine.run())
+    try:
+        await asyncio.sleep(0.05)
+        # console was served first and was submitted last: the older UI values are skipped
+        assert engine.state["r"] == 99 and engine.queue_empty()
+        assert engine.metrics.processed == 1 and engine.metrics.coalesced == 4
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+def test_entries_carry_enqueue_sequence() -> None:
+    q: LaneQueue[str] = LaneQueue(LANES, sources=SOURCES)
+    q.put_nowait("u0", "ui")
+    q.put_nowait("c0", "console")
+    # console is served first, but the sequence still says u0 came first
+    assert q.get_entry_nowait() == (2, "c0")
+    assert q.get_entry_nowait() == (1, "u0")
+
+
+@pytest.mark.asyncio
+async def test_engine_coalesce_is_last_write_wins_across_lanes() -> None:
+    async def noop(state: dict) -> None:
+        return None
+
+    engine = Engine(publish_state_cb=noop, broadcast_state_cb=noop, persist_state_cb=noop, coalesce=True)
+    await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="ui", r=1, g=0, b=0, ts=None))
+    await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src="console", r=9, g=0, b=0, ts=None))
+    task = asyncio.create_task(engine.run())
+    try:
+        await asyncio.sleep(0.05)
+        # the console command is drained first but was submitted last: it wins
+        assert engine.state["r"] == 9 and engine.metrics.coalesced == 1
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_engine_per_command_is_last_write_wins_across_lanes() -> None:
+    applied: list[int] = []
+
+    async def record(state: dict) -> None:
+        applied.append(int(state["r"]))
+
+    async def noop(state: dict) -> None:
+        return None
+
+    engine = Engine(publish_state_cb=record, broadcast_state_cb=noop, persist_state_cb=noop)
+    # submission order: ui 1, console 2, ui 3, console 4; dequeue order: console 2, 4, ui 1, 3
+    for r, src in ((1, "ui"), (2, "console"), (3, "ui"), (4, "console")):
+        await engine.submit(RGBCommand(schema=CMD_SCHEMA, cmdId=new_ulid(), src=src, r=r, g=0, b=0, ts=None))
+    task = asyncio.create_task(engine.run())
+    try:
+        await asyncio.sleep(0.05)
+        assert engine.queue_empty()
+        # ui 1 and ui 3 were submitted before console 4 and must not overwrite it
+        assert applied == [2, 4] and engine.state["r"] == 4
+        assert engine.metrics.coalesced == 2
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
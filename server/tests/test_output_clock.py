@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from server.dmx.output_clock import OutputClock
+from server.drivers.ola_universe import OLAMetrics, OLAUniverseManager
+from server.util.metrics import CoreMetrics
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_burst_is_coalesced_and_trailing_frame_is_sent():
+    calls: list[tuple[str, list[str]]] = []
+
+    def fake_post(url: str, data: dict[str, str]) -> None:
+        calls.append((data["u"], data["d"].split(",")))
+
+    metrics = CoreMetrics()
+    mgr = OLAUniverseManager(base_url="http://ola.local", fps=44, http_post=fake_post, metrics=OLAMetrics({}, {}, {}, {}))
+    clock = OutputClock(fps=50, metrics=metrics)
+    mgr.attach_clock(clock)
+    task = asyncio.create_task(clock.run())
+    try:
+        # a fader burst inside one frame: only the first and the final value go out
+        for val in range(1, 11):
+            mgr.apply_patch(0, [{"ch": 1, "val": val}])
+            mgr.apply_patch(1, [{"ch": 2, "val": val}])
+            await mgr.maybe_send(0)
+            await mgr.maybe_send(1)
+        await asyncio.sleep(0.1)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    per_uni = {u: [d for uu, d in calls if uu == u] for u in ("0", "1")}
+    assert len(per_uni["0"]) <= 2 and len(per_uni["1"]) <= 2
+    assert per_uni["0"][-1][0] == "10"
+    assert per_uni["1"][-1][1] == "10"
+    assert metrics.output_frames_total == len(calls)
+
+
+async def test_clock_sends_each_dirty_universe_once_per_frame():
+    sent: list[int] = []
+
+    async def sink(universe: int) -> None:
+        sent.append(universe)
+
+    clock = OutputClock(fps=1000)
+    clock.add_sink(sink)
+    clock.mark_dirty(3)
+    clock.mark_dirty(3)
+    clock.mark_dirty(1)
+    assert await clock.tick() == 2
+    assert sent == [1, 3]
+    assert await clock.tick() == 0 and clock.pending() == set()
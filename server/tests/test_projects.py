@@ -8,6 +8,7 @@ from typing import Any
 import pytest
 
 from server.config import Settings
+from server.dmx.engine import DMXEngine
 from server.context import AppContext
 from server.engine import Engine
 from server.persistence.dedupe import CommandDeduplicator
@@ -15,6 +16,7 @@ from server.persistence.projects import ProjectsStore
 from server.persistence.scenes import ScenesStore
 from server.persistence.show import ShowStore
 from server.persistence.store import StateStore, RGBState
+from server.persistence.universes import UniverseStore
 from server.services.projects import switch_active_project, create_project_backup, restore_backup
 from server.backups.local import LocalBackupClient
 from server.services.data import load_scenes, load_show_snapshot
@@ -103,6 +105,67 @@ async def test_switch_active_project(tmp_path: Path) -> None:
     assert len(context.scenes) == 1
 
 
+@pytest.mark.anyio("asyncio")
+async def test_switch_reopens_universe_store(tmp_path: Path) -> None:
+    context = await build_context(tmp_path)
+    assert context.projects_store is not None
+    assert context.projects_index is not None
+    assert context.project_paths is not None
+    old_path = context.project_paths.state_path.parent / "universes.bin"
+    context.universe_store = UniverseStore(old_path)
+    context.universe_store.open()
+    context.universe_store_task = asyncio.create_task(context.universe_store.run(context.dmx, interval_s=60))
+    context.dmx.apply_local_patch(1, [{"ch": 1, "val": 200}])
+
+    new = await context.projects_store.create_project(
+        context.projects_index, name="Show B", venue=None, event_date=None, notes=None, template_id=None
+    )
+    new_path = context.projects_store.paths_for(new.id).state_path.parent / "universes.bin"
+    seeded = DMXEngine()
+    seeded.apply_local_patch(2, [{"ch": 5, "val": 77}])
+    seed_store = UniverseStore(new_path)
+    seed_store.open()
+    seed_store.sync(seeded)
+    seed_store.close()
+
+    sent: list[dict[str, Any]] = []
+    patched: list[tuple[int, list[dict[str, int]]]] = []
+
+    async def capture(payload: dict[str, Any]) -> None:
+        sent.append(payload)
+
+    class FakeOla:
+        def apply_patch(self, universe: int, delta: list[dict[str, int]]) -> None:
+            patched.append((universe, delta))
+
+        async def maybe_send(self, universe: int) -> None:
+            return None
+
+    context.hub.send_payload = capture  # type: ignore[method-assign]
+    context.ola_manager = FakeOla()  # type: ignore[assignment]
+
+    await switch_active_project(context, new.id)
+    try:
+        # hardware and WS clients see the released and restored channels
+        assert [(m["universe"], m["delta"]) for m in sent] == [
+            (1, [{"ch": 1, "val": 0}]), (2, [{"ch": 5, "val": 77}]),
+        ]
+        assert patched == [(1, [{"ch": 1, "val": 0}]), (2, [{"ch": 5, "val": 77}])]
+        assert context.universe_store is not None and context.universe_store.path == new_path
+        assert context.universe_store_task is not None and not context.universe_store_task.done()
+        # outgoing programmer values are released, the new project's are restored
+        assert context.dmx.channel(1, 1) == 0
+        assert context.dmx.channel(2, 5) == 77
+        old = UniverseStore(old_path)
+        old.open()
+        restored = DMXEngine()
+        assert old.restore(restored) == [1] and restored.channel(1, 1) == 200
+        old.close()
+    finally:
+        context.universe_store_task.cancel()
+        await asyncio.gather(context.universe_store_task, return_exceptions=True)
+
+
 @pytest.mark.anyio("asyncio")
 async def test_create_and_restore_backup(tmp_path: Path) -> None:
     context = await build_context(tmp_path)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from server.persistence.store import StateStore
+from server.util.metrics import CoreMetrics
+
+
+def _state(seq: int) -> dict:
+    return {"schema": "demo.rgb.state.v1", "r": seq, "g": 0, "b": 0, "seq": seq, "updatedBy": "ui", "ts": seq}
+
+
+async def test_write_behind_coalesces_and_flushes(tmp_path: Path) -> None:
+    metrics = CoreMetrics()
+    path = tmp_path / "state.json"
+    store = StateStore(path, debounce_ms=50, metrics=metrics)
+    for seq in range(1, 61):
+        await store.save(_state(seq))  # type: ignore[arg-type]
+    assert not path.exists()
+    # reads see the pending state before it hits the disk
+    assert (await store.load())["seq"] == 60  # type: ignore[index]
+    await asyncio.sleep(0.15)
+    assert json.loads(path.read_text("utf-8"))["seq"] == 60
+    assert metrics.persist_writes_total == 1
+    assert metrics.persist_bytes_total == path.stat().st_size
+    assert metrics.persist_lag_ms.total == 1
+
+    await store.save(_state(61))  # type: ignore[arg-type]
+    await store.aclose()
+    assert json.loads(path.read_text("utf-8"))["seq"] == 61
+    assert metrics.persist_writes_total == 2
+    assert not (tmp_path / "state.json.tmp").exists()
+
+
+async def test_immediate_mode_writes_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "state.json"
+    store = StateStore(path, fsync=True)
+    await store.save(_state(1))  # type: ignore[arg-type]
+    assert json.loads(path.read_text("utf-8"))["seq"] == 1
+    assert sorted(p.name for p in path.parent.iterdir()) == ["state.json"]
+    assert (await StateStore(path).load())["seq"] == 1  # type: ignore[index]
+
+
+async def test_save_during_slow_write_is_flushed(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = StateStore(path, debounce_ms=10)
+    release = asyncio.Event()
+    writing = asyncio.Event()
+    original = store._write
+
+    async def slow_write(state: dict, since: float) -> None:
+        writing.set()
+        await release.wait()
+        await original(state, since)
+
+    store._write = slow_write  # type: ignore[method-assign]
+    await store.save(_state(1))  # type: ignore[arg-type]
+    await asyncio.wait_for(writing.wait(), 1)
+    await store.save(_state(2))  # type: ignore[arg-type]
+    release.set()
+    await asyncio.sleep(0.1)
+    # no further save: the flusher must still pick up seq 2 on its own
+    assert json.loads(path.read_text("utf-8"))["seq"] == 2
+    await store.aclose()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from server.dmx.engine import DMXEngine
+from server.dmx.layers import LAYER_PLAYBACK, LAYER_SUBMASTERS
+from server.dmx.scenes import channel_map
+from server.dmx.submasters import SubmasterEngine, compile_submasters
+
+SHOW = {
+    "universes": [{"id": "u", "number": 1}],
+    "fixtures": [
+        {"id": "par", "universeId": "u", "dmxAddress": 1, "channels": [{"id": "dim", "number": 1}, {"id": "pan", "number": 2}]},
+    ],
+}
+SCENES = [
+    {"id": "s1", "name": "One", "timestamp": 1, "channelValues": {"dim": 200, "pan": 40}},
+    {"id": "s2", "name": "Two", "timestamp": 1, "channelValues": {"dim": 100, "pan": 220}},
+]
+SUBMASTERS = [{"id": "a", "sceneId": "s1"}, {"id": "b", "sceneId": "s2", "level": 1}]
+
+
+def _engine() -> SubmasterEngine:
+    eng = SubmasterEngine()
+    eng.load(*compile_submasters(SUBMASTERS, SCENES, channel_map(SHOW)))
+    return eng
+
+
+def test_htp_and_ltp_blend() -> None:
+    eng = _engine()
+    ltp = np.zeros(512, dtype=bool)
+    ltp[1] = True  # pan
+    values, mask = eng.compose(lambda uni: ltp)[1]
+    assert values[0] == 100 and values[1] == 220 and mask[:2].all() and mask.sum() == 2
+    assert eng.set_level("a", 0.75) and not eng.set_level("zzz", 1)
+    values, _ = eng.compose(lambda uni: ltp)[1]
+    # dim: max(200 * 0.75, 100 * 1); pan: "a" moved last and holds it unscaled
+    assert values[0] == 150 and values[1] == 40
+    eng.set_level("b", 0.5)
+    values, _ = eng.compose(lambda uni: ltp)[1]
+    assert values[0] == 150 and values[1] == 220
+    assert eng.set_level("b", 0) and eng.set_level("a", 2)
+    assert eng.state()[0]["level"] == 1.0
+    values, _ = eng.compose(lambda uni: ltp)[1]
+    assert values[0] == 200 and values[1] == 40
+    eng.set_level("a", 0)
+    values, mask = eng.compose()[1]
+    assert not mask.any() and not values.any()
+    assert eng.compose() == {}
+
+
+def test_reload_keeps_levels() -> None:
+    eng = _engine()
+    eng.set_level("a", 0.5)
+    eng.load(*compile_submasters(SUBMASTERS + [{"id": "c", "sceneId": "s1", "level": 0.2}], SCENES, channel_map(SHOW)))
+    assert [s["level"] for s in eng.state()] == [0.5, 1.0, pytest.approx(0.2)]
+
+
+async def test_run_writes_submaster_layer() -> None:
+    dmx = DMXEngine()
+    eng = _engine()
+    sent = []
+
+    async def broadcast(payload):
+        sent.append(payload)
+
+    task = asyncio.create_task(eng.run(
+        apply_frame=lambda uni, frame, mask: dmx.apply_layer_frame(uni, LAYER_SUBMASTERS, frame, mask),
+        broadcast=broadcast,
+        ltp_for=dmx.ltp_mask,
+    ))
+    try:
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if dmx.channel(1, 1) == 100:
+                break
+        assert dmx.channel(1, 1) == 100 and dmx.channel(1, 2) == 220
+        # the submaster layer sits above cue playbacks
+        dmx.apply_layer_patch(1, LAYER_PLAYBACK, [{"ch": 2, "val": 9}])
+        assert dmx.channel(1, 2) == 220
+        eng.set_level("b", 0)
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if dmx.channel(1, 1) == 0:
+                break
+        assert dmx.channel(1, 1) == 0 and dmx.channel(1, 2) == 9
+        assert sent
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_submaster_commands_via_rest(test_app: tuple) -> None:
+    app, context, _ = test_app
+    with TestClient(app) as client:
+        body = {**SHOW, "scenes": SCENES, "submasters": SUBMASTERS}
+        assert client.post("/import", json=body).status_code == 200
+        ack = client.post("/command", json={"type": "submaster.level", "id": "s-1", "ts": 0, "submaster": "a", "level": 0.5}).json()
+        assert ack["accepted"] is True
+        assert [s["level"] for s in client.get("/submasters").json()] == [0.5, 1.0]
+        ack = client.post("/command", json={"type": "submaster.level", "id": "s-2", "ts": 0, "submaster": "x", "level": 1}).json()
+        assert ack["accepted"] is False and ack["reason"] == "not_found"
+        ack = client.post("/command", json={"type": "submaster.level", "id": "s-3", "ts": 0, "submaster": "a", "level": 3}).json()
+        assert ack["accepted"] is False
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from server.dmx.engine import DMXEngine
+from server.dmx.layers import LAYER_PARKED, LAYER_PLAYBACK
+from server.persistence.universes import UniverseStore
+
+
+def test_roundtrip_restores_operator_layers(tmp_path: Path) -> None:
+    path = tmp_path / "universes.bin"
+    dmx = DMXEngine()
+    dmx.apply_patch(0, [{"ch": 1, "val": 200}, {"ch": 2, "val": 0}])
+    dmx.apply_layer_patch(3, LAYER_PARKED, [{"ch": 10, "val": 42}])
+    dmx.apply_layer_patch(3, LAYER_PLAYBACK, [{"ch": 11, "val": 99}])
+    store = UniverseStore(path, capacity=1)  # forces a grow
+    store.open()
+    assert store.sync(dmx) and not store.sync(dmx)
+    store.close()
+
+    fresh = DMXEngine()
+    reopened = UniverseStore(path)
+    reopened.open()
+    assert reopened.capacity == 2 and reopened.rev == dmx.rev
+    assert reopened.restore(fresh) == [0, 3]
+    assert fresh.frame(0) == dmx.frame(0)
+    assert fresh.channel(3, 10) == 42
+    # generated layers are not persisted
+    assert fresh.channel(3, 11) == 0
+    # hold flags survive: channel 2 is held at 0 by the programmer
+    assert fresh.layer_state(0, "local")[1][:3].tolist() == [True, True, False]
+    reopened.close()
+
+
+def test_incompatible_file_is_recreated(tmp_path: Path) -> None:
+    path = tmp_path / "universes.bin"
+    path.write_bytes(b"garbage")
+    store = UniverseStore(path)
+    store.open()
+    assert store.universes() == [] and store.restore(DMXEngine()) == []
+    store.close()
+    assert path.read_bytes()[:4] == b"DMXU"
+
+
+def test_restore_64_universes_is_fast(tmp_path: Path) -> None:
+    path = tmp_path / "universes.bin"
+    dmx = DMXEngine()
+    frame = bytes(range(256)) * 2
+    for uni in range(64):
+        dmx.apply_layer_frame(uni, "local", frame)
+    store = UniverseStore(path)
+    store.open()
+    store.sync(dmx)
+    store.close()
+    fresh = DMXEngine()
+    start = time.perf_counter()
+    reopened = UniverseStore(path)
+    reopened.open()
+    assert len(reopened.restore(fresh)) == 64
+    assert (time.perf_counter() - start) < 0.5
+    assert fresh.frame(63) == frame
+    reopened.close()
+
+
+async def test_run_writes_behind_and_closes(tmp_path: Path) -> None:
+    dmx = DMXEngine()
+    store = UniverseStore(tmp_path / "universes.bin")
+    store.open()
+    task = asyncio.create_task(store.run(dmx, interval_s=0.01))
+    dmx.apply_patch(1, [{"ch": 5, "val": 7}])
+    await asyncio.sleep(0.05)
+    assert store.universes() == [0, 1]
+    dmx.apply_patch(1, [{"ch": 6, "val": 8}])
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    fresh = DMXEngine()
+    reopened = UniverseStore(tmp_path / "universes.bin")
+    reopened.open()
+    reopened.restore(fresh)
+    assert fresh.channel(1, 6) == 8
+    reopened.close()
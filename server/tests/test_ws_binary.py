@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import websockets
+
+from server.util.statebin import (
+    KIND_BITMAP,
+    KIND_FULL,
+    KIND_PAIRS,
+    KIND_RUNS,
+    MAX_UNIVERSE,
+    SUBPROTOCOL,
+    decode,
+    encode_state_update,
+)
+from server.ws_hub import WSHub
+
+
+def _update(delta: dict[int, int], full: bool = False) -> dict:
+    return {
+        "type": "state.update", "rev": 42, "ts": 1_700_000_000_000, "universe": 3,
+        "delta": [{"ch": ch, "val": val} for ch, val in delta.items()], "full": full,
+    }
+
+
+@pytest.mark.parametrize(
+    ("delta", "kind"),
+    [
+        ({1: 7, 200: 9, 512: 255}, KIND_PAIRS),  # sparse: 3 bytes per channel
+        ({ch: ch % 256 for ch in range(10, 110)}, KIND_RUNS),  # one contiguous run
+        ({ch: 1 for ch in range(1, 513, 3)}, KIND_BITMAP),  # scattered and dense
+        ({ch: ch % 256 for ch in range(1, 513)}, KIND_FULL),
+    ],
+)
+def test_roundtrip_picks_smallest_encoding(delta: dict[int, int], kind: int) -> None:
+    full = len(delta) == 512
+    message = _update(delta, full=full)
+    blob = encode_state_update(message)
+    assert blob[0] == kind
+    assert decode(blob) == message
+    assert len(blob) < len(json.dumps(message))
+
+
+def test_full_snapshot_is_header_plus_raw_frame() -> None:
+    blob = encode_state_update(_update({ch: 0 for ch in range(1, 513)}, full=True))
+    assert len(blob) == 20 + 512
+
+
+class BinaryWS:
+    def __init__(self) -> None:
+        self.client = SimpleNamespace(host="10.0.0.1", port=1)
+        self.scope = {"subprotocols": [SUBPROTOCOL]}
+        self.sent: list[Any] = []
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        pass
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_universe_beyond_header_falls_back_to_json() -> None:
+    with pytest.raises(ValueError):
+        encode_state_update({**_update({1: 1}), "universe": MAX_UNIVERSE + 1})
+    hub = WSHub()
+    ws = BinaryWS()
+    assert await hub.register(ws)  # type: ignore[arg-type]
+    await hub.send_payload({**_update({1: 1}), "universe": 70_000})
+    await hub.send_payload(_update({1: 2}))
+    while len(ws.sent) < 2:
+        await asyncio.sleep(0.001)
+    assert ws.sent[0]["universe"] == 70_000
+    assert decode(ws.sent[1])["universe"] == 3
+    await hub.unregister(ws)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_ws_binary_subprotocol_end_to_end(live_server_url: str) -> None:
+    uri = live_server_url.replace("http", "ws") + "/ws?token=demo-key"
+    async with websockets.connect(uri, subprotocols=[SUBPROTOCOL], ping_timeout=5) as ws:
+        assert ws.subprotocol == SUBPROTOCOL
+        legacy = json.loads(await asyncio.wait_for(ws.recv(), timeout=3))
+        assert legacy["type"] == "state"
+        # initial snapshots arrive as binary FULL frames
+        while True:
+            try:
+                msg = await asyncio.wait_for(ws.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                break
+            assert isinstance(msg, bytes) and decode(msg)["full"] is True
+        await ws.send(json.dumps({"type": "dmx.patch", "id": "bin-1", "ts": 0, "universe": 0, "patch": [{"ch": 5, "val": 99}]}))
+        update = None
+        while update is None:
+            msg = await asyncio.wait_for(ws.recv(), timeout=2)
+            if isinstance(msg, str):
+                continue  # acks and legacy state stay JSON
+            decoded = decode(msg)
+            if {"ch": 5, "val": 99} in decoded["delta"]:
+                update = decoded
+        assert update["universe"] == 0 and update["full"] is False
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from server.dmx.engine import DMXEngine
+from server.util.jsonenc import dumps
+from server.util.metrics import CoreMetrics
+from server.ws_hub import CLOSE_SLOW_CLIENT, SnapshotCache, WSHub
+
+
+class FakeWS:
+    def __init__(self, port: int, gate: asyncio.Event | None = None) -> None:
+        self.client = SimpleNamespace(host="10.0.0.1", port=port)
+        self.gate = gate
+        self.sent: list[dict[str, Any]] = []
+        self.closed: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = code
+
+
+def _update(universe: int, rev: int, delta: dict[int, int], full: bool = False) -> dict[str, Any]:
+    return {
+        "type": "state.update", "rev": rev, "ts": rev, "universe": universe,
+        "delta": [{"ch": ch, "val": val} for ch, val in delta.items()], "full": full,
+    }
+
+
+async def test_pending_updates_merge_per_universe() -> None:
+    metrics = CoreMetrics()
+    hub = WSHub(metrics=metrics)
+    gate = asyncio.Event()
+    ws = FakeWS(1, gate)
+    await hub.register(ws)  # type: ignore[arg-type]
+    await hub.send_payload(_update(0, 1, {1: 10}))
+    while hub.client_stats()[0]["queueDepth"]:
+        await asyncio.sleep(0)  # the writer picks rev 1 and blocks on the socket
+    await hub.send_payload(_update(0, 2, {1: 20, 2: 5}))
+    await hub.send_payload({"type": "cue.status", "id": "c1"})
+    await hub.send_payload(_update(1, 3, {7: 1}))
+    await hub.send_payload(_update(0, 4, {2: 6}))
+    assert hub.client_stats()[0]["queueDepth"] == 3
+    gate.set()
+    while len(ws.sent) < 4:
+        await asyncio.sleep(0.001)
+    # merged into the queued rev 2, keeping its place and its (earliest) rev
+    assert [m.get("rev") for m in ws.sent] == [1, 2, None, 3]
+    assert ws.sent[1]["delta"] == [{"ch": 1, "val": 20}, {"ch": 2, "val": 6}]
+    assert metrics.ws_merged_total == 1
+    assert metrics.ws_send_lag_ms.total == 4
+    await hub.unregister(ws)  # type: ignore[arg-type]
+
+
+async def test_slow_client_is_dropped_without_stalling_others() -> None:
+    metrics = CoreMetrics()
+    hub = WSHub(send_timeout=0.05, metrics=metrics)
+    slow = FakeWS(1, asyncio.Event())
+    fast = FakeWS(2)
+    await hub.register(slow)  # type: ignore[arg-type]
+    await hub.register(fast)  # type: ignore[arg-type]
+    for rev in range(1, 4):
+        await asyncio.wait_for(hub.send_state({"r": rev, "g": 0, "b": 0, "seq": rev, "ts": rev}), 0.01)
+        await asyncio.sleep(0.005)
+    assert [m["seq"] for m in fast.sent if m["type"] == "state"] == [1, 2, 3]
+    await asyncio.sleep(0.1)
+    assert slow.closed == CLOSE_SLOW_CLIENT
+    assert await hub.count() == 1
+    assert metrics.ws_slow_disconnects_total == {"send": 1}
+    await hub.unregister(fast)  # type: ignore[arg-type]
+
+
+class DroppingWS(FakeWS):
+    """Connection that breaks after ``limit`` messages."""
+
+    def __init__(self, port: int, gate: asyncio.Event, limit: int) -> None:
+        super().__init__(port, gate)
+        self.limit = limit
+
+    async def send_text(self, text: str) -> None:
+        if len(self.sent) >= self.limit:
+            raise ConnectionError("gone")
+        await super().send_text(text)
+
+
+async def test_resume_from_highest_rev_after_mid_queue_disconnect() -> None:
+    dmx = DMXEngine()
+    dmx.apply_patch(0, [{"ch": 1, "val": 1}])
+    dmx.apply_patch(1, [{"ch": 1, "val": 1}])
+    # the client is in sync up to here
+    view = {uni: {1: 1} for uni in (0, 1)}
+    hub = WSHub()
+    gate = asyncio.Event()
+    ws = DroppingWS(1, gate, limit=2)
+    await hub.register(ws)  # type: ignore[arg-type]
+
+    async def patch(uni: int, ch: int, val: int) -> None:
+        delta, rev, ts = dmx.apply_patch(uni, [{"ch": ch, "val": val}])
+        await hub.send_payload({"type": "state.update", "rev": rev, "ts": ts, "universe": uni, "delta": delta, "full": False})
+
+    await patch(0, 1, 10)
+    while hub.client_stats()[0]["queueDepth"]:
+        await asyncio.sleep(0)
+    await patch(0, 2, 20)
+    await patch(1, 1, 30)
+    await patch(0, 3, 40)  # merges into the queued universe 0 update
+    gate.set()
+    while ws.closed is None:
+        await asyncio.sleep(0.001)
+    assert len(ws.sent) == 2  # dropped before the universe 1 update went out
+    for msg in ws.sent:
+        view[msg["universe"]].update({it["ch"]: it["val"] for it in msg["delta"]})
+    since = max(msg["rev"] for msg in ws.sent)
+    for uni in (0, 1):
+        missed = dmx.deltas_since(uni, since)
+        assert missed is not None
+        view[uni].update({it["ch"]: it["val"] for it in missed})
+        assert view[uni] == {ch: dmx.channel(uni, ch) for ch in view[uni]}
+    assert view[1] == {1: 30}
+
+
+async def test_full_queue_sheds_state_then_events_never_acks() -> None:
+    metrics = CoreMetrics()
+    hub = WSHub(send_timeout=5, max_queue=3, metrics=metrics)
+    gate = asyncio.Event()
+    ws = FakeWS(1, gate)
+    await hub.register(ws)  # type: ignore[arg-type]
+    await hub.send_payload({"type": "cue.status", "id": "in-flight"})
+    while hub.client_stats()[0]["queueDepth"]:
+        await asyncio.sleep(0)
+    await hub.send_payload({"ack": "a1", "accepted": True})
+    await hub.send_payload(_update(0, 1, {1: 1}))
+    await hub.send_payload({"type": "cue.status", "id": "c0"})
+    # full: the state update is set aside first, then the oldest events go
+    for i in range(1, 3):
+        await hub.send_payload({"type": "cue.status", "id": f"c{i}"})
+    await hub.send_payload(_update(0, 2, {2: 2}))  # merges into the set-aside update
+    await hub.send_payload(_update(1, 3, {1: 3}))
+    assert metrics.ws_dropped_total == 3
+    gate.set()
+    while len(ws.sent) < 5:
+        await asyncio.sleep(0.001)
+    # the set-aside update (rev 1) still goes out before the higher rev 3
+    assert [m.get("ack") or m.get("id") or m.get("rev") for m in ws.sent] == ["in-flight", "a1", "c2", 1, 3]
+    assert ws.sent[3]["delta"] == [{"ch": 1, "val": 1}, {"ch": 2, "val": 2}]
+
+
+async def test_set_aside_state_is_sent_once_the_queue_drains() -> None:
+    hub = WSHub(send_timeout=5, max_queue=2)
+    gate = asyncio.Event()
+    ws = FakeWS(1, gate)
+    await hub.register(ws)  # type: ignore[arg-type]
+    await hub.send_payload({"type": "cue.status", "id": "in-flight"})
+    while hub.client_stats()[0]["queueDepth"]:
+        await asyncio.sleep(0)
+    await hub.send_payload(_update(0, 1, {1: 1}))
+    await hub.send_payload({"type": "cue.status", "id": "c0"})
+    await hub.send_payload({"type": "cue.status", "id": "c1"})
+    gate.set()
+    while len(ws.sent) < 4:
+        await asyncio.sleep(0.001)
+    assert [m.get("id") or m.get("rev") for m in ws.sent] == ["in-flight", "c0", "c1", 1]
+
+
+async def test_full_queue_disconnects_after_budget() -> None:
+    metrics = CoreMetrics()
+    hub = WSHub(send_timeout=5, max_queue=2, metrics=metrics)
+    ws = FakeWS(1, asyncio.Event())
+    await hub.register(ws)  # type: ignore[arg-type]
+    for i in range(4):
+        await hub.send_payload({"type": "cue.status", "id": f"c{i}"})
+    assert ws.closed is None
+    # still full once the budget has passed: disconnect
+    client = hub._clients[ws]  # type: ignore[index]
+    client._full_since -= 10
+    await hub.send_payload({"type": "cue.status", "id": "late"})
+    await asyncio.sleep(0)
+    assert ws.closed == CLOSE_SLOW_CLIENT
+    assert await hub.count() == 0
+    assert metrics.ws_slow_disconnects_total == {"queue": 1}
+
+
+async def test_broadcast_reaches_only_subscribed_clients() -> None:
+    hub = WSHub()
+    everything, desk, lights = FakeWS(1), FakeWS(2), FakeWS(3)
+    await hub.register(everything)  # type: ignore[arg-type]
+    await hub.register(desk, universes=[0, 1])  # type: ignore[arg-type]
+    await hub.register(lights, universes=[2], types=["state.update"])  # type: ignore[arg-type]
+    for uni in range(3):
+        await hub.send_payload(_update(uni, uni + 1, {1: uni}))
+    await hub.send_payload({"type": "cue.status", "id": "c1"})
+    await asyncio.sleep(0.01)
+    assert [m.get("universe") for m in everything.sent] == [0, 1, 2, None]
+    assert [m.get("universe") for m in desk.sent] == [0, 1, None]
+    assert [m.get("universe") for m in lights.sent] == [2]
+
+    assert hub.subscribe(desk, universes=[1, 2]) == {2}  # type: ignore[arg-type]
+    hub.unsubscribe(everything, universes=[0], known_universes=[0, 1, 2])  # type: ignore[arg-type]
+    hub.unsubscribe(lights, universes=[2])  # type: ignore[arg-type]
+    assert hub.subscription(everything) == ({1, 2}, None)  # type: ignore[arg-type]
+    await hub.send_payload(_update(0, 9, {1: 9}))
+    await hub.send_payload(_update(2, 10, {1: 10}))
+    await asyncio.sleep(0.01)
+    assert [m.get("rev") for m in everything.sent[4:]] == [10]
+    assert [m.get("rev") for m in desk.sent[3:]] == [9, 10]
+    assert lights.sent[1:] == []
+    await hub.unregister(desk)  # type: ignore[arg-type]
+    assert hub.subscription(desk) == (None, None)  # type: ignore[arg-type]
+    assert hub.subscription(lights) == (set(), {"state.update"})  # type: ignore[arg-type]
+    await hub.send_payload(_update(1, 11, {1: 11}))
+    await asyncio.sleep(0.01)
+    assert [m.get("rev") for m in everything.sent[5:]] == [11]
+    assert desk.sent[5:] == [] and lights.sent[1:] == []
+    for ws in (everything, lights):
+        await hub.unregister(ws)  # type: ignore[arg-type]
+    assert await hub.count() == 0
+    assert hub.subscription(everything) == (None, None)  # type: ignore[arg-type]
+
+
+async def test_rgb_mirror_carries_the_dmx_rev() -> None:
+    hub = WSHub()
+    hub.dmx = DMXEngine()
+    hub.dmx.apply_patch(3, [{"ch": 1, "val": 1}])
+    ws = FakeWS(1)
+    await hub.register(ws)  # type: ignore[arg-type]
+    await hub.send_state({"r": 7, "g": 0, "b": 0, "seq": 42, "ts": 1})
+    while len(ws.sent) < 2:
+        await asyncio.sleep(0.001)
+    assert ws.sent[0]["seq"] == 42
+    # not the RGB seq: a client resuming from it must land on a real DMX rev
+    assert ws.sent[1]["rev"] == hub.dmx.rev == 1
+    await hub.unregister(ws)  # type: ignore[arg-type]
+
+
+async def test_rate_window_flushes_last_values_per_channel() -> None:
+    metrics = CoreMetrics()
+    hub = WSHub(ui_hz=20, metrics=metrics)
+    ui, raw = FakeWS(1), FakeWS(2)
+    await hub.register(ui)  # type: ignore[arg-type]
+    await hub.register(raw, hz=0)  # type: ignore[arg-type]
+    for rev in range(1, 6):
+        await hub.send_payload(_update(0, rev, {1: rev, 2: 100}))
+        await hub.send_state({"r": rev, "g": 0, "b": 0, "seq": rev, "ts": rev})
+    await hub.send_payload(_update(1, 6, {9: 9}))
+    await asyncio.sleep(0.01)
+    assert ui.sent == []
+    # unthrottled: delivered right away (merged only because its writer had not run yet)
+    assert [m["type"] for m in raw.sent] == ["state.update", "state", "state.update"]
+    await asyncio.sleep(0.08)
+    # one window: the last value per channel (RGB mirror included), then the newest legacy state
+    assert [(m["type"], m.get("universe")) for m in ui.sent] == [
+        ("state.update", 0), ("state.update", 1), ("state", None),
+    ]
+    assert ui.sent[0]["delta"] == [{"ch": 1, "val": 5}, {"ch": 2, "val": 0}, {"ch": 3, "val": 0}]
+    # stamped with the window's earliest rev of the universe
+    assert ui.sent[0]["rev"] == 1 and ui.sent[2]["seq"] == 5
+    assert metrics.ws_coalesced_total == 13
+
+    # switching to unthrottled hands over what the window still holds
+    await hub.send_payload(_update(0, 7, {4: 4}))
+    assert hub.set_rate(ui, 0) == 0  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+    assert ui.sent[-1]["delta"] == [{"ch": 4, "val": 4}]
+    assert hub.set_rate(raw, 500) == hub.max_hz  # type: ignore[arg-type]
+    for ws in (ui, raw):
+        await hub.unregister(ws)  # type: ignore[arg-type]
+
+
+async def test_rate_window_flushes_in_rev_order() -> None:
+    hub = WSHub(ui_hz=20)
+    ui = FakeWS(1)
+    await hub.register(ui)  # type: ignore[arg-type]
+    await hub.send_payload(_update(1, 1, {1: 1}))
+    await hub.send_payload(_update(0, 2, {1: 2}))
+    await hub.send_payload(_update(1, 3, {2: 3}))
+    while len(ui.sent) < 2:
+        await asyncio.sleep(0.005)
+    # universe 1 holds the earliest change, so it goes first: a client dropped after it
+    # and resuming from rev 1 still gets universe 0's rev 2
+    assert [(m["universe"], m["rev"]) for m in ui.sent] == [(1, 1), (0, 2)]
+    assert ui.sent[0]["delta"] == [{"ch": 1, "val": 1}, {"ch": 2, "val": 3}]
+    await hub.unregister(ui)  # type: ignore[arg-type]
+
+
+def test_snapshot_cache_reuses_encoding_until_universe_changes() -> None:
+    dmx = DMXEngine()
+    dmx.apply_patch(0, [{"ch": 1, "val": 10}])
+    dmx.apply_patch(1, [{"ch": 2, "val": 20}])
+    cache = SnapshotCache()
+    first = json.loads(cache.message(dmx, 0))
+    assert first["full"] is True and first["rev"] == dmx.rev
+    assert first["delta"][0] == {"ch": 1, "val": 10} and len(first["delta"]) == 512
+    dmx.apply_patch(1, [{"ch": 2, "val": 21}])  # another universe: cache still valid
+    again = json.loads(cache.message(dmx, 0))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again["rev"] == dmx.rev and again["delta"] == first["delta"]
+    dmx.apply_patch(0, [{"ch": 1, "val": 11}])
+    assert json.loads(cache.message(dmx, 0))["delta"][0] == {"ch": 1, "val": 11}
+    assert cache.misses == 2
+
+
+def test_jsonenc_is_compact_and_falls_back_for_big_ints() -> None:
+    assert dumps({"a": [1, 2], "b": None}) == '{"a":[1,2],"b":null}'
+    assert json.loads(dumps({"big": 2**70})) == {"big": 2**70}
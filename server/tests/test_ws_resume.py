@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _initial(ws) -> tuple[dict, list[dict]]:
+    state = ws.receive_json()
+    assert state["type"] == "state"
+    updates = [ws.receive_json()]
+    return state, updates
+
+
+def test_ws_resume_replays_only_missed_channels(test_app: tuple) -> None:
+    app, context, _ = test_app
+    dmx = context.dmx
+    dmx.apply_patch(0, [{"ch": 1, "val": 1}])
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            state, updates = _initial(ws)
+            assert state["epoch"] == dmx.epoch
+            assert updates[0]["full"] is True and len(updates[0]["delta"]) == 512
+            last_rev = updates[0]["rev"]
+
+        dmx.apply_patch(0, [{"ch": 5, "val": 50}])
+        dmx.apply_patch(0, [{"ch": 5, "val": 55}, {"ch": 6, "val": 60}])
+
+        with client.websocket_connect(f"/ws?since={last_rev}&epoch={dmx.epoch}") as ws:
+            _, updates = _initial(ws)
+            assert updates[0]["full"] is False
+            assert updates[0]["rev"] == dmx.rev
+            assert updates[0]["delta"] == [{"ch": 5, "val": 55}, {"ch": 6, "val": 60}]
+
+        # a rev from another server run cannot be trusted
+        with client.websocket_connect(f"/ws?since={last_rev}&epoch={dmx.epoch - 1}") as ws:
+            _, updates = _initial(ws)
+            assert updates[0]["full"] is True
+    assert context.core.ws_resume_total == {"delta": 1}
@@ -4,6 +4,7 @@ import asyncio
 import json
 
 import pytest
+import requests
 import websockets
 
 pytestmark = pytest.mark.asyncio
@@ -67,3 +68,39 @@ async def test_ws_ack_and_state_update(live_server_url: str):
         assert upd["universe"] == 0
         assert upd.get("full") is False
         assert {"ch": 1, "val": 7} in upd.get("delta", [])
+
+
+async def test_ws_subscribe_limits_universes(live_server_url: str):
+    base = live_server_url.replace("http", "ws")
+    for uni in (0, 3):
+        requests.post(
+            f"{live_server_url}/command",
+            json={"type": "dmx.patch", "id": f"sub-seed-{uni}", "ts": 0, "universe": uni, "patch": [{"ch": 1, "val": 1}]},
+            timeout=2,
+        )
+    async with websockets.connect(base + "/ws?universes=3&types=state.update", ping_timeout=5) as ws:
+        snapshot = await _recv_json(ws, timeout=3)
+        assert snapshot["type"] == "state.update" and snapshot["universe"] == 3 and snapshot["full"] is True
+        with pytest.raises(asyncio.TimeoutError):
+            await _recv_json(ws, timeout=0.3)
+
+        await ws.send(json.dumps({"type": "subscribe", "id": "s1", "universes": [0]}))
+        ack = await _recv_json(ws)
+        assert ack == {**ack, "ack": "s1", "accepted": True, "universes": [0, 3], "types": ["state.update"]}
+        added = await _recv_json(ws)
+        assert added["universe"] == 0 and added["full"] is True
+
+        await ws.send(json.dumps({"type": "unsubscribe", "id": "s2", "universes": [3]}))
+        assert (await _recv_json(ws))["universes"] == [0]
+        requests.post(
+            f"{live_server_url}/command",
+            json={"type": "dmx.patch", "id": "sub-3", "ts": 0, "universe": 3, "patch": [{"ch": 2, "val": 2}]},
+            timeout=2,
+        )
+        requests.post(
+            f"{live_server_url}/command",
+            json={"type": "dmx.patch", "id": "sub-0", "ts": 0, "universe": 0, "patch": [{"ch": 2, "val": 5}]},
+            timeout=2,
+        )
+        update = await _recv_json(ws)
+        assert update["universe"] == 0 and {"ch": 2, "val": 5} in update["delta"]
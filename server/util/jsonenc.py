@@ -0,0 +1,35 @@
+"""JSON encoding for outbound WebSocket/MQTT payloads.
+
+Uses ``orjson`` when it is installed and falls back to the standard library.
+Both produce compact output; orjson rejects a few objects the stdlib accepts
+(e.g. integers beyond 64 bits), and those are retried with ``json``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # pragma: no cover - optional dependency handled at runtime
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _dumps_std(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as compact JSON text."""
+    if orjson is None:
+        return _dumps_std(obj)
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except TypeError:
+        return _dumps_std(obj)
+
+
+__all__ = ["BACKEND", "dumps"]
@@ -63,10 +63,32 @@ class CoreMetrics:
     # tick count and tick duration histogram
     fade_ticks_total: Dict[int, int] = field(default_factory=dict)
     fade_tick_ms_hist: Histogram = field(default_factory=Histogram)
+    fade_tick_jitter_ms: Histogram = field(default_factory=Histogram)
+    fade_ticks_missed_total: int = 0
     # queue delay histogram (per-universe)
     fade_queue_delay_ms: Dict[int, Histogram] = field(default_factory=dict)
     fades_started_total: Dict[int, int] = field(default_factory=dict)
     fades_cancelled_total: Dict[Tuple[int, str], int] = field(default_factory=dict)
+    # WS reconnect sync per universe (delta replay vs full snapshot)
+    ws_resume_total: Dict[str, int] = field(default_factory=dict)
+    # Output clock: universe frames sent and frame slots skipped after overruns
+    output_frames_total: int = 0
+    output_frames_late_total: int = 0
+    # Engine state fan-out, per sink (persist, mqtt, ws, output)
+    sink_lag_ms: Dict[str, Histogram] = field(default_factory=dict)
+    sink_dropped_total: Dict[str, int] = field(default_factory=dict)
+    sink_errors_total: Dict[str, int] = field(default_factory=dict)
+    sink_queue_depth: Dict[str, int] = field(default_factory=dict)
+    # WS per-client writers: enqueue -> send lag, merged/dropped messages, slow-client disconnects
+    ws_send_lag_ms: Histogram = field(default_factory=Histogram)
+    ws_merged_total: int = 0
+    ws_coalesced_total: int = 0
+    ws_dropped_total: int = 0
+    ws_slow_disconnects_total: Dict[str, int] = field(default_factory=dict)
+    # State persistence: change -> file write lag, bytes written
+    persist_lag_ms: Histogram = field(default_factory=Histogram)
+    persist_bytes_total: int = 0
+    persist_writes_total: int = 0
 
     def set_fade_active(self, universe: int, n: int) -> None:
         self.fade_active[universe] = max(0, int(n))
@@ -75,6 +97,10 @@ class CoreMetrics:
     def inc_fade_tick(self, universe: int, ms: int) -> None:
         self.fade_ticks_total[universe] = self.fade_ticks_total.get(universe, 0) + 1
         self.fade_tick_ms_hist.observe(max(0, int(ms)))
+    def observe_fade_tick_jitter(self, ms: int) -> None:
+        self.fade_tick_jitter_ms.observe(max(0, int(ms)))
+    def inc_fade_ticks_missed(self, count: int = 1) -> None:
+        self.fade_ticks_missed_total += max(0, int(count))
     def inc_fades_started(self, universe: int, count: int = 1) -> None:
         self.fades_started_total[universe] = self.fades_started_total.get(universe, 0) + max(0, int(count))
     def inc_fades_cancelled(self, universe: int, reason: str, count: int = 1) -> None:
@@ -87,6 +113,51 @@ class CoreMetrics:
             self.fade_queue_delay_ms[universe] = h
         h.observe(max(0, int(ms)))
 
+    def inc_ws_resume(self, result: str) -> None:
+        self.ws_resume_total[result] = self.ws_resume_total.get(result, 0) + 1
+
+    def inc_output_frames(self, count: int = 1) -> None:
+        self.output_frames_total += max(0, int(count))
+
+    def inc_output_frames_late(self, count: int = 1) -> None:
+        self.output_frames_late_total += max(0, int(count))
+
+    def observe_sink_lag(self, sink: str, ms: int) -> None:
+        h = self.sink_lag_ms.get(sink)
+        if h is None:
+            h = Histogram()
+            self.sink_lag_ms[sink] = h
+        h.observe(max(0, int(ms)))
+
+    def inc_sink_dropped(self, sink: str, count: int = 1) -> None:
+        self.sink_dropped_total[sink] = self.sink_dropped_total.get(sink, 0) + max(0, int(count))
+
+    def inc_sink_error(self, sink: str) -> None:
+        self.sink_errors_total[sink] = self.sink_errors_total.get(sink, 0) + 1
+
+    def set_sink_queue_depth(self, sink: str, depth: int) -> None:
+        self.sink_queue_depth[sink] = max(0, int(depth))
+
+    def observe_ws_send_lag(self, ms: int) -> None:
+        self.ws_send_lag_ms.observe(max(0, int(ms)))
+
+    def inc_ws_merged(self, count: int = 1) -> None:
+        self.ws_merged_total += max(0, int(count))
+
+    def inc_ws_coalesced(self, count: int = 1) -> None:
+        self.ws_coalesced_total += max(0, int(count))
+
+    def inc_ws_dropped(self, count: int = 1) -> None:
+        self.ws_dropped_total += max(0, int(count))
+
+    def inc_ws_slow_disconnect(self, reason: str) -> None:
+        self.ws_slow_disconnects_total[reason] = self.ws_slow_disconnects_total.get(reason, 0) + 1
+
+    def observe_persist(self, lag_ms: int, nbytes: int) -> None:
+        self.persist_lag_ms.observe(max(0, int(lag_ms)))
+        self.persist_bytes_total += max(0, int(nbytes))
+        self.persist_writes_total += 1
+
     def inc_cmd(self, proto: str, typ: str, accepted: bool) -> None:
         key = (proto, typ, accepted)
         self.cmds_total[key] = self.cmds_total.get(key, 0) + 1
@@ -176,6 +247,12 @@ class CoreMetrics:
         lines.append("# HELP dmx_core_fade_tick_ms Fade tick duration histogram (ms)")
         lines.append("# TYPE dmx_core_fade_tick_ms histogram")
         lines.extend(self.fade_tick_ms_hist.lines("dmx_core_fade_tick_ms"))
+        lines.append("# HELP dmx_core_fade_tick_jitter_ms Fade tick start delay past its deadline (ms)")
+        lines.append("# TYPE dmx_core_fade_tick_jitter_ms histogram")
+        lines.extend(self.fade_tick_jitter_ms.lines("dmx_core_fade_tick_jitter_ms"))
+        lines.append("# HELP dmx_core_fade_ticks_missed_total Fade ticks skipped after overruns")
+        lines.append("# TYPE dmx_core_fade_ticks_missed_total counter")
+        lines.append(f"dmx_core_fade_ticks_missed_total {self.fade_ticks_missed_total}")
         lines.append("# HELP dmx_core_fade_queue_delay_ms Fade queue delay histogram per universe (ms)")
         lines.append("# TYPE dmx_core_fade_queue_delay_ms histogram")
         for u, hist in self.fade_queue_delay_ms.items():
@@ -188,6 +265,57 @@ class CoreMetrics:
         lines.append("# TYPE dmx_core_fades_cancelled_total counter")
         for (u, reason), val in self.fades_cancelled_total.items():
             lines.append(f"dmx_core_fades_cancelled_total{{universe=\"{u}\",reason=\"{reason}\"}} {val}")
+        lines.append("# HELP dmx_core_ws_resume_total WS resume sync per universe (delta replay or full snapshot)")
+        lines.append("# TYPE dmx_core_ws_resume_total counter")
+        for result, val in self.ws_resume_total.items():
+            lines.append(f"dmx_core_ws_resume_total{{result=\"{result}\"}} {val}")
+        lines.append("# HELP dmx_core_output_frames_total Universe frames sent by the output clock")
+        lines.append("# TYPE dmx_core_output_frames_total counter")
+        lines.append(f"dmx_core_output_frames_total {self.output_frames_total}")
+        lines.append("# HELP dmx_core_output_frames_late_total Output clock frame slots skipped after overruns")
+        lines.append("# TYPE dmx_core_output_frames_late_total counter")
+        lines.append(f"dmx_core_output_frames_late_total {self.output_frames_late_total}")
+        lines.append("# HELP dmx_core_ws_send_lag_ms WS message lag from broadcast to socket write (ms)")
+        lines.append("# TYPE dmx_core_ws_send_lag_ms histogram")
+        lines.extend(self.ws_send_lag_ms.lines("dmx_core_ws_send_lag_ms"))
+        lines.append("# HELP dmx_core_ws_merged_total WS state messages merged into a pending one")
+        lines.append("# TYPE dmx_core_ws_merged_total counter")
+        lines.append(f"dmx_core_ws_merged_total {self.ws_merged_total}")
+        lines.append("# HELP dmx_core_ws_coalesced_total state.update broadcasts folded into a UI rate window")
+        lines.append("# TYPE dmx_core_ws_coalesced_total counter")
+        lines.append(f"dmx_core_ws_coalesced_total {self.ws_coalesced_total}")
+        lines.append("# HELP dmx_core_ws_dropped_total WS messages shed from a full client queue")
+        lines.append("# TYPE dmx_core_ws_dropped_total counter")
+        lines.append(f"dmx_core_ws_dropped_total {self.ws_dropped_total}")
+        lines.append("# HELP dmx_core_ws_slow_disconnects_total WS clients disconnected for staying over budget")
+        lines.append("# TYPE dmx_core_ws_slow_disconnects_total counter")
+        for reason, val in self.ws_slow_disconnects_total.items():
+            lines.append(f"dmx_core_ws_slow_disconnects_total{{reason=\"{reason}\"}} {val}")
+        lines.append("# HELP dmx_core_sink_lag_ms State snapshot lag from engine to sink delivery (ms)")
+        lines.append("# TYPE dmx_core_sink_lag_ms histogram")
+        for sink, hist in self.sink_lag_ms.items():
+            lines.extend(hist.lines("dmx_core_sink_lag_ms", labels={"sink": sink}))
+        lines.append("# HELP dmx_core_sink_dropped_total State snapshots dropped or superseded per sink")
+        lines.append("# TYPE dmx_core_sink_dropped_total counter")
+        for sink, val in self.sink_dropped_total.items():
+            lines.append(f"dmx_core_sink_dropped_total{{sink=\"{sink}\"}} {val}")
+        lines.append("# HELP dmx_core_sink_errors_total State sink callback failures")
+        lines.append("# TYPE dmx_core_sink_errors_total counter")
+        for sink, val in self.sink_errors_total.items():
+            lines.append(f"dmx_core_sink_errors_total{{sink=\"{sink}\"}} {val}")
+        lines.append("# HELP dmx_core_sink_queue_depth Pending state snapshots per sink")
+        lines.append("# TYPE dmx_core_sink_queue_depth gauge")
+        for sink, val in self.sink_queue_depth.items():
+            lines.append(f"dmx_core_sink_queue_depth{{sink=\"{sink}\"}} {val}")
+        lines.append("# HELP dmx_core_persist_lag_ms Delay from the first unsaved state change to its file write (ms)")
+        lines.append("# TYPE dmx_core_persist_lag_ms histogram")
+        lines.extend(self.persist_lag_ms.lines("dmx_core_persist_lag_ms"))
+        lines.append("# HELP dmx_core_persist_bytes_total Bytes written by state persistence")
+        lines.append("# TYPE dmx_core_persist_bytes_total counter")
+        lines.append(f"dmx_core_persist_bytes_total {self.persist_bytes_total}")
+        lines.append("# HELP dmx_core_persist_writes_total State file writes")
+        lines.append("# TYPE dmx_core_persist_writes_total counter")
+        lines.append(f"dmx_core_persist_writes_total {self.persist_writes_total}")
         # sACN metrics
         lines.append("# HELP dmx_core_sacn_packets_total sACN packets received per universe")
         lines.append("# TYPE dmx_core_sacn_packets_total counter")
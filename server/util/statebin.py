@@ -0,0 +1,157 @@
+"""Binary encoding of ``state.update`` for the ``dmx.bin.v1`` WebSocket subprotocol.
+
+Every message is one binary frame: a 20-byte header followed by a body whose
+layout depends on ``kind`` (all integers little-endian)::
+
+    header  kind u8, flags u8 (bit 0 = full), universe u16, rev u64, ts u64
+    FULL    512 channel values
+    PAIRS   count u16, count x (ch u16, val u8)
+    RUNS    runs u16, runs x (first ch u16, length u16, length x val u8)
+    BITMAP  64-byte channel bitmap (bit i, LSB first = channel i + 1),
+            then one value per set bit in channel order
+
+Deltas are encoded in whichever of PAIRS/RUNS/BITMAP is smallest; a full
+512-channel snapshot is always FULL. Universes above ``MAX_UNIVERSE`` do not fit
+the header; senders check ``encodable`` and fall back to JSON text for them.
+See ``shared/schema/state.update.binary.md``.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+SUBPROTOCOL = "dmx.bin.v1"
+
+KIND_FULL = 1
+KIND_PAIRS = 2
+KIND_RUNS = 3
+KIND_BITMAP = 4
+FLAG_FULL = 0x01
+
+CHANNELS = 512
+MAX_UNIVERSE = 0xFFFF
+HEADER = struct.Struct("<BBHQQ")
+_COUNT = struct.Struct("<H")
+_PAIR = struct.Struct("<HB")
+_RUN = struct.Struct("<HH")
+_BITMAP_BYTES = CHANNELS // 8
+
+
+def encodable(universe: Any) -> bool:
+    """True when ``universe`` fits the header's u16 universe field."""
+    try:
+        return 0 <= int(universe) <= MAX_UNIVERSE
+    except (TypeError, ValueError):
+        return False
+
+
+def _header(kind: int, full: bool, universe: int, rev: int, ts: int) -> bytes:
+    if not encodable(universe):
+        raise ValueError(f"universe {universe} does not fit {SUBPROTOCOL}")
+    return HEADER.pack(kind, FLAG_FULL if full else 0, int(universe), max(0, int(rev)), max(0, int(ts)))
+
+
+def encode_full(universe: int, rev: int, ts: int, frame: bytes | bytearray | memoryview) -> bytes:
+    """FULL message for a 512-byte output frame."""
+    return _header(KIND_FULL, True, universe, rev, ts) + bytes(frame)
+
+
+def _runs(items: Sequence[Tuple[int, int]]) -> List[Tuple[int, List[int]]]:
+    runs: List[Tuple[int, List[int]]] = []
+    for ch, val in items:
+        if runs and runs[-1][0] + len(runs[-1][1]) == ch:
+            runs[-1][1].append(val)
+        else:
+            runs.append((ch, [val]))
+    return runs
+
+
+def encode_delta(universe: int, rev: int, ts: int, items: Sequence[Tuple[int, int]], *, full: bool = False) -> bytes:
+    """Smallest of PAIRS/RUNS/BITMAP for sorted, unique ``(ch, val)`` items."""
+    n = len(items)
+    runs = _runs(items)
+    sizes = {
+        KIND_PAIRS: 2 + 3 * n,
+        KIND_RUNS: 2 + 4 * len(runs) + n,
+        KIND_BITMAP: _BITMAP_BYTES + n,
+    }
+    kind = min(sizes, key=lambda k: (sizes[k], k))
+    parts = [_header(kind, full, universe, rev, ts)]
+    if kind == KIND_PAIRS:
+        parts.append(_COUNT.pack(n))
+        parts.extend(_PAIR.pack(ch, val) for ch, val in items)
+    elif kind == KIND_RUNS:
+        parts.append(_COUNT.pack(len(runs)))
+        for first, values in runs:
+            parts.append(_RUN.pack(first, len(values)))
+            parts.append(bytes(values))
+    else:
+        bits = np.zeros(CHANNELS, dtype=bool)
+        bits[[ch - 1 for ch, _ in items]] = True
+        parts.append(np.packbits(bits, bitorder="little").tobytes())
+        parts.append(bytes(val for _, val in items))
+    return b"".join(parts)
+
+
+def encode_state_update(payload: Dict[str, Any]) -> bytes:
+    """Binary form of a ``state.update`` message dict."""
+    merged: Dict[int, int] = {}
+    for it in payload.get("delta", []):
+        merged[int(it["ch"])] = int(it["val"])
+    universe, rev, ts = int(payload.get("universe", 0)), int(payload.get("rev", 0)), int(payload.get("ts", 0))
+    full = bool(payload.get("full"))
+    if full and len(merged) == CHANNELS:
+        return encode_full(universe, rev, ts, bytes(merged[ch] for ch in range(1, CHANNELS + 1)))
+    return encode_delta(universe, rev, ts, sorted(merged.items()), full=full)
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """Inverse of the encoders: the equivalent ``state.update`` dict."""
+    kind, flags, universe, rev, ts = HEADER.unpack_from(data)
+    body = memoryview(data)[HEADER.size:]
+    items: List[Tuple[int, int]] = []
+    if kind == KIND_FULL:
+        items = [(i + 1, v) for i, v in enumerate(body[:CHANNELS])]
+    elif kind == KIND_PAIRS:
+        (n,) = _COUNT.unpack_from(body)
+        items = [_PAIR.unpack_from(body, 2 + 3 * i) for i in range(n)]
+    elif kind == KIND_RUNS:
+        (n,) = _COUNT.unpack_from(body)
+        pos = 2
+        for _ in range(n):
+            first, length = _RUN.unpack_from(body, pos)
+            pos += 4
+            items.extend((first + i, v) for i, v in enumerate(body[pos:pos + length]))
+            pos += length
+    elif kind == KIND_BITMAP:
+        bits = np.unpackbits(np.frombuffer(body[:_BITMAP_BYTES], dtype=np.uint8), bitorder="little")
+        chans = (np.flatnonzero(bits) + 1).tolist()
+        items = list(zip(chans, body[_BITMAP_BYTES:_BITMAP_BYTES + len(chans)]))
+    else:
+        raise ValueError(f"unknown state.update kind: {kind}")
+    return {
+        "type": "state.update",
+        "rev": rev,
+        "ts": ts,
+        "universe": universe,
+        "delta": [{"ch": int(ch), "val": int(val)} for ch, val in items],
+        "full": bool(flags & FLAG_FULL),
+    }
+
+
+__all__ = [
+    "KIND_BITMAP",
+    "KIND_FULL",
+    "KIND_PAIRS",
+    "KIND_RUNS",
+    "MAX_UNIVERSE",
+    "SUBPROTOCOL",
+    "decode",
+    "encodable",
+    "encode_delta",
+    "encode_full",
+    "encode_state_update",
+]
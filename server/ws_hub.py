@@ -1,37 +1,556 @@
-"""WebSocket hub for broadcasting state updates."""
+"""WebSocket hub for broadcasting state updates.
+
+Each client gets its own writer task and a bounded outbound queue, so a slow
+client only delays itself: broadcasting never waits on a socket. Pending
+``state.update`` messages for the same universe are merged into one (later
+values win), as is the legacy ``state`` message. A client whose queue stays full
+for longer than ``slow_client_s`` (or whose socket blocks a single send that
+long) is disconnected.
+
+``state.update`` broadcasts for UI clients are further coalesced at a fixed rate
+(``ui_hz``, negotiable per client): a ``_RateWindow`` per rate collects the
+deltas per universe and flushes them once per period, so only the last value of
+each channel in a window is encoded and sent. Hardware outputs do not go
+through the hub and keep their full rate.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
-import json
-from typing import Any
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Set
 
 from fastapi import WebSocket
 import os
 import logging
+from .util.jsonenc import dumps
+from .util.metrics import CoreMetrics
 from .util.schema import validate_state_update
+from .util.statebin import SUBPROTOCOL, encodable, encode_state_update
 
 DEBUG_SCHEMA = os.getenv("DEBUG", "false").lower() in {"1", "true", "yes"}
 logger = logging.getLogger("ws_hub")
 
+# close code for clients dropped for falling behind ("try again later")
+CLOSE_SLOW_CLIENT = 1013
+
+
+class _Outbound:
+    """One queued message; ``text`` is shared between clients until a merge changes it."""
+
+    __slots__ = ("payload", "text", "blob", "queued_at", "delta")
+
+    def __init__(self, payload: dict[str, Any], text: str | None, blob: bytes | None = None) -> None:
+        self.payload = payload
+        self.text = text
+        self.blob = blob
+        self.queued_at = time.perf_counter()
+        self.delta: Dict[int, int] | None = None
+
+    def merge_update(self, payload: dict[str, Any]) -> None:
+        """Fold a newer ``state.update`` of the same universe into this one.
+
+        The result keeps the rev of the earliest change it holds: it is sent at that
+        change's queue position, and a client resuming from the highest rev it has
+        seen must not skip changes of other universes queued behind it.
+        """
+        if self.delta is None:
+            self.delta = {int(it["ch"]): int(it["val"]) for it in self.payload.get("delta", [])}
+        for it in payload.get("delta", []):
+            self.delta[int(it["ch"])] = int(it["val"])
+        merged = dict(payload)
+        merged["rev"] = self.payload.get("rev", payload.get("rev"))
+        merged["full"] = bool(self.payload.get("full")) or bool(payload.get("full"))
+        merged["delta"] = [{"ch": ch, "val": val} for ch, val in sorted(self.delta.items())]
+        self.payload = merged
+        self.text = None
+        self.blob = None
+
+    def replace(self, payload: dict[str, Any], text: str | None, blob: bytes | None = None) -> None:
+        self.payload = payload
+        self.text = text
+        self.blob = blob
+        self.delta = None
+
+    def encode(self) -> str:
+        if self.text is None:
+            self.text = dumps(self.payload)
+        return self.text
+
+    def encode_binary(self) -> bytes | None:
+        """``dmx.bin.v1`` frame, or None when the universe does not fit it (sent as JSON)."""
+        if self.blob is None and encodable(self.payload.get("universe", 0)):
+            self.blob = encode_state_update(self.payload)
+        return self.blob
+
+
+def _update_rev(payload: dict[str, Any]) -> int | None:
+    """``rev`` of a ``state.update`` (None for other messages)."""
+    if payload.get("type") != "state.update":
+        return None
+    try:
+        return int(payload.get("rev", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _merge_key(payload: dict[str, Any]) -> tuple[str, int] | None:
+    typ = payload.get("type")
+    if typ == "state.update":
+        try:
+            return ("state.update", int(payload.get("universe", 0)))
+        except (TypeError, ValueError):
+            return None
+    if typ == "state":
+        return ("state", 0)
+    return None
+
+
+class SnapshotCache:
+    """Encoded full-universe ``delta`` lists, reused until the universe's output changes.
+
+    Only the 512-channel ``delta`` array is cached (keyed by the universe's rev);
+    ``rev``/``ts`` are spliced in per message so they stay current.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: Dict[int, tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def message(self, dmx: Any, universe: int) -> str:
+        uni = int(universe)
+        key = (dmx.epoch, dmx.universe_rev(uni))
+        cached = self._deltas.get(uni)
+        if cached is not None and cached[:2] == key:
+            self.hits += 1
+            delta = cached[2]
+        else:
+            self.misses += 1
+            delta = dumps([{"ch": i + 1, "val": v} for i, v in enumerate(dmx.frame(uni))])
+            self._deltas[uni] = (key[0], key[1], delta)
+        return (
+            f'{{"type":"state.update","rev":{int(dmx.rev)},"ts":{int(dmx.ts)},'
+            f'"universe":{uni},"delta":{delta},"full":true}}'
+        )
+
+
+class WSClient:
+    """Outbound queue and writer task of one WebSocket client."""
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        hub: "WSHub",
+        *,
+        max_queue: int,
+        slow_client_s: float,
+        binary: bool = False,
+    ) -> None:
+        self.ws = ws
+        # negotiated dmx.bin.v1: state.update goes out as binary frames
+        self.binary = binary
+        # state.update flush rate; 0 = forward every update as it happens
+        self.hz = 0
+        # subscriptions; None = everything
+        self.universes: Set[int] | None = None
+        self.types: Set[str] | None = None
+        self.hub = hub
+        client = getattr(ws, "client", None)
+        self.name = f"{client.host}:{client.port}" if client is not None else f"ws-{id(ws):x}"
+        self.max_queue = max(1, int(max_queue))
+        self.slow_client_s = slow_client_s
+        self.dropped = 0
+        self.merged = 0
+        self.last_lag_ms = 0
+        self._queue: Deque[_Outbound] = deque()
+        self._mergeable: Dict[tuple[str, int], _Outbound] = {}
+        # state messages shed from a full queue; later messages of their key merge into them
+        self._carry: Dict[tuple[str, int], _Outbound] = {}
+        self._ready = asyncio.Event()
+        self._full_since: float | None = None
+        self.closed = False
+        self.task: asyncio.Task[None] | None = None
+
+    def depth(self) -> int:
+        return len(self._queue) + len(self._carry)
+
+    def wants(self, typ: str | None) -> bool:
+        return self.types is None or typ in self.types
+
+    def offer(self, payload: dict[str, Any], text: str | None, blob: bytes | None = None) -> None:
+        if self.closed:
+            return
+        key = _merge_key(payload)
+        pending = None
+        if key is not None:
+            pending = self._mergeable.get(key) or self._carry.get(key)
+        if pending is not None:
+            if key is not None and key[0] == "state.update":
+                pending.merge_update(payload)
+            else:
+                pending.replace(payload, text, blob)
+            self.merged += 1
+            if self.hub.metrics is not None:
+                self.hub.metrics.inc_ws_merged()
+            return
+        item = _Outbound(payload, text, blob)
+        if len(self._queue) >= self.max_queue:
+            self._shed()
+            self.dropped += 1
+            if self.hub.metrics is not None:
+                self.hub.metrics.inc_ws_dropped()
+            now = time.monotonic()
+            if self._full_since is None:
+                self._full_since = now
+            elif now - self._full_since >= self.slow_client_s:
+                self.hub.drop_slow(self, "queue")
+                return
+        self._queue.append(item)
+        if key is not None:
+            self._mergeable[key] = item
+        self._ready.set()
+
+    def _shed(self) -> None:
+        """Make room: set aside the oldest state message, else drop the oldest event.
+
+        A state message set aside is not lost: later messages of its key merge
+        into it, and it goes out before any queued update with a higher rev
+        (see ``_next``). Acks are never shed.
+        """
+        for item in self._queue:
+            key = _merge_key(item.payload)
+            if key is not None:
+                self._queue.remove(item)
+                self._forget(item)
+                self._carry[key] = item
+                return
+        victim = next((item for item in self._queue if "ack" not in item.payload), None)
+        if victim is not None:
+            self._queue.remove(victim)
+
+    def _forget(self, item: _Outbound) -> None:
+        for key, pending in list(self._mergeable.items()):
+            if pending is item:
+                del self._mergeable[key]
+
+    def _next(self) -> _Outbound:
+        """Queue head, unless a set-aside update has a lower rev.
+
+        ``state.update`` revs reach the client in increasing order, so the highest
+        rev it has seen is a safe ``?since=`` for a resume.
+        """
+        head = self._queue[0] if self._queue else None
+        head_rev = _update_rev(head.payload) if head is not None else None
+        if self._carry and (head is None or head_rev is not None):
+            key, carried = min(self._carry.items(), key=lambda kv: _update_rev(kv[1].payload) or 0)
+            if head_rev is None or (_update_rev(carried.payload) or 0) < head_rev:
+                del self._carry[key]
+                return carried
+        item = self._queue.popleft()
+        self._forget(item)
+        return item
+
+    async def run(self) -> None:
+        while True:
+            if not self._queue and not self._carry:
+                self._full_since = None
+                self._ready.clear()
+                await self._ready.wait()
+            item = self._next()
+            try:
+                blob = None
+                if self.binary and item.payload.get("type") == "state.update":
+                    blob = item.encode_binary()
+                if blob is not None:
+                    send = self.ws.send_bytes(blob)
+                else:
+                    send = self.ws.send_text(item.encode())
+                await asyncio.wait_for(send, self.slow_client_s)
+            except asyncio.TimeoutError:
+                self.hub.drop_slow(self, "send")
+                return
+            except Exception:
+                self.hub.drop_client(self)
+                return
+            self.last_lag_ms = int((time.perf_counter() - item.queued_at) * 1000)
+            if self.hub.metrics is not None:
+                self.hub.metrics.observe_ws_send_lag(self.last_lag_ms)
+
+
+class _RateWindow:
+    """``state.update`` deltas of one UI rate, merged per universe and flushed every ``1/hz`` s.
+
+    The legacy ``state`` message is kept latest-only and sent after the updates.
+    """
+
+    def __init__(self, hub: "WSHub", hz: int) -> None:
+        self.hub = hub
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.clients: Set[WSClient] = set()
+        self._pending: Dict[int, dict[str, Any]] = {}
+        # newest legacy ``state`` message of the window
+        self._state: dict[str, Any] | None = None
+        self.task: asyncio.Task[None] | None = None
+
+    def add(self, payload: dict[str, Any]) -> None:
+        if payload.get("type") == "state":
+            if self._state is not None and self.hub.metrics is not None:
+                self.hub.metrics.inc_ws_coalesced()
+            self._state = payload
+            return
+        uni = int(payload.get("universe", 0))
+        entry = self._pending.get(uni)
+        if entry is None:
+            entry = self._pending[uni] = {"delta": {}, "full": False}
+        elif self.hub.metrics is not None:
+            self.hub.metrics.inc_ws_coalesced()
+        delta: Dict[int, int] = entry["delta"]
+        for it in payload.get("delta", []):
+            delta[int(it["ch"])] = int(it["val"])
+        entry["full"] = entry["full"] or bool(payload.get("full"))
+        # earliest rev of the window, as in ``_Outbound.merge_update``
+        entry.setdefault("rev", payload.get("rev"))
+        entry["ts"] = payload.get("ts")
+
+    def _payloads(self, pending: Dict[int, dict[str, Any]]) -> List[dict[str, Any]]:
+        return [
+            {
+                "type": "state.update",
+                "rev": entry["rev"],
+                "ts": entry["ts"],
+                "universe": uni,
+                "delta": [{"ch": ch, "val": val} for ch, val in sorted(entry["delta"].items())],
+                "full": entry["full"],
+            }
+            # in rev order, so the highest rev a client has seen stays a safe resume point
+            for uni, entry in sorted(pending.items(), key=lambda kv: (kv[1]["rev"] or 0, kv[0]))
+        ]
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        state, self._state = self._state, None
+        for payload in self._payloads(pending) + ([state] if state is not None else []):
+            clients = [client for client in self.hub._recipients(payload) if client.hz == self.hz]
+            self.hub._deliver(payload, clients)
+
+    def flush_to(self, client: WSClient) -> None:
+        """Hand the window's pending updates to one client that is leaving it."""
+        for payload in self._payloads(self._pending) + ([self._state] if self._state is not None else []):
+            if client in self.hub._recipients(payload):
+                client.offer(payload, None)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_at = loop.time() + self.period
+        while self.clients:
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+            self.flush()
+            next_at += self.period
+            now = loop.time()
+            if next_at < now:
+                # fell behind: skip the missed windows instead of bursting
+                next_at = now + self.period
+        self._pending.clear()
+        self._state = None
+
 
 class WSHub:
     """Track WebSocket clients and broadcast messages."""
 
-    def __init__(self, *, send_timeout: float = 0.2) -> None:
-        self._clients: set[WebSocket] = set()
+    def __init__(
+        self,
+        *,
+        send_timeout: float = 2.0,
+        max_queue: int = 256,
+        ui_hz: int = 0,
+        max_hz: int = 60,
+        metrics: CoreMetrics | None = None,
+    ) -> None:
+        self._clients: dict[WebSocket, WSClient] = {}
+        # default and highest state.update rate a client can ask for (0 = unthrottled)
+        self.ui_hz = max(0, int(ui_hz))
+        self.max_hz = max(1, int(max_hz))
+        self._windows: Dict[int, _RateWindow] = {}
+        # clients by subscribed universe; ``_all_universes`` holds the unfiltered ones
+        self._by_universe: Dict[int, Set[WSClient]] = {}
+        self._all_universes: Set[WSClient] = set()
         self._lock = asyncio.Lock()
+        # how long a client may stay over its queue budget (or block one send)
         self._send_timeout = send_timeout
+        self._max_queue = max_queue
+        self.metrics = metrics
+        self.snapshots = SnapshotCache()
+        # DMX engine whose rev stamps the RGB mirror in ``send_state`` (set by the app)
+        self.dmx: Any = None
+
+    async def register(
+        self,
+        ws: WebSocket,
+        *,
+        universes: Iterable[int] | None = None,
+        types: Iterable[str] | None = None,
+        hz: int | None = None,
+    ) -> bool:
+        """Accept ``ws`` and start its writer; returns True when the binary subprotocol was negotiated.
 
-    async def register(self, ws: WebSocket) -> None:
-        await ws.accept()
+        ``universes``/``types`` set the initial subscription (None = everything) and
+        ``hz`` the client's state.update rate (None = the hub's ``ui_hz``).
+        """
+        offered = getattr(ws, "scope", {}).get("subprotocols") or []
+        binary = SUBPROTOCOL in offered
+        if binary:
+            await ws.accept(subprotocol=SUBPROTOCOL)
+        else:
+            await ws.accept()
+        client = WSClient(ws, self, max_queue=self._max_queue, slow_client_s=self._send_timeout, binary=binary)
+        client.types = set(types) if types is not None else None
+        client.task = asyncio.create_task(client.run(), name=f"ws_writer_{client.name}")
         async with self._lock:
-            self._clients.add(ws)
+            self._clients[ws] = client
+            self._index(client, set(universes) if universes is not None else None)
+            self._set_rate(client, self.ui_hz if hz is None else hz)
+        return binary
+
+    def _set_rate(self, client: WSClient, hz: int) -> None:
+        hz = min(max(0, int(hz)), self.max_hz)
+        if hz == client.hz:
+            return
+        old = self._windows.get(client.hz)
+        if old is not None:
+            old.flush_to(client)
+            old.clients.discard(client)
+        client.hz = hz
+        if hz == 0:
+            return
+        window = self._windows.get(hz)
+        if window is None:
+            window = self._windows[hz] = _RateWindow(self, hz)
+        window.clients.add(client)
+        if window.task is None or window.task.done():
+            window.task = asyncio.get_running_loop().create_task(window.run(), name=f"ws_window_{hz}hz")
+
+    def set_rate(self, ws: WebSocket, hz: int) -> int:
+        """Change the state.update rate of ``ws`` (clamped to ``max_hz``); returns the rate in effect."""
+        client = self._clients.get(ws)
+        if client is None:
+            return 0
+        self._set_rate(client, hz)
+        return client.hz
+
+    def rate(self, ws: WebSocket) -> int:
+        client = self._clients.get(ws)
+        return client.hz if client is not None else 0
+
+    def _index(self, client: WSClient, universes: Set[int] | None) -> None:
+        self._unindex(client)
+        client.universes = universes
+        if universes is None:
+            self._all_universes.add(client)
+        else:
+            for uni in universes:
+                self._by_universe.setdefault(uni, set()).add(client)
+
+    def _leave_window(self, client: WSClient) -> None:
+        window = self._windows.get(client.hz)
+        if window is not None:
+            window.clients.discard(client)
+
+    def _unindex(self, client: WSClient) -> None:
+        self._all_universes.discard(client)
+        for uni in client.universes or ():
+            members = self._by_universe.get(uni)
+            if members is not None:
+                members.discard(client)
+                if not members:
+                    del self._by_universe[uni]
+
+    def subscription(self, ws: WebSocket) -> tuple[Set[int] | None, Set[str] | None]:
+        client = self._clients.get(ws)
+        if client is None:
+            return None, None
+        return client.universes, client.types
+
+    def subscribe(
+        self,
+        ws: WebSocket,
+        *,
+        universes: Iterable[int] | None = None,
+        types: Iterable[str] | None = None,
+    ) -> Set[int]:
+        """Add universes/types to the subscription of ``ws`` (the first narrows it from "everything").
+
+        Returns the universes that were newly subscribed, so the caller can send their snapshots.
+        """
+        client = self._clients.get(ws)
+        if client is None:
+            return set()
+        added: Set[int] = set()
+        if universes is not None:
+            wanted = set(universes)
+            current = client.universes
+            added = wanted if current is None else wanted - current
+            self._index(client, wanted if current is None else current | wanted)
+        if types is not None:
+            client.types = set(types) if client.types is None else client.types | set(types)
+        return added
+
+    def unsubscribe(
+        self,
+        ws: WebSocket,
+        *,
+        universes: Iterable[int] | None = None,
+        types: Iterable[str] | None = None,
+        known_universes: Iterable[int] = (),
+    ) -> None:
+        """Remove universes/types; from an unfiltered subscription this keeps ``known_universes`` minus them."""
+        client = self._clients.get(ws)
+        if client is None:
+            return
+        if universes is not None:
+            current = client.universes if client.universes is not None else set(known_universes)
+            self._index(client, current - set(universes))
+        if types is not None and client.types is not None:
+            client.types = client.types - set(types)
 
     async def unregister(self, ws: WebSocket) -> None:
         async with self._lock:
-            self._clients.discard(ws)
+            client = self._clients.pop(ws, None)
+            if client is not None:
+                self._unindex(client)
+                self._leave_window(client)
+        if client is not None:
+            client.closed = True
+            if client.task is not None and client.task is not asyncio.current_task():
+                client.task.cancel()
+
+    def drop_client(self, client: WSClient, code: int = 1011) -> None:
+        """Forget ``client`` and close its socket (called from the client's own code paths)."""
+        if client.closed:
+            return
+        client.closed = True
+        self._clients.pop(client.ws, None)
+        self._unindex(client)
+        self._leave_window(client)
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        asyncio.get_running_loop().create_task(self._close(client.ws, code))
+
+    def drop_slow(self, client: WSClient, reason: str) -> None:
+        if client.closed:
+            return
+        logger.warning("ws_slow_client", extra={"src": client.name, "reason": reason})
+        if self.metrics is not None:
+            self.metrics.inc_ws_slow_disconnect(reason)
+        self.drop_client(client, CLOSE_SLOW_CLIENT)
+
+    @staticmethod
+    async def _close(ws: WebSocket, code: int) -> None:
+        with contextlib.suppress(Exception):
+            await ws.close(code=code)
 
     async def send_state(self, state: dict[str, Any]) -> None:
         message_legacy = {
@@ -42,11 +561,11 @@ class WSHub:
             "seq": state["seq"],
             "ts": state["ts"],
         }
-        payload_legacy = json.dumps(message_legacy)
-
-        message_unified = {
+        # the RGB engine's seq is a separate counter: stamp the mirror with the DMX rev
+        # that ``?since=`` resumes from (it does not advance it; see docs/API.md)
+        message_unified: dict[str, Any] | None = {
             "type": "state.update",
-            "rev": state["seq"],
+            "rev": self.dmx.rev if self.dmx is not None else 0,
             "ts": state["ts"],
             "universe": 0,
             "delta": [
@@ -62,42 +581,74 @@ class WSHub:
             if not ok:
                 logger.error("state_update_schema_invalid", extra={"err": err})
                 message_unified = None  # don't send invalid unified payload in DEBUG
-        payload_unified = json.dumps(message_unified) if message_unified is not None else None
-        async with self._lock:
-            clients = list(self._clients)
+        await self.send_payload(message_legacy)
+        if message_unified is not None:
+            await self.send_payload(message_unified)
+
+    def _recipients(self, payload: dict[str, Any]) -> List[WSClient]:
+        typ = payload.get("type")
+        if typ == "state.update":
+            try:
+                subscribed = self._by_universe.get(int(payload.get("universe", 0)), set())
+            except (TypeError, ValueError):
+                subscribed = set()
+            candidates: Iterable[WSClient] = self._all_universes | subscribed if subscribed else self._all_universes
+        else:
+            candidates = self._clients.values()
+        return [client for client in candidates if client.wants(typ)]
+
+    async def send_payload(self, payload: dict[str, Any]) -> None:
+        """Queue ``payload`` for every subscribed client; never waits for a socket.
+
+        ``state.update`` (and legacy ``state``) for rate-limited clients goes into their
+        rate window instead.
+        """
+        clients = self._recipients(payload)
         if not clients:
             return
-        async def send_both(ws: WebSocket) -> None:
-            await self._send(ws, payload_legacy)
-            if payload_unified is not None:
-                await self._send(ws, payload_unified)
-        tasks = [asyncio.create_task(send_both(ws)) for ws in clients]
-        _, pending = await asyncio.wait(tasks, timeout=self._send_timeout)
-        for pending_task in pending:
-            pending_task.cancel()
+        if payload.get("type") in {"state.update", "state"}:
+            immediate = []
+            rates: Set[int] = set()
+            for client in clients:
+                if client.hz:
+                    rates.add(client.hz)
+                else:
+                    immediate.append(client)
+            for hz in rates:
+                self._windows[hz].add(payload)
+            clients = immediate
+        self._deliver(payload, clients)
 
-    async def send_payload(self, payload: dict[str, Any]) -> None:
-        data = json.dumps(payload)
-        async with self._lock:
-            clients = list(self._clients)
+    def _deliver(self, payload: dict[str, Any], clients: List[WSClient]) -> None:
         if not clients:
             return
-        tasks = [asyncio.create_task(self._send(ws, data)) for ws in clients]
-        _, pending = await asyncio.wait(tasks, timeout=self._send_timeout)
-        for p in pending:
-            p.cancel()
+        data = dumps(payload)
+        blob = None
+        if (
+            payload.get("type") == "state.update"
+            and encodable(payload.get("universe", 0))
+            and any(client.binary for client in clients)
+        ):
+            blob = encode_state_update(payload)
+        for client in clients:
+            client.offer(payload, data, blob)
 
     async def count(self) -> int:
         async with self._lock:
             return len(self._clients)
 
-    async def _send(self, ws: WebSocket, payload: str) -> None:
-        try:
-            await ws.send_text(payload)
-        except Exception:
-            await self.unregister(ws)
-            with contextlib.suppress(Exception):
-                await ws.close()
+    def client_stats(self) -> List[dict[str, Any]]:
+        return [
+            {
+                "client": client.name,
+                "queueDepth": client.depth(),
+                "lagMs": client.last_lag_ms,
+                "dropped": client.dropped,
+                "merged": client.merged,
+                "hz": client.hz,
+            }
+            for client in self._clients.values()
+        ]
 
 
-__all__ = ["WSHub"]
+__all__ = ["CLOSE_SLOW_CLIENT", "SnapshotCache", "WSClient", "WSHub"]